@@ -10,23 +10,174 @@ AI Destekli Vardiya Devir Analiz Asistanı
 # - Sağlayıcı (OpenAI/Anthropic/xAI) bağımlılıklarını soyutlayarak tek arayüz sunmak
 # - Yanıtı güvenlik/biçim açısından temizlemek ve yapılandırılmış çıktıya dönüştürmek
 
-from openai import OpenAI
-import requests
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterator, List, Tuple, Optional
+import asyncio
+import copy
 import json
 import re
-from config import MODEL_NAME, MAX_TOKENS, TEMPERATURE
+import threading
+from config import (MODEL_NAME, MAX_TOKENS, TEMPERATURE, LLM_CACHE_ENABLED, LLM_CACHE_TTL_HOURS, LLM_CACHE_MAX_MB,
+                    LLM_PARALLEL_SECTIONS, LLM_SECTION_CONCURRENCY, LLM_MAP_REDUCE_ENABLED,
+                    LLM_MAP_REDUCE_MIN_ROWS, LLM_SHARD_BY, LLM_MAP_CONCURRENCY, LLM_MAP_MODELS)
+from date_utils import as_datetime
+from daily_aggregates import clean_count_series, clean_value_counts, parse_duration_minutes
+from data_sketches import TOPK_DEFAULT_CAPACITY, SpaceSaving, wants_sketch
+from file_security import get_artifacts_dir
+from llm_cache import LLMResponseCache
+from llm_clients import get_openai_client, get_session, request_timeout
+from shard_summary import pack_items, shard_frame, shard_record_lines
+
+# Akış (stream) modunda gelen her metin parçası bu imzadaki geri çağrıya verilir
+ChunkCallback = Callable[[str], None]
+
+def iter_sse_events(response) -> Iterator[Tuple[Optional[str], str]]:
+    """Server-Sent Events yanıtından (olay adı, veri) çiftleri üretir"""
+    # Olaylar boş satırla biter; çok satırlı data alanları birleştirilir, ':' ile başlayanlar yorumdur
+    response.encoding = 'utf-8'
+    event, data_lines = None, []
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            if data_lines:
+                yield event, "\n".join(data_lines)
+            event, data_lines = None, []
+            continue
+        if line.startswith(':'):
+            continue
+        field, _, value = line.partition(':')
+        value = value[1:] if value.startswith(' ') else value
+        if field == 'event':
+            event = value
+        elif field == 'data':
+            data_lines.append(value)
+    if data_lines:
+        yield event, "\n".join(data_lines)
+
+def _read_openai_stream(stream, on_chunk: ChunkCallback) -> Tuple[str, Dict]:
+    """OpenAI SDK akışını okur: (tam metin, token kullanımı)"""
+    parts, usage = [], None
+    for chunk in stream:
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                on_chunk(delta)
+        # include_usage: kullanım bilgisi son (choices'ı boş) parçada gelir
+        if getattr(chunk, 'usage', None) is not None:
+            usage = chunk.usage
+    return "".join(parts), {
+        'prompt_tokens': getattr(usage, 'prompt_tokens', None),
+        'completion_tokens': getattr(usage, 'completion_tokens', None),
+        'total_tokens': getattr(usage, 'total_tokens', None),
+    }
+
+def _read_anthropic_stream(response, on_chunk: ChunkCallback) -> Tuple[str, Dict]:
+    """Claude Messages SSE akışını okur: (tam metin, token kullanımı)"""
+    # message_start → giriş token'ları, content_block_delta → metin, message_delta → çıkış token'ları
+    parts, usage = [], {}
+    for event, data in iter_sse_events(response):
+        payload = json.loads(data)
+        kind = payload.get('type', event)
+        if kind == 'content_block_delta':
+            text = payload.get('delta', {}).get('text')
+            if text:
+                parts.append(text)
+                on_chunk(text)
+        elif kind == 'message_start':
+            usage.update(payload.get('message', {}).get('usage', {}))
+        elif kind == 'message_delta':
+            usage.update(payload.get('usage', {}))
+        elif kind == 'error':
+            raise RuntimeError(payload.get('error', {}).get('message', data))
+    return "".join(parts), usage
+
+def _read_chat_completions_sse(response, on_chunk: ChunkCallback) -> Tuple[str, Dict]:
+    """OpenAI uyumlu (xAI) SSE akışını okur: (tam metin, token kullanımı)"""
+    parts, usage = [], {}
+    for _, data in iter_sse_events(response):
+        if data.strip() == '[DONE]':
+            break
+        payload = json.loads(data)
+        if 'error' in payload:
+            raise RuntimeError(payload['error'].get('message', data) if isinstance(payload['error'], dict)
+                               else payload['error'])
+        choices = payload.get('choices') or [{}]
+        text = choices[0].get('delta', {}).get('content')
+        if text:
+            parts.append(text)
+            on_chunk(text)
+        if payload.get('usage'):
+            usage = payload['usage']
+    return "".join(parts), usage
+
+# Paralel bölüm üretiminde raporun başlığı ve bölümler arası ayraç (tek prompt'lu raporla aynı düzen)
+REPORT_TITLE = "# 🏭 VARDİYA VERİLERİ KAPSAMLI İŞ ZEKASI RAPORU"
+SECTION_SEPARATOR = "\n\n---\n\n"
+# Bölüm başına çıktı sınırı toplam bütçenin bölüm sayısına payıdır; bu değerin altına inmez
+SECTION_MIN_TOKENS = 2048
+
+# Map-reduce özet bütçeleri (sağlayıcının bağlam sınırına oranla): tek parça özeti isteğinin girdi
+# payı ve parça özetlerinin rapor prompt'larında toplam kaplayabileceği pay. Parça özeti çıktısı kısa tutulur.
+SHARD_INPUT_SHARE = 0.5
+SHARD_REDUCE_SHARE = 0.2
+SHARD_SUMMARY_TOKENS = 600
+# Paralel bölüm üretiminde parça özetleri sadece kayıtları yorumlayan bölümlere eklenir
+# (diğer bölümler aynı bloğu tekrar tekrar taşımaz); toplam pay bu bölümler arasında bölünür
+SHARD_DIGEST_SECTIONS = ("kok_neden", "zaman_serisi")
+
+class _OrderedChunkRelay:
+    """Paralel üretilen bölümlerin akış parçalarını rapor sırasıyla iletir"""
+    # Sıradaki (baştaki) bölümün parçaları anında iletilir, diğerlerininki tamponda bekler.
+    # Baştaki bölüm bitince sıradaki bölümün tamponu boşaltılır ve o bölüm canlı akmaya başlar.
+    # Parçalar farklı iş parçacıklarından gelir; tüm durum tek kilitle korunur.
+
+    def __init__(self, count: int, on_chunk: ChunkCallback):
+        self._on_chunk = on_chunk
+        self._buffers: List[List[str]] = [[] for _ in range(count)]
+        self._done = [False] * count
+        self._head = 0
+        self._lock = threading.Lock()
+        on_chunk(REPORT_TITLE + SECTION_SEPARATOR)
+
+    def callback(self, index: int) -> ChunkCallback:
+        return lambda text: self._chunk(index, text)
+
+    def _chunk(self, index: int, text: str):
+        with self._lock:
+            if index == self._head:
+                self._on_chunk(text)
+            else:
+                self._buffers[index].append(text)
+
+    def finish(self, index: int):
+        with self._lock:
+            self._done[index] = True
+            while self._head < len(self._done) and self._done[self._head]:
+                self._head += 1
+                if self._head < len(self._done):
+                    self._on_chunk(SECTION_SEPARATOR + "".join(self._buffers[self._head]))
+                    self._buffers[self._head] = []
 
 class CimentoVardiyaAI:
     def __init__(self, api_key: str = "", provider: str = "openai", model: Optional[str] = None, base_url: Optional[str] = None,
-                 max_tokens: Optional[int] = None, temperature: Optional[float] = None):
+                 max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+                 response_cache: Optional[LLMResponseCache] = None, use_response_cache: bool = LLM_CACHE_ENABLED,
+                 parallel_sections: bool = LLM_PARALLEL_SECTIONS, section_concurrency: int = LLM_SECTION_CONCURRENCY,
+                 map_reduce: bool = LLM_MAP_REDUCE_ENABLED, shard_by: str = LLM_SHARD_BY):
         """
         Çimento fabrikası vardiya analizi için AI sistemi
         
         Args:
             api_key: OpenAI API key (güvenlik için parametre olarak alınır)
+            response_cache: Yanıt önbelleği (verilmezse artifacts/cache/llm altında varsayılan kurulur)
+            use_response_cache: False ise yanıtlar önbelleğe yazılmaz/okunmaz
+            parallel_sections: True ise rapor bölümleri ayrı isteklerle eşzamanlı üretilip sırayla
+                               birleştirilir (süre ≈ en yavaş bölüm); False ise tek prompt ile tek istek
+            section_concurrency: Aynı anda en fazla kaç bölüm isteği açık olabilir
+            map_reduce: True ise büyük veride (LLM_MAP_REDUCE_MIN_ROWS+) kayıtların tamamı parça parça
+                        ucuz modelle özetlenip özetler prompt'a eklenir
+            shard_by: Parçalama ölçütü ("week" | "equipment")
         """
         if not api_key:
             raise ValueError("⚠️ API Key gerekli! Lütfen GUI'de API key'inizi girin.")
@@ -35,16 +186,38 @@ class CimentoVardiyaAI:
         self.provider = provider.lower().strip()
         self.api_key = api_key
 
-        # OpenAI istemcisi (varsayılan)
+        # OpenAI istemcisi (varsayılan); analizler arasında paylaşılır (bkz. llm_clients)
         self.client = None
         if self.provider == "openai":
-            self.client = OpenAI(api_key=api_key)
+            self.client = get_openai_client(api_key)
 
         # Model ve jenerasyon ayarları
         self.model = model or MODEL_NAME
         self.max_tokens = int(max_tokens if max_tokens is not None else MAX_TOKENS)
         self.temperature = float(temperature if temperature is not None else TEMPERATURE)
         
+        # Bölüm bazlı eşzamanlı üretim ayarları
+        self.parallel_sections = parallel_sections
+        self.section_concurrency = max(1, int(section_concurrency))
+        
+        # Büyük veri için map-reduce özet ayarları
+        self.map_reduce = map_reduce
+        self.shard_by = shard_by
+        
+        # Aynı prompt + ayarlarla tekrarlanan çağrılar için yanıt önbelleği
+        self.response_cache = None
+        if use_response_cache:
+            self.response_cache = response_cache or LLMResponseCache(
+                ttl_seconds=LLM_CACHE_TTL_HOURS * 60 * 60, max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024
+            )
+        # Parça özetleri ayrı klasörde tutulur (her hafta/ekipman bir kayıt; sayıca çok, boyutça küçük)
+        self.shard_cache = None
+        if use_response_cache:
+            self.shard_cache = LLMResponseCache(
+                cache_dir=get_artifacts_dir("cache", "llm_shards"), ttl_seconds=LLM_CACHE_TTL_HOURS * 60 * 60,
+                max_entries=5000, max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024
+            )
+        
         # Çimento fabrikası spesifik context
         self.cement_context = self._load_cement_context()
 
@@ -139,7 +312,9 @@ class CimentoVardiyaAI:
 """
 
     def analyze_shift_data(self, data: pd.DataFrame, date_range: str = "günlük", 
-                          analysis_options: List[str] = None, user_question: str = "") -> Dict:
+                          analysis_options: List[str] = None, user_question: str = "",
+                          aggregates=None, force_refresh: bool = False,
+                          on_chunk: Optional[ChunkCallback] = None) -> Dict:
         """
         Vardiya verilerini gelişmiş AI sistemi ile analiz et
         
@@ -148,73 +323,285 @@ class CimentoVardiyaAI:
             date_range: Analiz periyodu ("günlük", "haftalık", vb.)
             analysis_options: İstenilen rapor bölümleri listesi
             user_question: Kullanıcının özel sorusu
+            aggregates: data ile aynı aralığın gün özeti (DailyRangeSummary, opsiyonel)
+            force_refresh: True ise önbellekteki yanıt kullanılmaz, API yeniden çağrılır
+                           (yeni yanıt önbelleğe yazılır)
+            on_chunk: Verilirse yanıt akış modunda istenir ve metin parçaları geldikçe bu
+                      fonksiyona verilir (çağıran thread'de; GUI kuyruğa atmalıdır).
+                      Dönen sonuç akışsız çağrıyla aynıdır (temizlenmiş tam metin).
             
         Returns:
             Dict: AI analiz sonuçları
         """
         
         # Veriyi özetleyerek token tasarrufu
-        summary_data = self._summarize_data(data)
+        summary_data = self._summarize_data(data, aggregates)
         
-        # Yeni gelişmiş AI prompt oluştur
-        prompt = self._create_analysis_prompt(summary_data, date_range, analysis_options, user_question)
+        # Büyük veride kayıtların tamamı parça parça özetlenir (map-reduce); blok tek prompt'ta bir kez,
+        # paralel modda sadece SHARD_DIGEST_SECTIONS bölümlerinde (pay aralarında bölünerek) yer alır
+        shard_digest = ""
+        if self.map_reduce and data is not None and len(data) >= LLM_MAP_REDUCE_MIN_ROWS:
+            share = SHARD_REDUCE_SHARE / (len(SHARD_DIGEST_SECTIONS) if self.parallel_sections else 1)
+            shard_digest = self._run_async(self.summarize_shards_async(data, self.shard_by, share))
+        
+        # Yeni gelişmiş AI prompt oluştur (paralel modda bölüm başına bir prompt)
+        section_prompts = None
+        if self.parallel_sections:
+            section_prompts = self._create_section_prompts(summary_data, shard_digest)
+            # Önbellek anahtarı tüm bölüm prompt'larını kapsar
+            prompt = "\n\x1e\n".join(section_prompts)
+        else:
+            if shard_digest:
+                summary_data = f"{summary_data}\n\n{shard_digest}"
+            prompt = self._create_analysis_prompt(summary_data, date_range, analysis_options, user_question)
 
-        # Token/sıcaklık otomatik ayarı
+        # Token/sıcaklık otomatik ayarı (bağlam sınırı tek istekteki en uzun prompt'a göre)
         try:
             data_rows = int(len(data)) if data is not None else 0
         except Exception:
             data_rows = 0
-        self._auto_adjust_generation_params(prompt, data_rows)
+        self._auto_adjust_generation_params(max(section_prompts, key=len) if section_prompts else prompt, data_rows)
+        
+        # Önbellek anahtarı ayarlanmış parametrelerle (istenen haliyle) üretilir; bağlam hatasında
+        # _call_llm_api max_tokens'ı düşürse de aynı istek tekrarlandığında aynı kayıt bulunur
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self.response_cache.make_key(self.provider, self.model, self.max_tokens,
+                                                     self.temperature, prompt)
+            if not force_refresh:
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    print("♻️ AI yanıtı önbellekten alındı (API çağrılmadı)")
+                    return dict(cached, cached=True)
         
         # AI analizi çağır
-        analysis = self._call_llm_api(prompt)
+        if section_prompts:
+            analysis = self._run_async(self.generate_sections_async(section_prompts, on_chunk))
+        else:
+            analysis = self._call_llm_api(prompt, on_chunk)
+        
+        # Bazı bölümleri eksik rapor önbelleğe yazılmaz (tekrar denemede eksikler yeniden istenir)
+        if cache_key is not None and not analysis.get('section_errors'):
+            self.response_cache.put(cache_key, analysis, self.provider, self.model)
         
         return analysis
 
-    def _summarize_data(self, data: pd.DataFrame) -> str:
+    @staticmethod
+    def _run_async(coroutine):
+        """Eşzamansız akışı senkron çağırandan (GUI worker thread, CLI) çalıştırır"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        coroutine.close()
+        raise RuntimeError("analyze_shift_data çalışan bir event loop içinden çağrılamaz; "
+                           "generate_sections_async'i await edin")
+
+    async def complete_async(self, prompt: str, on_chunk: Optional[ChunkCallback] = None,
+                             max_tokens: Optional[int] = None) -> Dict:
+        """Tek bir LLM isteğinin eşzamansız karşılığı"""
+        # Sağlayıcı çağrısı havuzlu oturumlarla (llm_clients) bir iş parçacığında çalışır; ağ
+        # beklemeleri event loop'u bloklamaz, eşzamanlı istekler aynı keep-alive havuzunu paylaşır
+        return await asyncio.to_thread(self._call_llm_api, prompt, on_chunk, max_tokens)
+
+    async def generate_sections_async(self, section_prompts: List[str],
+                                      on_chunk: Optional[ChunkCallback] = None) -> Dict:
+        """Bölüm prompt'larını eşzamanlı (en fazla section_concurrency) gönderip raporu sırayla birleştirir"""
+        # Çıktı bütçesi bölümlere paylaştırılır; toplam maliyet tek prompt'lu raporla benzer kalır
+        section_tokens = max(SECTION_MIN_TOKENS, self.max_tokens // len(section_prompts))
+        relay = _OrderedChunkRelay(len(section_prompts), on_chunk) if on_chunk is not None else None
+        semaphore = asyncio.Semaphore(self.section_concurrency)
+
+        async def run(index: int, section_prompt: str) -> Dict:
+            async with semaphore:
+                try:
+                    return await self.complete_async(section_prompt, relay.callback(index) if relay else None,
+                                                     section_tokens)
+                finally:
+                    if relay is not None:
+                        relay.finish(index)
+
+        results = await asyncio.gather(*(run(index, prompt) for index, prompt in enumerate(section_prompts)))
+        return self._assemble_sections(results)
+
+    def _shard_mapper(self) -> 'CimentoVardiyaAI':
+        """Parça özetleri için ucuz modelli kopya (istemci, oturum ve önbellekler paylaşılır)"""
+        mapper = copy.copy(self)
+        mapper.model = LLM_MAP_MODELS.get(self.provider) or self.model
+        mapper.max_tokens = SHARD_SUMMARY_TOKENS
+        mapper.temperature = 0.3
+        return mapper
+
+    async def summarize_shards_async(self, data: pd.DataFrame, by: str = "week",
+                                     budget_share: float = SHARD_REDUCE_SHARE) -> str:
+        """Verinin tüm kayıtlarını parça parça özetleyip (map) prompt'a eklenecek tek bloğa indirir (reduce)"""
+        # Bütçeler bağlam sınırından: parça kayıtları bir isteğe sığmazsa bölümlere ayrılır; parça
+        # özetleri budget_share payını aşarsa gruplar halinde tekrar özetlenir (hiyerarşik reduce)
+        from prompts import create_shard_reduce_prompt, create_shard_summary_prompt
+
+        limit = self._context_limits.get(self.provider, 128000)
+        input_budget = int(limit * SHARD_INPUT_SHARE)
+        reduce_budget = int(limit * budget_share)
+        mapper = self._shard_mapper()
+
+        labels, prompts = [], []
+        for label, shard in shard_frame(data, by):
+            groups = pack_items(shard_record_lines(shard), input_budget, self._approx_tokens)
+            for part, lines in enumerate(groups, 1):
+                labels.append(label if len(groups) == 1 else f"{label} [{part}/{len(groups)}]")
+                prompts.append(create_shard_summary_prompt(label, "\n".join(lines), len(shard), part, len(groups)))
+        print(f"🧩 Map-reduce özet: {len(data)} kayıt → {len(prompts)} parça ({mapper.model})")
+        summaries = await self._summarize_prompts_async(mapper, prompts)
+        blocks = [(label, text) for label, text in zip(labels, summaries) if text]
+        failed = len(prompts) - len(blocks)
+
+        def block_tokens(block: Tuple[str, str]) -> int:
+            return self._approx_tokens(block[1]) + self._approx_tokens(block[0])
+
+        while len(blocks) > 1 and sum(block_tokens(block) for block in blocks) > reduce_budget:
+            groups = pack_items(blocks, input_budget, block_tokens)
+            if len(groups) == len(blocks):
+                break
+            prompts = [create_shard_reduce_prompt("\n\n".join(f"### {label}\n{text}" for label, text in group))
+                       for group in groups]
+            summaries = await self._summarize_prompts_async(mapper, prompts)
+            blocks = [(group[0][0] if len(group) == 1 else f"{group[0][0]} … {group[-1][0]}", text)
+                      for group, text in zip(groups, summaries) if text]
+        if not blocks:
+            return ""
+
+        digest = "\n\n".join(f"### {label}\n{text.strip()}" for label, text in blocks)
+        if self._approx_tokens(digest) > reduce_budget:
+            digest = digest[:reduce_budget * 4] + "...[kısaltıldı]"
+        basis = "haftalık" if by == "week" else "ekipman bazlı"
+        header = f"📚 PARÇA ÖZETLERİ ({basis}, {len(data)} kaydın tamamından"
+        header += f"; {failed} parça özetlenemedi):" if failed else "):"
+        return f"{header}\n{digest}"
+
+    async def _summarize_prompts_async(self, mapper: 'CimentoVardiyaAI', prompts: List[str]) -> List[Optional[str]]:
+        """Özet prompt'larını eşzamanlı gönderir; önbellekte olanlar API'ye gitmez (başarısızlar None)"""
+        # Ucuz parça modeli anahtarda yetkili olmayabilir: istek hata verirse mapper analiz modeline
+        # geçirilir (paylaşılan nesne; sonraki parçalar doğrudan analiz modeliyle gider)
+        semaphore = asyncio.Semaphore(LLM_MAP_CONCURRENCY)
+
+        def cache_key(prompt: str) -> Optional[str]:
+            if self.shard_cache is None:
+                return None
+            return self.shard_cache.make_key(mapper.provider, mapper.model, mapper.max_tokens,
+                                             mapper.temperature, prompt)
+
+        async def run(prompt: str) -> Optional[str]:
+            while True:
+                model, key = mapper.model, cache_key(prompt)
+                cached = self.shard_cache.get(key) if key is not None else None
+                if cached is not None:
+                    return cached.get('raw_response')
+                async with semaphore:
+                    result = await mapper.complete_async(prompt)
+                if not result.get('error'):
+                    break
+                if model == self.model:
+                    print(f"⚠️ Parça özeti alınamadı: {result['error']}")
+                    return None
+                if mapper.model == model:
+                    print(f"⚠️ {model} ile parça özeti alınamadı, {self.model} kullanılacak: {result['error']}")
+                    mapper.model = self.model
+            if key is not None:
+                self.shard_cache.put(key, {'raw_response': result.get('raw_response'),
+                                           'token_usage': result.get('token_usage')},
+                                     mapper.provider, model)
+            return result.get('raw_response')
+
+        return list(await asyncio.gather(*(run(prompt) for prompt in prompts)))
+
+    def _assemble_sections(self, results: List[Dict]) -> Dict:
+        """Bölüm yanıtlarını rapor sırasıyla tek yanıtta birleştirir (token kullanımı toplanır)"""
+        texts, errors, token_usage = [], [], {}
+        for index, result in enumerate(results, 1):
+            if result.get('error'):
+                errors.append(result['error'])
+                texts.append(f"⚠️ Bölüm {index} üretilemedi: {result['error']}")
+                continue
+            texts.append(result.get('raw_response') or "")
+            for key, value in (result.get('token_usage') or {}).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    token_usage[key] = token_usage.get(key, 0) + value
+        if len(errors) == len(results):
+            return {
+                'error': errors[0],
+                'analysis': None,
+                'token_usage': None,
+                'timestamp': datetime.now().isoformat()
+            }
+        report = REPORT_TITLE + SECTION_SEPARATOR + SECTION_SEPARATOR.join(texts)
+        analysis = {
+            'analysis': self._parse_analysis_response(report),
+            'raw_response': report,
+            'token_usage': token_usage,
+            'timestamp': datetime.now().isoformat()
+        }
+        if errors:
+            analysis['section_errors'] = errors
+        return analysis
+
+    def _summarize_data(self, data: pd.DataFrame, aggregates=None) -> str:
         """Veriyi zengin şekilde özetleyip AI'a güçlü bağlam sağla (KPI + trend + top listeler).
 
         Ayrıca bazı dağılımları önceden hesaplayıp yüzde toplamını %100'e normalize eder.
+        aggregates (DailyRangeSummary) verilirse günlük sayımlar, kategori dağılımları ve
+        süre toplamları satırlar yeniden taranmadan bu özetten okunur.
         """
         # Not: Buradaki özet, prompt boyutunu makul tutarken analiz için gerekli sinyalleri içerir
 
         lines: List[str] = []
 
-        def _clean_count_series(series: pd.Series) -> pd.Series:
-            """Kategori sayımları için metin serisini temizle.
-            - Boş / NaN / None / Null / N/A / NA / NaT / '-' gibi değerleri çıkar
-            - Aşırı boşlukları normalize et
-            """
-            try:
-                s = series.astype(str).str.strip()
-                # Lower-case kopya ile null benzerlerini tespit et
-                s_lower = s.str.lower()
-                null_like = [
-                    '', 'nan', 'none', 'null', 'nat', 'n/a', 'na', 'n\\a', 'n.a', 'n.a.', '-', '--', '—', 'yok', 'bilinmiyor'
-                ]
-                mask = s_lower.isin(null_like)
-                s = s[~mask]
-                # Tek karakterlik anlamsız değerleri filtrele (örn: '.')
-                s = s[s.str.len() >= 2]
-                # Whitespace normalizasyonu
-                s = s.str.replace(r"\s+", " ", regex=True)
-                return s
-            except Exception:
-                return series.dropna()
+        # Gün özeti sadece aynı veriye aitse kullanılır (aksi halde satırlardan hesaplanır)
+        if aggregates is not None and aggregates.row_count != len(data):
+            aggregates = None
+
+        def _category_counts(col: str, lower: bool = False) -> pd.Series:
+            """Temizlenmiş kategori sayımları (gün özetinde sayım varsa oradan)"""
+            counts = aggregates.value_counts(col) if aggregates is not None else None
+            if counts is None and isinstance(data[col].dtype, pd.CategoricalDtype):
+                # category kolonunda sayım kodlardan gelir; temizlik sadece kategorilere uygulanır
+                counts = data[col].value_counts()
+                counts = counts[counts > 0]
+            if counts is not None:
+                return clean_value_counts(counts, lower=lower)
+            # Büyük metin kolonlarında sadece en sık adaylar özetten sayılır (tahmini);
+            # yüzde hesabı için toplam attrs['toplam'] ile taşınır: temiz aday sayıları + aday
+            # dışı kalan dolu değerler (boş benzeri değerler sık olduğundan adaylar arasında elenir)
+            top, non_null = None, 0
+            if aggregates is not None and col in aggregates.columns:
+                top, non_null = aggregates.top_values(col, TOPK_DEFAULT_CAPACITY), int(aggregates.non_null[col])
+            elif wants_sketch(data[col]):
+                top, non_null = SpaceSaving().add(data[col]).top(), int(data[col].count())
+            if top is not None:
+                vc = clean_value_counts(top, lower=lower)
+                vc.attrs['toplam'] = int(vc.sum()) + max(0, non_null - int(top.sum()))
+                return vc
+            cleaned = clean_count_series(data[col])
+            return (cleaned.str.lower() if lower else cleaned).value_counts()
 
         # Tarih bilgisi (varsa)
         date_col_candidates = [c for c in data.columns if any(k in c.lower() for k in ['tarih', 'date'])]
         date_range_text = "N/A"
+        # Tarih kolonu bir kez çözülür (analizde datetime64'e çevrildiyse ayrıştırma yapılmaz);
+        # aşağıdaki tüm tarih bazlı özetler aynı günlük sayımları kullanır
+        dates = None
+        daily_counts = None
         if date_col_candidates:
-            dc = date_col_candidates[0]
-            try:
-                dates = pd.to_datetime(data[dc], errors='coerce')
-                min_d = dates.min()
-                max_d = dates.max()
-                if pd.notna(min_d) and pd.notna(max_d):
-                    date_range_text = f"{min_d.date()} - {max_d.date()}"
-            except Exception:
-                pass
+            if aggregates is not None and aggregates.date_column == date_col_candidates[0]:
+                daily_counts = aggregates.daily_counts
+            else:
+                try:
+                    dates = as_datetime(data[date_col_candidates[0]])
+                    daily_counts = dates.groupby(dates.dt.normalize()).size().sort_index()
+                except Exception:
+                    dates = None
+                    daily_counts = None
+        if daily_counts is not None and len(daily_counts):
+            date_range_text = f"{daily_counts.index.min().date()} - {daily_counts.index.max().date()}"
 
         # Genel
         lines.append("📊 GENEL BİLGİ:")
@@ -222,15 +609,14 @@ class CimentoVardiyaAI:
         lines.append(f"- Tarih aralığı: {date_range_text}")
 
         # Güncellik dağılımı: son 90/180/365 gün ve 24+ ay önceki kayıt sayıları
-        if date_col_candidates:
+        if daily_counts is not None:
             try:
-                dc = date_col_candidates[0]
-                dates = pd.to_datetime(data[dc], errors='coerce')
                 now = pd.Timestamp.now(tz=None).normalize()
-                last90 = (dates >= now - pd.Timedelta(days=90)).sum()
-                last180 = (dates >= now - pd.Timedelta(days=180)).sum()
-                last365 = (dates >= now - pd.Timedelta(days=365)).sum()
-                older24m = (dates < now - pd.Timedelta(days=730)).sum()
+                days = daily_counts.index
+                last90 = daily_counts[days >= now - pd.Timedelta(days=90)].sum()
+                last180 = daily_counts[days >= now - pd.Timedelta(days=180)].sum()
+                last365 = daily_counts[days >= now - pd.Timedelta(days=365)].sum()
+                older24m = daily_counts[days < now - pd.Timedelta(days=730)].sum()
                 lines.append("- Güncellik (kayıt adedi): son 90g=%d | 180g=%d | 365g=%d | 24+ ay=%d" % (int(last90), int(last180), int(last365), int(older24m)))
                 if older24m and last365 == 0:
                     lines.append("- Not: Kayıtların çoğu 24+ ay öncesi. Eylem planı üretimi sınırlı tutulacaktır.")
@@ -241,7 +627,7 @@ class CimentoVardiyaAI:
         shift_col = next((c for c in data.columns if 'vardiya' in c.lower()), None)
         if shift_col is not None:
             try:
-                vc = _clean_count_series(data[shift_col]).value_counts()
+                vc = _category_counts(shift_col)
                 dist = vc.head(10)
                 lines.append("\n🕒 VARDİYA DAĞILIMI (ilk 10):")
                 for k, v in dist.items():
@@ -255,7 +641,7 @@ class CimentoVardiyaAI:
             tamamlayarak döndürür. Yüzdeler tamsayıya yuvarlanır ve son kaleme fark eklenir.
             """
             items = vc.head(top_n)
-            total = int(vc.sum()) if vc.sum() else 0
+            total = int(vc.attrs.get('toplam', vc.sum())) if vc.sum() else 0
             result: List[Tuple[str, int, int]] = []
             if total == 0:
                 return result
@@ -280,7 +666,7 @@ class CimentoVardiyaAI:
         equipment_col = next((c for c in data.columns if any(k in c.lower() for k in ['ekipman', 'makine', 'ünite', 'unite', 'unit'])), None)
         if equipment_col is not None:
             try:
-                vc = _clean_count_series(data[equipment_col]).value_counts()
+                vc = _category_counts(equipment_col)
                 lines.append("\n🏭 EKİPMAN DAĞILIMI (ilk 10, normalize):")
                 dist = _normalized_percentages(vc, top_n=10)
                 for name, cnt, pct in dist:
@@ -294,7 +680,7 @@ class CimentoVardiyaAI:
         issue_col = next((c for c in data.columns if any(k in c.lower() for k in ['sorun', 'arıza', 'ariza', 'problem', 'kategori'])), None)
         if issue_col is not None:
             try:
-                vc = _clean_count_series(data[issue_col]).str.lower().value_counts()
+                vc = _category_counts(issue_col, lower=True)
                 lines.append("\n⚠️ SORUN KATEGORİLERİ (ilk 10, normalize):")
                 dist = _normalized_percentages(vc, top_n=10)
                 for name, cnt, pct in dist:
@@ -308,15 +694,22 @@ class CimentoVardiyaAI:
         duration_col = next((c for c in data.columns if any(k in c.lower() for k in ['süre', 'sure', 'dakika', 'dk'])), None)
         if duration_col is not None:
             try:
-                # Metin içindeki sayıları da yakalamaya çalış (ör. "45 dk", "~30")
-                cleaned = (
-                    data[duration_col]
-                    .astype(str)
-                    .str.extract(r'(\d+[\.,]?\d*)', expand=False)
-                )
-                durations = pd.to_numeric(cleaned.str.replace(',', '.', regex=False), errors='coerce')
-                total_min = durations.fillna(0).sum()
-                avg_min = durations.dropna().mean() if durations.notna().any() else 0
+                # Gün özeti: gün başına süre toplamı/adedi; yoksa metin içindeki sayılar
+                # satırlardan yakalanır (ör. "45 dk", "~30")
+                daily_durations = None
+                if aggregates is not None and aggregates.duration_column == duration_col:
+                    total_min = aggregates.duration_total
+                    duration_count = aggregates.duration_count
+                    if daily_counts is not None and aggregates.date_column == date_col_candidates[0]:
+                        daily_durations = aggregates.daily[['sure_toplam', 'sure_adet']]
+                else:
+                    durations = parse_duration_minutes(data[duration_col])
+                    total_min = durations.fillna(0).sum()
+                    duration_count = int(durations.notna().sum())
+                    if dates is not None:
+                        daily_durations = durations.groupby(dates.dt.normalize()).agg(['sum', 'count'])
+                        daily_durations.columns = ['sure_toplam', 'sure_adet']
+                avg_min = total_min / duration_count if duration_count else 0
                 lines.append("\n⏱️ Duruş Süresi (dakika):")
                 lines.append(f"- Toplam: {int(total_min)} dk")
                 lines.append(f"- Ortalama: {avg_min:.1f} dk/kayıt")
@@ -324,19 +717,14 @@ class CimentoVardiyaAI:
                 lines.append("- MTBF/MTTR: veri varsa hesaplanır; eksikse 'veri yok' yaz")
 
                 # Haftalık ortalama duruş süresi (son 7 gün vs önceki 7 gün)
-                if date_col_candidates:
+                if daily_durations is not None:
                     try:
-                        dc = date_col_candidates[0]
-                        dates = pd.to_datetime(data[dc], errors='coerce')
-                        df_tmp = pd.DataFrame({
-                            'date': dates.dt.normalize(),
-                            'dur_min': durations
-                        })
                         now_d = pd.Timestamp.now().normalize()
-                        last7_mask = df_tmp['date'] >= (now_d - pd.Timedelta(days=7))
-                        prev7_mask = (df_tmp['date'] < (now_d - pd.Timedelta(days=7))) & (df_tmp['date'] >= (now_d - pd.Timedelta(days=14)))
-                        mean_last7 = df_tmp.loc[last7_mask, 'dur_min'].dropna().mean()
-                        mean_prev7 = df_tmp.loc[prev7_mask, 'dur_min'].dropna().mean()
+                        days = daily_durations.index
+                        last7 = daily_durations[days >= (now_d - pd.Timedelta(days=7))].sum()
+                        prev7 = daily_durations[(days < (now_d - pd.Timedelta(days=7))) & (days >= (now_d - pd.Timedelta(days=14)))].sum()
+                        mean_last7 = last7['sure_toplam'] / last7['sure_adet'] if last7['sure_adet'] else float('nan')
+                        mean_prev7 = prev7['sure_toplam'] / prev7['sure_adet'] if prev7['sure_adet'] else float('nan')
                         if pd.notna(mean_prev7) or pd.notna(mean_last7):
                             last7_text = f"{mean_last7:.1f} dk" if pd.notna(mean_last7) else "veri yok"
                             prev7_text = f"{mean_prev7:.1f} dk" if pd.notna(mean_prev7) else "veri yok"
@@ -347,12 +735,8 @@ class CimentoVardiyaAI:
                 pass
 
         # Trend özeti (son 7 gün vs önceki 7 gün)
-        if date_col_candidates:
-            dc = date_col_candidates[0]
+        if daily_counts is not None:
             try:
-                df_copy = data.copy()
-                df_copy[dc] = pd.to_datetime(df_copy[dc], errors='coerce')
-                daily_counts = df_copy.groupby(df_copy[dc].dt.date).size().sort_index()
                 if len(daily_counts) >= 14:
                     last7 = daily_counts[-7:].sum()
                     prev7 = daily_counts[-14:-7].sum()
@@ -394,27 +778,53 @@ class CimentoVardiyaAI:
         
         return enhanced_prompt
 
-    def _call_llm_api(self, prompt: str) -> Dict:
+    def _create_section_prompts(self, summary_data: str, shard_digest: str = "") -> List[str]:
+        """Rapor bölümleri için (rapor sırasıyla) ayrı prompt'lar"""
+        from prompts import REPORT_SECTIONS, create_section_prompt
+
+        # Yönetici Özeti madde sayıları tek prompt'lu raporla aynıdır; parça özetleri sadece
+        # kayıtları yorumlayan bölümlere eklenir
+        prompts = []
+        for section in REPORT_SECTIONS:
+            section_data = summary_data
+            if shard_digest and section in SHARD_DIGEST_SECTIONS:
+                section_data = f"{summary_data}\n\n{shard_digest}"
+            prompts.append(create_section_prompt(section_data, section, model_name=self.model,
+                                                 min_executive_items=8, max_executive_items=20))
+        return prompts
+
+    def _call_llm_api(self, prompt: str, on_chunk: Optional[ChunkCallback] = None,
+                      max_tokens: Optional[int] = None) -> Dict:
         """Seçili sağlayıcıya göre API çağrısı"""
         # Sağlayıcıya özgü istemci/REST çağrıları; yanıt tek biçimde normalize edilir
+        # on_chunk verilirse yanıt akış modunda (OpenAI SDK stream / SSE) okunur; ham parçalar
+        # geldikçe iletilir, temizlik ve ayrıştırma tam metin üzerinde yine en sonda yapılır
+        # max_tokens: bu çağrının çıktı sınırı (None = self.max_tokens). Paralel bölüm çağrıları
+        #             aynı nesneyi paylaştığından sınır nesne üzerinde değiştirilmez
+        stream = on_chunk is not None
+        max_tokens = self.max_tokens if max_tokens is None else max_tokens
 
         try:
             if self.provider == "openai":
                 response = self.client.chat.completions.create(
                 model=self.model,
                     messages=[{"role": "user", "content": prompt}],
-                max_tokens=self.max_tokens,
+                max_tokens=max_tokens,
                 temperature=self.temperature,
                     top_p=0.9,
                     frequency_penalty=0.7,
                     presence_penalty=0.4,
+                    **({'stream': True, 'stream_options': {'include_usage': True}} if stream else {})
                 )
-                analysis_text = response.choices[0].message.content
-                token_usage = {
-                    'prompt_tokens': getattr(response.usage, 'prompt_tokens', None),
-                    'completion_tokens': getattr(response.usage, 'completion_tokens', None),
-                    'total_tokens': getattr(response.usage, 'total_tokens', None),
-                }
+                if stream:
+                    analysis_text, token_usage = _read_openai_stream(response, on_chunk)
+                else:
+                    analysis_text = response.choices[0].message.content
+                    token_usage = {
+                        'prompt_tokens': getattr(response.usage, 'prompt_tokens', None),
+                        'completion_tokens': getattr(response.usage, 'completion_tokens', None),
+                        'total_tokens': getattr(response.usage, 'total_tokens', None),
+                    }
 
             elif self.provider == "anthropic":
                 # Claude Messages API
@@ -426,17 +836,23 @@ class CimentoVardiyaAI:
                 }
                 payload = {
                     "model": self.model,
-                    "max_tokens": self.max_tokens,
+                    "max_tokens": max_tokens,
                     "temperature": self.temperature,
-                    "messages": [{"role": "user", "content": prompt}]
+                    "messages": [{"role": "user", "content": prompt}],
+                    "stream": stream
                 }
-                r = requests.post(url, headers=headers, data=json.dumps(payload), timeout=60)
+                r = get_session("anthropic").post(url, headers=headers, data=json.dumps(payload),
+                                                  timeout=request_timeout(), stream=stream)
                 r.raise_for_status()
-                data = r.json()
-                # Claude yanıtı
-                parts = data.get("content", [])
-                analysis_text = "".join([p.get("text", "") for p in parts]) if isinstance(parts, list) else data.get("content", "")
-                token_usage = data.get("usage", {})
+                if stream:
+                    with r:
+                        analysis_text, token_usage = _read_anthropic_stream(r, on_chunk)
+                else:
+                    data = r.json()
+                    # Claude yanıtı
+                    parts = data.get("content", [])
+                    analysis_text = "".join([p.get("text", "") for p in parts]) if isinstance(parts, list) else data.get("content", "")
+                    token_usage = data.get("usage", {})
 
             elif self.provider == "xai":
                 # xAI Grok (OpenAI uyumlu style olabilir; burada basit REST örneği)
@@ -449,14 +865,20 @@ class CimentoVardiyaAI:
                 payload = {
                     "model": self.model,
                     "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": self.max_tokens,
-                    "temperature": self.temperature
+                    "max_tokens": max_tokens,
+                    "temperature": self.temperature,
+                    "stream": stream
                 }
-                r = requests.post(url, headers=headers, data=json.dumps(payload), timeout=60)
+                r = get_session("xai").post(url, headers=headers, data=json.dumps(payload),
+                                            timeout=request_timeout(), stream=stream)
                 r.raise_for_status()
-                data = r.json()
-                analysis_text = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-                token_usage = data.get("usage", {})
+                if stream:
+                    with r:
+                        analysis_text, token_usage = _read_chat_completions_sse(r, on_chunk)
+                else:
+                    data = r.json()
+                    analysis_text = data.get("choices", [{}])[0].get("message", {}).get("content", "")
+                    token_usage = data.get("usage", {})
 
             else:
                 raise ValueError(f"Desteklenmeyen sağlayıcı: {self.provider}")
@@ -474,11 +896,11 @@ class CimentoVardiyaAI:
             msg = str(e).lower()
             if any(k in msg for k in ["max_token", "context", "too many tokens", "reduce"]):
                 try:
-                    new_max = max(512, int(self.max_tokens * 0.75))
-                    if new_max == self.max_tokens:
-                        new_max = max(512, self.max_tokens - 512)
-                    self.max_tokens = new_max
-                    return self._call_llm_api(prompt)
+                    new_max = max(512, int(max_tokens * 0.75))
+                    if new_max == max_tokens:
+                        new_max = max(512, max_tokens - 512)
+                    if new_max < max_tokens:
+                        return self._call_llm_api(prompt, on_chunk, new_max)
                 except Exception:
                     pass
             return {
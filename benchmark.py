@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Performans Ölçümü - Excel İçe Aktarma ve KVKK Temizlik Hattı
+Sentetik vardiya defterleri üretip analiz aşamalarının süresini, tepe belleğini ve hızını ölçer.
+"""
+
+# Bu modülün amacı:
+# - Ayarlanabilir boyutta (satır, kolon, kişisel veri yoğunluğu, serbest metin oranı)
+#   Türkçe vardiya defteri üretmek; aynı seed her zaman aynı veriyi verir
+# - analyze_excel_file, clean_dataframe ve detect_date_columns aşamalarını ayrı ayrı ölçmek
+# - Sonuçları JSON olarak saklamak ve önceki bir çalıştırmayla karşılaştırmak
+#
+# Çevrimdışı çalışır; ağ, API anahtarı veya örnek dosya gerekmez.
+# Ölçümler soğuk çalışır: karar önbelleği, tablo önbelleği ve artımlı içe aktarma kapalıdır.
+# Süreler tracemalloc kapalıyken ölçülür (izleme kodu yavaşlatır); tepe bellek ayrı bir
+# izlemeli çalıştırmadan okunur ve sadece Python/numpy ayırmalarını kapsar (Arrow havuzu hariç).
+#
+# Örn. python benchmark.py --rows 10000 50000 --columns 20 --pii-density 0.2
+#      python benchmark.py --rows 50000 --compare artifacts/benchmarks/onceki.json --tolerance 1.2
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_writers import write_frame
+from excel_analyzer import SCAN_MODES, ExcelAnalyzer, KVKKDataCleaner
+from file_security import get_artifacts_dir
+from version import VERSION
+
+BENCHMARK_FORMAT_VERSION = 1
+
+# Her defterde bulunan temel kolonlar (tarih, vardiya, ekipman, süre, miktar, açıklama)
+BASE_COLUMN_COUNT = 6
+
+_FIRST_NAMES = ["Ahmet", "Mehmet", "Ayşe", "Fatma", "Mustafa", "Emine", "Hüseyin", "Zeynep",
+                "İbrahim", "Hatice", "Şükrü", "Gülşen", "Özgür", "Çağlar", "Ümit", "Ebru"]
+_LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Öztürk", "Aydın",
+               "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Koç", "Kurt", "Özdemir"]
+_EQUIPMENT = ["KM1", "KM2", "ÇD1", "ÇD2", "ÇD3", "Fırın 1", "Soğutucu", "Silo 3", "Silo 4",
+              "Paketleme 2", "Torbalı filtre", "Kırıcı", "Konveyör B"]
+_SHIFTS = ["07:00-15:00", "15:00-23:00", "23:00-07:00"]
+_SUBJECTS = ["Değirmen girişinde", "Fırın çıkışında", "Soğutucu ızgarasında", "Bant konveyörde",
+             "Silo üst katında", "Paketleme hattında", "Filtre torbalarında", "Kırıcı besleme ağzında"]
+_EVENTS = ["titreşim yükseldi", "sıcaklık limit üstüne çıktı", "yağ kaçağı görüldü",
+           "basınç düşüşü yaşandı", "motor akımı dalgalandı", "malzeme sıkışması oldu",
+           "sensör arızası tespit edildi", "rulman sesi duyuldu"]
+_ACTIONS = ["bakım ekibine bildirildi.", "yağlama yapılıp hat tekrar devreye alındı.",
+            "arıza kaydı açıldı, parça siparişi verildi.", "ayar yapıldı, değerler normale döndü.",
+            "kalite laboratuvarına numune gönderildi.", "sonraki vardiyada takip edilecek."]
+
+def _free_text(rng: np.random.Generator, rows: int) -> pd.Series:
+    """Türkçe serbest metin (olay açıklaması) kolonu"""
+    return (pd.Series(rng.choice(_SUBJECTS, rows)) + " " + pd.Series(rng.choice(_EVENTS, rows)) +
+            ", " + pd.Series(rng.choice(_ACTIONS, rows)))
+
+def _person_names(rng: np.random.Generator, rows: int) -> pd.Series:
+    return pd.Series(rng.choice(_FIRST_NAMES, rows)) + " " + pd.Series(rng.choice(_LAST_NAMES, rows))
+
+def _phones(rng: np.random.Generator, rows: int) -> pd.Series:
+    return pd.Series([f"05{a:02d} {b:03d} {c:02d} {d:02d}" for a, b, c, d in
+                      zip(rng.integers(30, 56, rows), rng.integers(100, 1000, rows),
+                          rng.integers(10, 100, rows), rng.integers(10, 100, rows))])
+
+def _emails(rng: np.random.Generator, rows: int) -> pd.Series:
+    first = pd.Series(rng.choice(["ahmet", "mehmet", "ayse", "fatma", "mustafa", "zeynep"], rows))
+    last = pd.Series(rng.choice(["yilmaz", "kaya", "demir", "sahin", "celik", "ozturk"], rows))
+    return first + "." + last + "@fabrika.com.tr"
+
+def _identity_numbers(rng: np.random.Generator, rows: int) -> pd.Series:
+    return pd.Series(rng.integers(10_000_000_000, 99_999_999_999, rows).astype(str))
+
+# Adından tanınan kişisel veri kolonları (ad, üretici)
+_NAMED_PII = [("Personel", _person_names), ("Telefon", _phones), ("E-posta", _emails),
+              ("TC Kimlik No", _identity_numbers), ("Onaylayan", _person_names)]
+
+def generate_shift_log(rows: int, columns: int = 12, pii_density: float = 0.2,
+                       text_ratio: float = 0.5, seed: int = 42) -> pd.DataFrame:
+    """Sentetik vardiya defteri üretir"""
+    # columns: toplam kolon sayısı (en az BASE_COLUMN_COUNT; fazlası ek kolonlardır)
+    # pii_density: ek kolonlardan kişisel veri taşıyanların oranı. Yarısı adından tanınır
+    #              (Personel, Telefon...), yarısı nötr adlı not kolonlarına gömülüdür ve
+    #              sadece içerik taramasıyla bulunur (en pahalı yol)
+    # text_ratio: kişisel olmayan ek kolonlardan Türkçe serbest metin olanların oranı (kalanı sayısal)
+    if rows < 1:
+        raise ValueError("rows en az 1 olmalıdır")
+    if not 0 <= pii_density <= 1 or not 0 <= text_ratio <= 1:
+        raise ValueError("pii_density ve text_ratio 0 ile 1 arasında olmalıdır")
+    rng = np.random.default_rng(seed)
+
+    start = pd.Timestamp("2024-01-01 07:00")
+    data = {
+        'Tarih': start + pd.to_timedelta(np.sort(rng.integers(0, 365 * 24 * 60, rows)), unit='min'),
+        'Vardiya': rng.choice(_SHIFTS, rows),
+        'Ekipman': rng.choice(_EQUIPMENT, rows),
+        'Süre (dk)': rng.integers(5, 480, rows).astype(float),
+        'Üretim Miktarı (ton)': np.round(rng.normal(850, 120, rows), 1),
+        'Açıklama': _free_text(rng, rows),
+    }
+    # Gerçek defterlerdeki gibi bazı süreler boş bırakılır
+    data['Süre (dk)'][rng.random(rows) < 0.1] = np.nan
+
+    extra = max(0, columns - BASE_COLUMN_COUNT)
+    pii_count = int(round(extra * pii_density))
+    named_pii = (pii_count + 1) // 2
+    for i in range(named_pii):
+        name, make = _NAMED_PII[i % len(_NAMED_PII)]
+        data[name if i < len(_NAMED_PII) else f"{name}.{i // len(_NAMED_PII)}"] = make(rng, rows)
+    for i in range(pii_count - named_pii):
+        # Not kolonu: metnin yanında çoğu satırda ad ve telefon geçer
+        note = _free_text(rng, rows) + " Haber veren: " + _person_names(rng, rows) + " " + _phones(rng, rows)
+        data[f"Not {i + 1}"] = note.where(rng.random(rows) < 0.9, _free_text(rng, rows))
+
+    rest = extra - pii_count
+    text_count = int(round(rest * text_ratio))
+    for i in range(text_count):
+        data[f"Yapılan İşler {i + 1}"] = _free_text(rng, rows)
+    for i in range(rest - text_count):
+        data[f"Sensör Değeri {i + 1}"] = np.round(rng.normal(100, 15, rows), 2)
+    return pd.DataFrame(data)
+
+def measure(func: Callable[[], object], rows: int, repeat: int = 3, trace_memory: bool = True) -> Dict:
+    """Bir aşamayı repeat kez ölçer: en iyi/medyan süre, satır/sn ve (istenirse) tepe bellek"""
+    times = []
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    best = min(times)
+    result = {
+        'sure_sn': round(best, 4),
+        'sure_medyan_sn': round(statistics.median(times), 4),
+        'tekrar_sureleri_sn': [round(t, 4) for t in times],
+        'satir_per_sn': round(rows / best, 1) if best > 0 else None
+    }
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result['tepe_bellek_mb'] = round(peak / 2 ** 20, 2)
+    return result
+
+def run_scenario(rows: int, columns: int, pii_density: float, text_ratio: float, seed: int = 42,
+                 repeat: int = 3, scan_mode: str = "sample", trace_memory: bool = True,
+                 work_dir: Optional[str] = None) -> Dict:
+    """Tek bir boyut senaryosunun tüm aşamalarını ölçer"""
+    df = generate_shift_log(rows, columns, pii_density, text_ratio, seed)
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        path = write_frame(df, os.path.join(tmp_dir, f"benchmark_{rows}x{columns}.xlsx"), "xlsx")
+        file_size = os.path.getsize(path)
+
+        analyzer = ExcelAnalyzer(use_decision_cache=False, use_table_cache=False, use_incremental=False)
+        cleaner = KVKKDataCleaner()
+
+        def analyze():
+            # Kolon adı kararları sınıf düzeyinde hafızalanır; her çalıştırma soğuk başlar
+            KVKKDataCleaner._name_decision_cache.clear()
+            result = analyzer.analyze_excel_file(path, kvkk_scan_mode=scan_mode)
+            if 'hata' in result:
+                raise RuntimeError(f"Analiz hatası: {result['hata']}")
+            return result
+
+        def clean():
+            KVKKDataCleaner._name_decision_cache.clear()
+            return cleaner.clean_dataframe(df, scan_mode=scan_mode)
+
+        df_clean, removed, _ = clean()
+
+        stages = {}
+        # Analiz aşamaları çok sayıda ilerleme satırı yazar; ölçüme konsol yazımı karışmasın
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            stages['analyze_excel_file'] = measure(analyze, rows, repeat, trace_memory)
+            stages['clean_dataframe'] = measure(clean, rows, repeat, trace_memory)
+            stages['detect_date_columns'] = measure(lambda: analyzer.detect_date_columns(df_clean),
+                                                    rows, repeat, trace_memory)
+            detected = analyzer.detect_date_columns(df_clean)
+
+    return {
+        'anahtar': scenario_key(rows, columns, pii_density, text_ratio, scan_mode),
+        'parametreler': {'satir': rows, 'kolon': columns, 'kisisel_veri_yogunlugu': pii_density,
+                         'metin_orani': text_ratio, 'seed': seed, 'tarama_modu': scan_mode},
+        'dosya_boyutu_mb': round(file_size / 2 ** 20, 2),
+        'kaldirilan_kolonlar': removed,
+        'tarih_kolonlari': detected,
+        'asamalar': stages
+    }
+
+def scenario_key(rows: int, columns: int, pii_density: float, text_ratio: float, scan_mode: str) -> str:
+    return f"{rows}x{columns}|pii={pii_density:g}|metin={text_ratio:g}|{scan_mode}"
+
+def environment_info() -> Dict:
+    """Sonuçların karşılaştırılabilmesi için sürüm ve makine bilgisi"""
+    try:
+        import pyarrow
+        pyarrow_version = pyarrow.__version__
+    except ImportError:
+        pyarrow_version = None
+    return {
+        'uygulama_surumu': VERSION,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'pyarrow': pyarrow_version,
+        'platform': platform.platform(),
+        'islemci_sayisi': os.cpu_count()
+    }
+
+def compare_results(current: Dict, baseline: Dict) -> List[Dict]:
+    """Aynı anahtarlı senaryoların aşama sürelerini oranlar (>1 = yavaşlama)"""
+    previous = {scenario['anahtar']: scenario for scenario in baseline.get('senaryolar', [])}
+    rows = []
+    for scenario in current.get('senaryolar', []):
+        old = previous.get(scenario['anahtar'])
+        if old is None:
+            continue
+        for stage, metrics in scenario['asamalar'].items():
+            old_metrics = old['asamalar'].get(stage)
+            if not old_metrics or not old_metrics.get('sure_sn'):
+                continue
+            rows.append({
+                'anahtar': scenario['anahtar'],
+                'asama': stage,
+                'onceki_sn': old_metrics['sure_sn'],
+                'simdiki_sn': metrics['sure_sn'],
+                'oran': round(metrics['sure_sn'] / old_metrics['sure_sn'], 3)
+            })
+    return rows
+
+def save_results(results: Dict, output_path: Optional[str] = None) -> str:
+    """Sonuçları atomik olarak JSON'a yazar; yazılan yolu döndürür"""
+    if output_path is None:
+        output_path = get_artifacts_dir("benchmarks", f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+def main():
+    """Komut satırı: senaryoları ölç → JSON'a yaz → (istenirse) önceki sonuçla karşılaştır"""
+    parser = argparse.ArgumentParser(description="Excel içe aktarma / KVKK temizlik performans ölçümü")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000],
+                        help="Satır sayıları (her biri ayrı senaryo)")
+    parser.add_argument("--columns", type=int, default=12, help=f"Toplam kolon sayısı (en az {BASE_COLUMN_COUNT})")
+    parser.add_argument("--pii-density", type=float, default=0.2,
+                        help="Ek kolonlardan kişisel veri taşıyanların oranı (0-1)")
+    parser.add_argument("--text-ratio", type=float, default=0.5,
+                        help="Kişisel olmayan ek kolonlardan serbest metin olanların oranı (0-1)")
+    parser.add_argument("--scan-mode", default="sample", choices=SCAN_MODES, help="KVKK içerik tarama modu")
+    parser.add_argument("--repeat", type=int, default=3, help="Aşama başına tekrar sayısı (en iyi süre raporlanır)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc ile tepe bellek ölçme")
+    parser.add_argument("--output", help="Sonuç JSON yolu (varsayılan: artifacts/benchmarks/)")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki sonuç JSON dosyası")
+    parser.add_argument("--tolerance", type=float,
+                        help="Bu orandan fazla yavaşlayan aşama varsa çıkış kodu 1 (örn. 1.2)")
+    args = parser.parse_args()
+
+    print("⏱️ Performans ölçümü başlıyor")
+    print("=" * 50)
+    results = {
+        'format_surumu': BENCHMARK_FORMAT_VERSION,
+        'zaman': datetime.now().isoformat(timespec='seconds'),
+        'ortam': environment_info(),
+        'senaryolar': []
+    }
+    for rows in args.rows:
+        print(f"📊 {rows:,} satır × {args.columns} kolon (kişisel veri {args.pii_density:g}, metin {args.text_ratio:g})")
+        scenario = run_scenario(rows, args.columns, args.pii_density, args.text_ratio, seed=args.seed,
+                                repeat=args.repeat, scan_mode=args.scan_mode, trace_memory=not args.no_memory)
+        for stage, metrics in scenario['asamalar'].items():
+            memory = f", tepe {metrics['tepe_bellek_mb']:.1f} MB" if 'tepe_bellek_mb' in metrics else ""
+            print(f"   • {stage}: {metrics['sure_sn']:.3f} sn ({metrics['satir_per_sn']:,.0f} satır/sn{memory})")
+        results['senaryolar'].append(scenario)
+
+    path = save_results(results, args.output)
+    print(f"\n💾 Sonuçlar kaydedildi: {path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            comparison = compare_results(results, json.load(f))
+        if not comparison:
+            print("⚠️ Karşılaştırılabilir senaryo bulunamadı (parametreler farklı)")
+        regressions = []
+        for row in comparison:
+            marker = ""
+            if args.tolerance and row['oran'] > args.tolerance:
+                marker = "  ❌"
+                regressions.append(row)
+            print(f"   {row['anahtar']} {row['asama']}: {row['onceki_sn']:.3f} → {row['simdiki_sn']:.3f} sn "
+                  f"(×{row['oran']:.2f}){marker}")
+        if regressions:
+            print(f"❌ {len(regressions)} aşama ×{args.tolerance:g} sınırından fazla yavaşladı")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kolon Bazlı Analiz Önbelleği - Arrow IPC (Feather v2)
+Analiz edilmiş Excel dosyalarının KVKK-temiz verisini ve analiz özetini saklar.
+"""
+
+# Bu modülün amacı:
+# - Aynı içerikli dosya tekrar analiz edildiğinde xlsx ayrıştırmasını (en yavaş adım) atlamak
+# - Temiz veriyi sıkıştırılmamış Arrow IPC olarak yazıp bellek eşlemeli (memory-map) okumak
+# - Sadece KVKK temizliği sonrası veriyi saklamak (kişisel veri diske yazılmaz)
+#
+# Dosya yapısı: artifacts/cache/tables/<anahtar>.arrow + <anahtar>.json (analiz özeti)
+# Anahtar: dosya içeriğinin SHA-256 özeti + KVKK kural imzası + tarama modu + çıktıyı etkileyen
+#          analiz ayarları + format sürümü
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from file_security import get_artifacts_dir
+
+# pyarrow opsiyoneldir; yoksa önbellek devre dışı kalır ve analiz normal akışla çalışır
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    feather = None
+    PYARROW_AVAILABLE = False
+
+def file_content_hash(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """Dosya içeriğinin SHA-256 özetini bloklar halinde hesaplar"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ColumnarAnalysisCache:
+    """Temiz veri (Arrow IPC) + analiz özeti (JSON) önbelleği"""
+
+    # Okuyucu/temizleyici çıktısı değişirse artırılır (eski kayıtlar kullanılmaz)
+    FORMAT_VERSION = 6
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 50):
+        self.cache_dir = cache_dir or get_artifacts_dir("cache", "tables")
+        self.max_entries = max_entries
+        self.enabled = PYARROW_AVAILABLE
+        if not self.enabled:
+            print("⚠️ pyarrow kütüphanesi yok - analiz önbelleği devre dışı")
+            print("   Kurulum: pip install pyarrow")
+
+    def make_key(self, file_path: str, rules_signature: str, scan_mode: str,
+                 settings: Optional[Dict] = None) -> str:
+        """Dosya içeriği ve analiz ayarlarından önbellek anahtarı üretir"""
+        # settings: saklanan veriyi/özeti değiştiren diğer ayarlar (ör. kategori tipi kullanımı)
+        settings_text = json.dumps(settings or {}, sort_keys=True)
+        raw = f"{file_content_hash(file_path)}|{rules_signature}|{scan_mode}|{settings_text}|{self.FORMAT_VERSION}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.arrow", f"{base}.json"
+
+    def load(self, key: str) -> Optional[Tuple[pd.DataFrame, Dict]]:
+        """Kayıt varsa (temiz_df, özet) döndürür; yoksa veya okunamazsa None"""
+        if not self.enabled:
+            return None
+        table_path, meta_path = self._paths(key)
+        if not (os.path.exists(table_path) and os.path.exists(meta_path)):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            # memory_map: kolon verisi işletim sistemi sayfa önbelleğinden okunur (kopyasız eşleme)
+            table = feather.read_table(table_path, memory_map=True)
+            df = table.to_pandas(split_blocks=True)
+        except (OSError, ValueError, pa.ArrowException) as e:
+            print(f"⚠️ Analiz önbelleği okunamadı, dosya yeniden analiz edilecek: {e}")
+            return None
+        # Son kullanım zamanı (budama için)
+        os.utime(meta_path, None)
+        return df, meta
+
+    def store(self, key: str, df: pd.DataFrame, meta: Dict) -> bool:
+        """Temiz veriyi ve özeti atomik olarak yazar; başarılıysa True"""
+        if not self.enabled:
+            return False
+        # Arrow kolon adları metin olmalıdır; orijinal adlar geri yüklenemeyeceği için saklanmaz
+        if not all(isinstance(column, str) for column in df.columns):
+            return False
+
+        table_path, meta_path = self._paths(key)
+        try:
+            table, stringified = to_arrow_table(df)
+            meta = dict(meta, metne_cevrilen_kolonlar=stringified)
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            tmp_table = f"{table_path}.{os.getpid()}.tmp"
+            tmp_meta = f"{meta_path}.{os.getpid()}.tmp"
+            # Sıkıştırmasız yazılır: okuma tarafında memory-map ile doğrudan erişilebilir
+            feather.write_feather(table, tmp_table, compression='uncompressed')
+            with open(tmp_meta, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, default=_json_default)
+            os.replace(tmp_table, table_path)
+            os.replace(tmp_meta, meta_path)
+        except (OSError, ValueError, TypeError, pa.ArrowException) as e:
+            print(f"⚠️ Analiz önbelleği yazılamadı: {e}")
+            return False
+
+        self._prune()
+        return True
+
+    def _prune(self):
+        """En eski kullanılan kayıtları max_entries sınırına kadar siler"""
+        try:
+            metas = [
+                os.path.join(self.cache_dir, name)
+                for name in os.listdir(self.cache_dir) if name.endswith('.json')
+            ]
+        except OSError:
+            return
+        if len(metas) <= self.max_entries:
+            return
+        metas.sort(key=os.path.getmtime)
+        for meta_path in metas[:len(metas) - self.max_entries]:
+            for path in (meta_path, meta_path[:-len('.json')] + '.arrow'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+def to_arrow_table(df: pd.DataFrame) -> Tuple['pa.Table', List[str]]:
+    """DataFrame'i Arrow tablosuna çevirir; karışık tipli metin kolonlarını metne çevirir"""
+    # Örn. aynı kolonda hem sayı hem metin varsa Arrow tek tipe zorlar; bu kolonlar
+    # boş olmayan değerleri str yapılarak yazılır ve ikinci dönüş değerinde listelenir.
+    # İndeks yazılmaz (önbellek ve Parquet çıktısı aynı dönüşümü kullanır).
+    stringified = []
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        if series.dtype == 'object':
+            try:
+                pa.array(series, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                series = series.map(lambda value: value if pd.isna(value) else str(value))
+                stringified.append(column)
+        columns[column] = series
+    table = pa.Table.from_pandas(pd.DataFrame(columns, index=df.index), preserve_index=False)
+    return table, stringified
+
+def _json_default(value):
+    # numpy sayıları ve tarih gibi JSON dışı değerler için
+    if hasattr(value, 'item'):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
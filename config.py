@@ -12,6 +12,38 @@ TEMPERATURE = 0.7
 # Dil
 LANGUAGE = "Turkish"
 
+# LLM yanıt önbelleği (artifacts/cache/llm)
+# Aynı veri aralığı + aynı sağlayıcı/model/ayarlarla tekrarlanan analiz API'ye gitmeden diskten döner
+LLM_CACHE_ENABLED = True
+LLM_CACHE_TTL_HOURS = 7 * 24   # Kayıt geçerlilik süresi
+LLM_CACHE_MAX_MB = 50          # Toplam boyut sınırı (aşılınca en eski kullanılanlar silinir)
+
+# LLM HTTP bağlantıları (Anthropic/xAI REST; sağlayıcı başına tek havuzlu oturum, bkz. llm_clients.py)
+LLM_HTTP_POOL_SIZE = 4          # Sağlayıcı başına açık tutulan en fazla bağlantı
+LLM_HTTP_CONNECT_TIMEOUT = 10   # Bağlantı kurma zaman aşımı (sn)
+LLM_HTTP_READ_TIMEOUT = 60      # Yanıt baytları arası en fazla bekleme (sn)
+
+# Rapor bölümlerini (yönetici özeti, KPI, kök neden, trend, eylem planı, aksiyon panosu) ayrı
+# isteklerle eşzamanlı üret; toplam süre ≈ en yavaş bölüm. Eşzamanlılık havuz boyutunu aşmamalı.
+LLM_PARALLEL_SECTIONS = True
+LLM_SECTION_CONCURRENCY = 3
+
+# Büyük veri için map-reduce özet: veri haftalara/ekipmanlara bölünür, her parçanın kayıtları ucuz
+# bir modelle özetlenir (artifacts/cache/llm_shards'ta saklanır) ve özetler son prompt'a eklenir.
+# Tarih aralığı genişletildiğinde sadece yeni/değişen parçalar yeniden özetlenir.
+# Parça başına ek (ücretli) istek yapıldığından varsayılan kapalıdır; GUI'de "Üretim Ayarları"ndan açılır.
+LLM_MAP_REDUCE_ENABLED = False
+LLM_MAP_REDUCE_MIN_ROWS = 5000   # Bu satır sayısının altında sadece klasik özet kullanılır
+LLM_SHARD_BY = "week"            # "week" (ISO hafta) | "equipment" (ekipman)
+LLM_MAP_CONCURRENCY = 3          # Aynı anda en fazla açık parça özeti isteği (≤ havuz boyutu)
+# Parça özetleri için sağlayıcı başına ucuz model (None = analiz modeli kullanılır).
+# Model anahtarda yetkili değilse (istek hata verirse) analiz modeline geçilir.
+LLM_MAP_MODELS = {
+    "openai": "gpt-4o-mini",
+    "anthropic": "claude-3-haiku-20240307",
+    "xai": None
+}
+
 # Sağlayıcı ve model listeleri (GUI ve analiz tarafından kullanılır)
 # Not: Gerçek erişim, ilgili sağlayıcının hesabında yetkilendirilen modellere bağlıdır
 #      Bu liste UI tarafında combobox doldurma ve doğrulama amaçlıdır
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Günlük Özet Küpü - Tarih Aralığı Özetleri için Önceden Hesaplanmış Hücreler
+Temiz veri analiz sırasında bir kez gün gün özetlenir; aralık özetleri hücrelerden birleştirilir.
+"""
+
+# Bu modülün amacı:
+# - GUI tarih filtresi ve AI özeti her seferinde tüm kolonlarda count/nunique/value_counts
+#   hesaplamasın; bunun yerine gün başına hücreler bir kez çıkarılsın
+# - Her gün için: kayıt sayısı, kolon bazında dolu değer sayısı, düşük kardinaliteli
+#   kolonlarda değer sayımları (kesin), diğer kolonlarda HyperLogLog kayıtçıları ve günün en
+#   sık TOPK_DEFAULT_CAPACITY değeri (tahmini) ve süre kolonunun toplam/adet bilgisi tutulur
+# - Herhangi bir aralık özeti seçilen günlerin toplanmasıyla (max → HLL) elde edilir;
+#   aralık gün ortasında başlıyor/bitiyorsa uç günler dilimlenmiş veriden kesin hesaplanır
+#
+# Hücre 0 tarihsiz (NaT) satırları tutar; sadece "tüm veriler" özetine katılır.
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from data_sketches import (HLL_DEFAULT_PRECISION, TOPK_DEFAULT_CAPACITY, combine_topk, hll_estimate,
+                           hll_registers)
+
+# Kategori sayımlarında boş kabul edilen değerler (küçük harf)
+NULL_LIKE_VALUES = (
+    '', 'nan', 'none', 'null', 'nat', 'n/a', 'na', 'n\\a', 'n.a', 'n.a.', '-', '--', '—', 'yok', 'bilinmiyor'
+)
+
+# Süre (dakika) kolonunu adından tanımak için anahtar kelimeler
+DURATION_KEYWORDS = ('süre', 'sure', 'dakika', 'dk')
+
+# Bu sayıya kadar benzersiz değeri olan kolonlar için kesin değer sayımı tutulur
+MAX_CATEGORIES = 256
+
+def clean_count_series(series: pd.Series) -> pd.Series:
+    """Kategori sayımları için metin serisini temizle.
+    - Boş / NaN / None / Null / N/A / NA / NaT / '-' gibi değerleri çıkar
+    - Aşırı boşlukları normalize et
+    category kolonlarında temizlik satırlar yerine kategoriler üzerinde bir kez yapılır.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        labels = clean_count_series(pd.Series(series.cat.categories, dtype=object))
+        # Kategori kodu → temiz etiket (-1: boş veya elenmiş); son yuva NaN kodu (-1) içindir
+        lookup = np.full(len(series.cat.categories) + 1, -1, dtype=np.intp)
+        label_codes, unique_labels = pd.factorize(labels)
+        lookup[labels.index] = label_codes
+        row_codes = lookup[series.cat.codes.to_numpy()]
+        keep = row_codes >= 0
+        return pd.Series(np.asarray(unique_labels, dtype=object)[row_codes[keep]], index=series.index[keep])
+    try:
+        s = series.astype(str).str.strip()
+        # Lower-case kopya ile null benzerlerini tespit et
+        mask = s.str.lower().isin(NULL_LIKE_VALUES)
+        s = s[~mask]
+        # Tek karakterlik anlamsız değerleri filtrele (örn: '.')
+        s = s[s.str.len() >= 2]
+        # Whitespace normalizasyonu
+        return s.str.replace(r"\s+", " ", regex=True)
+    except Exception:
+        return series.dropna()
+
+def clean_value_counts(counts: pd.Series, lower: bool = False) -> pd.Series:
+    """Ham değer sayımlarını clean_count_series etiketleriyle yeniden gruplar (azalan sırada)"""
+    # clean_count_series(kolon).value_counts() ile aynı sayımları, satırlara dönmeden verir
+    labels = clean_count_series(pd.Series(counts.index, index=np.arange(len(counts)), dtype=object))
+    if lower:
+        labels = labels.str.lower()
+    if labels.empty:
+        return pd.Series(dtype='int64')
+    grouped = pd.Series(counts.to_numpy()[labels.index], index=labels.to_numpy()).groupby(level=0, sort=False).sum()
+    return grouped.sort_values(ascending=False, kind='stable')
+
+def parse_duration_minutes(series: pd.Series) -> pd.Series:
+    """Metin içindeki ilk sayıyı dakika olarak okur (ör. "45 dk", "~30", "12,5")"""
+    cleaned = series.astype(str).str.extract(r'(\d+[\.,]?\d*)', expand=False)
+    return pd.to_numeric(cleaned.str.replace(',', '.', regex=False), errors='coerce')
+
+def find_duration_column(columns: Sequence) -> Optional[str]:
+    """Adı süre/dakika bildiren ilk kolonu döndürür"""
+    return next((c for c in columns if any(k in str(c).lower() for k in DURATION_KEYWORDS)), None)
+
+class _TopValueCells:
+    """Gün başına en sık değer adayları (kesin sayılıp capacity adaya kırpılmış)"""
+    # Boş yuvalar 0 sayılıdır. floors[i]: i. günde aday olmayan bir değerin sayısı için üst sınır.
+
+    def __init__(self, hashes, counts, floors, labels):
+        self.hashes = hashes                    # (n, capacity) uint64
+        self.counts = counts                    # (n, capacity) int64
+        self.floors = floors                    # (n,) int64
+        self.labels = labels                    # {özet: ilk görülen değer}
+
+    def take(self, rows) -> '_TopValueCells':
+        return _TopValueCells(self.hashes[rows], self.counts[rows], self.floors[rows], self.labels)
+
+    @staticmethod
+    def concat(parts: List['_TopValueCells']) -> '_TopValueCells':
+        labels = {}
+        for part in parts:
+            labels.update(part.labels)
+        return _TopValueCells(np.concatenate([p.hashes for p in parts]), np.concatenate([p.counts for p in parts]),
+                              np.concatenate([p.floors for p in parts]), labels)
+
+    def combine(self, capacity: int) -> pd.Series:
+        """Günleri birleştirip en sık capacity değerin tahmini sayılarını döndürür (azalan)"""
+        used = self.counts > 0
+        entry_floors = np.broadcast_to(self.floors[:, None], self.counts.shape)[used]
+        hashes, counts, _, _ = combine_topk(self.hashes[used], self.counts[used], np.zeros_like(entry_floors),
+                                            entry_floors, int(self.floors.sum()), capacity)
+        return pd.Series(counts, index=pd.Index([self.labels[int(h)] for h in hashes], dtype=object))
+
+    @classmethod
+    def build(cls, series: pd.Series, codes: np.ndarray, present: np.ndarray, hashes: np.ndarray,
+              n_cells: int, capacity: int) -> '_TopValueCells':
+        """Gün kodlarına göre her günün kesin değer sayımlarını çıkarıp capacity adaya kırpar"""
+        top_hashes = np.zeros((n_cells, capacity), dtype=np.uint64)
+        top_counts = np.zeros((n_cells, capacity), dtype=np.int64)
+        floors = np.zeros(n_cells, dtype=np.int64)
+        if len(hashes) == 0:
+            return cls(top_hashes, top_counts, floors, {})
+        value_codes, unique_hashes = pd.factorize(hashes)
+        first_positions = np.empty(len(unique_hashes), dtype=np.intp)
+        first_positions[value_codes[::-1]] = np.arange(len(value_codes) - 1, -1, -1)
+        # (gün, değer) çiftlerini say; gün içinde azalan sayıya göre sırala
+        pairs, pair_counts = np.unique(codes[present] * len(unique_hashes) + value_codes, return_counts=True)
+        pair_days, pair_values = np.divmod(pairs, len(unique_hashes))
+        order = np.lexsort((-pair_counts, pair_days))
+        pair_days, pair_values, pair_counts = pair_days[order], pair_values[order], pair_counts[order]
+        day_starts = np.searchsorted(pair_days, np.arange(n_cells))
+        ranks = np.arange(len(pair_days)) - day_starts[pair_days]
+
+        kept = ranks < capacity
+        top_hashes[pair_days[kept], ranks[kept]] = unique_hashes[pair_values[kept]]
+        top_counts[pair_days[kept], ranks[kept]] = pair_counts[kept]
+        first_dropped = ranks == capacity
+        floors[pair_days[first_dropped]] = pair_counts[first_dropped]
+
+        values = series[present]
+        labels = {int(unique_hashes[v]): values.iloc[first_positions[v]] for v in np.unique(pair_values[kept])}
+        return cls(top_hashes, top_counts, floors, labels)
+
+class _DailyCells:
+    """Gün (hücre) başına özet dizileri; satır i ↔ days[i]"""
+
+    def __init__(self, days, row_counts, non_null, category_counts, registers, top_values,
+                 duration_sum, duration_count):
+        self.days = days                        # datetime64[D]; tarihsiz hücre için NaT
+        self.row_counts = row_counts            # (n,) int64
+        self.non_null = non_null                # (n, kolon) int64
+        self.category_counts = category_counts  # {kolon: (n, kategori) int64}
+        self.registers = registers              # {kolon: (n, 2**precision) uint8}
+        self.top_values = top_values            # {kolon: _TopValueCells}
+        self.duration_sum = duration_sum        # (n,) float64
+        self.duration_count = duration_count    # (n,) int64
+
+    def take(self, rows) -> '_DailyCells':
+        return _DailyCells(
+            self.days[rows], self.row_counts[rows], self.non_null[rows],
+            {col: counts[rows] for col, counts in self.category_counts.items()},
+            {col: regs[rows] for col, regs in self.registers.items()},
+            {col: top.take(rows) for col, top in self.top_values.items()},
+            self.duration_sum[rows], self.duration_count[rows]
+        )
+
+    @staticmethod
+    def concat(parts: List['_DailyCells']) -> '_DailyCells':
+        first = parts[0]
+        if len(parts) == 1:
+            return first
+        return _DailyCells(
+            np.concatenate([p.days for p in parts]),
+            np.concatenate([p.row_counts for p in parts]),
+            np.concatenate([p.non_null for p in parts]),
+            {col: np.concatenate([p.category_counts[col] for p in parts]) for col in first.category_counts},
+            {col: np.concatenate([p.registers[col] for p in parts]) for col in first.registers},
+            {col: _TopValueCells.concat([p.top_values[col] for p in parts]) for col in first.top_values},
+            np.concatenate([p.duration_sum for p in parts]),
+            np.concatenate([p.duration_count for p in parts])
+        )
+
+class DailyRangeSummary:
+    """Bir tarih aralığının birleştirilmiş özeti (DailyAggregateCube.summarize çıktısı)"""
+
+    def __init__(self, cube: 'DailyAggregateCube', cells: _DailyCells):
+        self.columns = cube.columns
+        self.date_column = cube.date_column
+        self.duration_column = cube.duration_column
+        self._categories = cube.categories
+        self._top_capacity = cube.top_capacity
+        self._cells = cells
+        self.row_count = int(cells.row_counts.sum())
+        self.non_null = pd.Series(cells.non_null.sum(axis=0), index=pd.Index(cube.columns, dtype=object))
+        self.duration_total = float(cells.duration_sum.sum())
+        self.duration_count = int(cells.duration_count.sum())
+
+        # Tarihli günler (aralık uçlarındaki kısmi günler dahil), gün sırasıyla
+        dated = ~np.isnat(cells.days)
+        frame = pd.DataFrame({
+            'kayit': cells.row_counts[dated],
+            'sure_toplam': cells.duration_sum[dated],
+            'sure_adet': cells.duration_count[dated]
+        }, index=pd.DatetimeIndex(cells.days[dated].astype('datetime64[ns]')))
+        self.daily = frame[frame['kayit'] > 0].groupby(level=0).sum().sort_index()
+
+    @property
+    def daily_counts(self) -> pd.Series:
+        """Gün → kayıt sayısı (sadece kaydı olan günler)"""
+        return self.daily['kayit']
+
+    def is_exact(self, column) -> bool:
+        """Kolonun benzersiz sayısı kesin mi (değer sayımı tutuluyor mu)?"""
+        return column in self._categories
+
+    def distinct(self, column) -> int:
+        """Aralıktaki benzersiz değer sayısı (kesin veya HyperLogLog tahmini)"""
+        if column in self._categories:
+            return int(np.count_nonzero(self._cells.category_counts[column].sum(axis=0)))
+        registers = self._cells.registers[column]
+        if len(registers) == 0:
+            return 0
+        return int(round(hll_estimate(registers.max(axis=0))))
+
+    def top_values(self, column, k: int = 10) -> Optional[pd.Series]:
+        """En sık k değer → sayı (azalan); kesin sayım yoksa günlük adaylardan tahmin edilir"""
+        # Tahmini sayılar üst sınırdır (listelenmeyen günlerde değerin o günün tabanı kadar
+        # geçtiği varsayılır); tüm günlerde aday olan değerler için kesindir.
+        if column in self._categories:
+            return self.value_counts(column).head(k)
+        if column not in self._cells.top_values:
+            return None
+        return self._cells.top_values[column].combine(max(k, self._top_capacity)).head(k)
+
+    def value_counts(self, column) -> Optional[pd.Series]:
+        """Ham değer sayımları (azalan); kolon için sayım tutulmuyorsa None"""
+        if column not in self._categories:
+            return None
+        counts = pd.Series(self._cells.category_counts[column].sum(axis=0), index=self._categories[column])
+        return counts[counts > 0].sort_values(ascending=False, kind='stable')
+
+class DailyAggregateCube:
+    """Temiz verinin gün bazında önceden hesaplanmış özeti"""
+
+    def __init__(self, date_column, columns: List, categories: Dict, cells: _DailyCells,
+                 duration_column=None, precision: int = HLL_DEFAULT_PRECISION,
+                 top_capacity: int = TOPK_DEFAULT_CAPACITY):
+        self.date_column = date_column
+        self.columns = columns
+        self.categories = categories      # {kolon: pd.Index}; kesin sayım tutulan kolonlar
+        self.cells = cells                # cells.days[0] = NaT (tarihsiz), sonrası artan günler
+        self.duration_column = duration_column
+        self.precision = precision
+        self.top_capacity = top_capacity
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, date_column, duration_column=None,
+              max_categories: int = MAX_CATEGORIES, precision: int = HLL_DEFAULT_PRECISION,
+              top_capacity: int = TOPK_DEFAULT_CAPACITY) -> 'DailyAggregateCube':
+        """Veriyi tek geçişte gün hücrelerine özetler (date_column datetime64 olmalı)"""
+        if duration_column is None:
+            duration_column = find_duration_column(df.columns)
+
+        day_values = df[date_column].to_numpy().astype('datetime64[D]')
+        undated = np.isnat(day_values)
+        days = np.unique(day_values[~undated])
+        codes = np.zeros(len(df), dtype=np.intp)
+        codes[~undated] = np.searchsorted(days, day_values[~undated]) + 1
+
+        categories = {}
+        for position, column in enumerate(df.columns):
+            series = df.iloc[:, position]
+            if series.nunique(dropna=True) <= max_categories:
+                categories[column] = pd.Index(series.dropna().unique(), dtype=object)
+
+        cube = cls(date_column, list(df.columns), categories, None, duration_column, precision, top_capacity)
+        all_days = np.concatenate([np.array(['NaT'], dtype='datetime64[D]'), days])
+        cube.cells = cube._aggregate(df, codes, all_days)
+        return cube
+
+    def _aggregate(self, df: pd.DataFrame, codes: np.ndarray, days: np.ndarray) -> _DailyCells:
+        """Satırları codes ile verilen hücrelere toplar"""
+        n_cells = len(days)
+        row_counts = np.bincount(codes, minlength=n_cells).astype(np.int64)
+        non_null = np.zeros((n_cells, len(self.columns)), dtype=np.int64)
+        category_counts, registers, top_values = {}, {}, {}
+
+        for position, column in enumerate(self.columns):
+            series = df.iloc[:, position]
+            present = series.notna().to_numpy()
+            non_null[:, position] = np.bincount(codes[present], minlength=n_cells)
+            if column in self.categories:
+                values = self.categories[column]
+                value_codes = values.get_indexer(series[present])
+                known = value_codes >= 0
+                flat = codes[present][known] * len(values) + value_codes[known]
+                category_counts[column] = np.bincount(
+                    flat, minlength=n_cells * len(values)
+                ).reshape(n_cells, len(values)).astype(np.int64)
+            else:
+                hashes = pd.util.hash_pandas_object(series[present], index=False).to_numpy(dtype=np.uint64)
+                registers[column] = hll_registers(hashes, self.precision, codes[present], n_cells)
+                # En sık değer adayları sadece metin kolonlarında tutulur (ölçümler/tarihler için anlamsız)
+                if series.dtype == object:
+                    top_values[column] = _TopValueCells.build(series, codes, present, hashes,
+                                                              n_cells, self.top_capacity)
+
+        duration_sum = np.zeros(n_cells, dtype=np.float64)
+        duration_count = np.zeros(n_cells, dtype=np.int64)
+        if self.duration_column is not None and self.duration_column in df.columns:
+            durations = parse_duration_minutes(df[self.duration_column]).to_numpy(dtype=np.float64)
+            valid = ~np.isnan(durations)
+            duration_sum = np.bincount(codes[valid], weights=durations[valid], minlength=n_cells)
+            duration_count = np.bincount(codes[valid], minlength=n_cells).astype(np.int64)
+
+        return _DailyCells(days, row_counts, non_null, category_counts, registers, top_values,
+                           duration_sum, duration_count)
+
+    def summarize(self, start=None, end=None, frame: Optional[pd.DataFrame] = None) -> DailyRangeSummary:
+        """[start, end] aralığının özetini hücrelerden birleştirir"""
+        # frame: aynı aralıkla slice_by_date'ten dönen dilim. Verilirse aralığın ilk/son günü
+        # (gün ortasında başlayıp bitebilir) bu dilimden kesin hesaplanır; verilmezse özet
+        # gün çözünürlüğündedir (uç günler tam sayılır).
+        days = self.cells.days
+        if start is None and end is None:
+            return DailyRangeSummary(self, self.cells)
+
+        first_day = np.datetime64(pd.Timestamp(start).date(), 'D') if start is not None else None
+        last_day = np.datetime64(pd.Timestamp(end).date(), 'D') if end is not None else None
+        exact_edges = frame is not None and frame.attrs.get('tarih_indeksi') == self.date_column
+
+        # Hücre 0 (tarihsiz) atlanır; days[1:] artan sıralıdır
+        lower, upper = 1, len(days)
+        if first_day is not None:
+            lower = 1 + int(np.searchsorted(days[1:], first_day, side='right' if exact_edges else 'left'))
+        if last_day is not None:
+            upper = 1 + int(np.searchsorted(days[1:], last_day, side='left' if exact_edges else 'right'))
+        parts = [self.cells.take(slice(lower, max(lower, upper)))]
+
+        if exact_edges:
+            edge_days = [day for day in (first_day, last_day) if day is not None]
+            for day in sorted(set(edge_days)):
+                rows = self._rows_on_day(frame, day)
+                if len(rows):
+                    day_codes = np.zeros(len(rows), dtype=np.intp)
+                    parts.append(self._aggregate(rows, day_codes, np.array([day], dtype='datetime64[D]')))
+        return DailyRangeSummary(self, _DailyCells.concat(parts))
+
+    @staticmethod
+    def _rows_on_day(frame: pd.DataFrame, day: np.datetime64) -> pd.DataFrame:
+        """Tarihe göre sıralı dilimde verilen güne düşen satırlar (ikili arama)"""
+        # NaT satırları (varsa) dilimin başındadır; arama geri kalan sıralı kısımda yapılır
+        valid_from = int(np.searchsorted(frame.index.asi8, pd.NaT.value, side='right'))
+        dated = frame.index[valid_from:]
+        start = pd.Timestamp(day)
+        lower = int(dated.searchsorted(start, side='left'))
+        upper = int(dated.searchsorted(start + pd.Timedelta(days=1), side='left'))
+        return frame.iloc[valid_from + lower:valid_from + upper]
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Temiz Veri Tutamacı - Diske Taşınmış Analiz Sonucu
+Temizlenmiş DataFrame'i Arrow IPC dosyasına yazar; kolonları/satırları ihtiyaç anında yükler.
+"""
+
+# Bu modülün amacı:
+# - Toplu analizde ve GUI'de her sonucun temiz verisini bellekte tutmamak
+# - Sonuç sözlüğünde DataFrame yerine hafif bir tutamaç (dosya yolu + kolon/satır bilgisi) taşımak
+# - Sadece istenen kolonları / tarih aralığındaki satırları yüklemek (aralık araması bellek eşlemeli)
+# - Yaşam döngüsünü açık yapmak: release() dosyayı siler; tutamaç çöpe giderse de silinir
+#
+# Döndürülen DataFrame'ler dosyaya bağlı kalmaz (bellek eşlemesi sadece çağrı içinde kullanılır):
+# Windows'ta eşlenmiş dosya silinemez ve uzun yaşayan bir dilim silmeyi engellerdi.
+# Yine de silinemeyen dosyalar loglanır; sonraki taramada ve program çıkışında yeniden denenir.
+#
+# Dosyalar: artifacts/cache/handles/<rastgele>.arrow (KVKK temizliği sonrası veri)
+# Arrow tek tipe zorladığından karışık tipli metin kolonları (önbellekte olduğu gibi) metin olarak saklanır.
+# pyarrow yoksa tutamaç veriyi bellekte tutar (davranış aynı, sadece bellek kazancı olmaz).
+
+import atexit
+import logging
+import os
+import time
+import uuid
+import weakref
+from typing import List, Optional, Sequence, Set
+
+import numpy as np
+import pandas as pd
+
+from columnar_cache import PYARROW_AVAILABLE, feather, pa, to_arrow_table
+from date_utils import date_slice_bounds, slice_by_date
+from file_security import get_artifacts_dir
+
+# Önceki oturumlardan (çökme vb.) kalmış tutamaç dosyaları bu süreden eskiyse silinir
+HANDLE_STALE_SECONDS = 24 * 60 * 60
+
+logger = logging.getLogger(__name__)
+
+# Silinemeyen tutamaç dosyaları (ör. Windows'ta başka bir süreç/eşleme tarafından açık)
+_pending_removals: Set[str] = set()
+
+class CleanDataHandle:
+    """Temiz verinin diskteki kopyasına tutamaç"""
+
+    def __init__(self, path: Optional[str], columns: List, row_count: int, date_index=None,
+                 stringified: Sequence = (), frame: Optional[pd.DataFrame] = None):
+        self.path = path
+        self.columns = columns
+        self.row_count = row_count
+        self.date_index = date_index          # index_by_date kolonu (yüklemede indeks yeniden kurulur)
+        self.stringified = list(stringified)  # metne çevrilerek saklanan karışık tipli kolonlar
+        self._frame = frame                   # pyarrow yoksa veri bellekte kalır
+        self._finalizer = weakref.finalize(self, _remove_file, path) if path else None
+
+    @classmethod
+    def spill(cls, df: pd.DataFrame, directory: Optional[str] = None) -> 'CleanDataHandle':
+        """DataFrame'i diske yazıp tutamacını döndürür (df çağıran tarafından bırakılabilir)"""
+        date_index = df.attrs.get('tarih_indeksi')
+        # Arrow kolon adları metin olmalıdır; aksi halde veri bellekte tutulur
+        if not PYARROW_AVAILABLE or not all(isinstance(column, str) for column in df.columns):
+            return cls(None, list(df.columns), len(df), date_index, frame=df)
+
+        directory = directory or get_artifacts_dir("cache", "handles")
+        os.makedirs(directory, exist_ok=True)
+        _remove_stale_files(directory)
+        path = os.path.join(directory, f"{uuid.uuid4().hex}.arrow")
+        table, stringified = to_arrow_table(df)
+        feather.write_feather(table, path, compression='uncompressed')
+        return cls(path, list(df.columns), len(df), date_index, stringified)
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    @property
+    def released(self) -> bool:
+        return self.path is None and self._frame is None
+
+    def load(self, columns: Optional[Sequence] = None) -> pd.DataFrame:
+        """Verinin tamamını veya sadece istenen kolonları yükler"""
+        if self._frame is not None:
+            return self._frame if columns is None else self._frame[list(columns)]
+        return self._to_frame(self._read(columns))
+
+    def slice_dates(self, start=None, end=None, columns: Optional[Sequence] = None) -> pd.DataFrame:
+        """[start, end] aralığını yükler; sadece aralıktaki satırlar belleğe alınır"""
+        # Aralık sınırları tarih kolonundan ikili aramayla bulunur (veri index_by_date ile
+        # sıralı yazılmıştır); sonra bellek eşlemeli tablonun sadece o dilimi kopyalanıp pandas'a
+        # çevrilir. Kopya (take) dönen DataFrame'in eşlenmiş dosyaya bağlı kalmamasını sağlar.
+        # Sınır verilmezse tarihsiz satırlar dahil tüm veri döner (GUI "Tüm veriler"); satır sayısı
+        # row_count ile aynı kalır, aksi halde AI özetindeki günlük toplamlar tutarsız sayılır.
+        if start is None and end is None:
+            return self.load(columns)
+        if self.date_index is None:
+            raise ValueError("Veride tarih indeksi yok; load() ile yükleyip kolon üzerinden süzün")
+        if self._frame is not None:
+            part = slice_by_date(self._frame, start, end)
+            return part if columns is None else part[list(columns)]
+        dates = self._read([self.date_index], memory_map=True).column(0).to_pandas()
+        lower, upper = date_slice_bounds(pd.DatetimeIndex(dates), start, end)
+        del dates
+        table = self._read(columns, memory_map=True)
+        return self._to_frame(table.take(pa.array(np.arange(lower, upper))))
+
+    def release(self):
+        """Diskteki dosyayı siler ve tutamacı kapatır (tekrar çağrılabilir)"""
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self.path = None
+        self._frame = None
+
+    def detach(self):
+        """Dosyanın sahipliğini bırakır (başka bir süreç tutamacı devralacaksa)"""
+        # Havuz çalışanı sonucu ana sürece gönderirken çağrılır; aksi halde çalışandaki
+        # kopya çöpe gittiğinde dosya silinirdi
+        if self._finalizer is not None:
+            self._finalizer.detach()
+            self._finalizer = None
+
+    def __enter__(self) -> 'CleanDataHandle':
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_finalizer'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Devralan süreç dosyanın sahibidir
+        self._finalizer = weakref.finalize(self, _remove_file, self.path) if self.path else None
+
+    def __repr__(self) -> str:
+        where = self.path or ("bellek" if self._frame is not None else "bırakıldı")
+        return f"CleanDataHandle({self.row_count} satır, {len(self.columns)} kolon, {where})"
+
+    def _read(self, columns: Optional[Sequence] = None, memory_map: bool = False):
+        # memory_map=True sadece çağrı içinde tüketilen tablolar için: eşlenmiş tablodan kopyasız
+        # üretilen DataFrame dosyayı açık tutar (Windows'ta release() silemez)
+        if self.path is None:
+            raise RuntimeError("Temiz veri tutamacı bırakılmış (release)")
+        return feather.read_table(self.path, columns=list(columns) if columns is not None else None,
+                                  memory_map=memory_map)
+
+    def _to_frame(self, table) -> pd.DataFrame:
+        df = table.to_pandas(split_blocks=True)
+        # Arrow tablosu indeks taşımaz; sıralı yazılmış veride indeks tarih kolonundan kurulur
+        if self.date_index in df.columns:
+            df.index = pd.DatetimeIndex(df[self.date_index], name=None)
+            df.attrs['tarih_indeksi'] = self.date_index
+        return df
+
+def _remove_file(path: str) -> bool:
+    """Dosyayı siler; silinemezse loglayıp yeniden denenmek üzere kaydeder"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        if path not in _pending_removals:
+            logger.warning("⚠️ Temiz veri dosyası silinemedi, daha sonra yeniden denenecek: %s (%s)", path, e)
+        _pending_removals.add(path)
+        return False
+    _pending_removals.discard(path)
+    return True
+
+def _retry_pending_removals():
+    """Daha önce silinemeyen dosyaları yeniden dener"""
+    for path in list(_pending_removals):
+        _remove_file(path)
+
+@atexit.register
+def _remove_pending_at_exit():
+    _retry_pending_removals()
+    for path in _pending_removals:
+        logger.warning("⚠️ Temiz veri dosyası silinemedi (%d saat sonra sonraki oturumda silinir): %s",
+                       HANDLE_STALE_SECONDS // 3600, path)
+
+def _remove_stale_files(directory: str):
+    _retry_pending_removals()
+    cutoff = time.time() - HANDLE_STALE_SECONDS
+    try:
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.endswith('.arrow') and os.path.getmtime(path) < cutoff:
+                _remove_file(path)
+    except OSError:
+        pass
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tek Geçişli Veri Profili - Kolon İstatistikleri
+Temiz verinin tip, boşluk, benzersiz değer, min/max, en sık değer ve örneklerini birlikte çıkarır.
+"""
+
+# Bu modülün amacı:
+# - analyze_content / analyze_data_types için kolon başına tek geçiş yapmak
+# - "exact" modda her kolon bir kez factorize edilir; boş sayısı, benzersiz sayısı,
+#   en sık değerler ve örnekler aynı kod dizisinden okunur
+# - "approx" modda değerler chunk chunk 64-bit özetlenir; benzersiz sayısı HyperLogLog,
+#   en sık değerler SpaceSaving ile tahmin edilir (bellek kolon uzunluğundan bağımsız)
+# - "auto" modda sadece SKETCH_MIN_ROWS ve üzeri satırlı metin kolonları özetlenir
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from data_sketches import SKETCH_MIN_ROWS, ColumnSketch, wants_sketch
+
+PROFILE_DISTINCT_MODES = ("exact", "approx", "auto")
+
+def profile_dataframe(df: pd.DataFrame, distinct_mode: str = "exact", top_k: int = 5,
+                      sample_size: int = 3, sketch_min_rows: int = SKETCH_MIN_ROWS) -> Dict:
+    """Tüm kolonların profilini tek geçişte çıkarır: {'veri_tipleri': ..., 'icerik_analizi': ...}"""
+    if distinct_mode not in PROFILE_DISTINCT_MODES:
+        raise ValueError(f"Geçersiz benzersiz sayım modu: {distinct_mode} "
+                         f"(seçenekler: {', '.join(PROFILE_DISTINCT_MODES)})")
+
+    dtypes, nulls, distinct, min_max, top_values, samples = {}, {}, {}, {}, {}, {}
+    for position, column in enumerate(df.columns):
+        series = df.iloc[:, position]
+        dtypes[column] = str(series.dtype)
+
+        if distinct_mode == "approx" or (distinct_mode == "auto" and wants_sketch(series, sketch_min_rows)):
+            sketch = ColumnSketch().add(series)
+            present = series.notna().to_numpy()
+            distinct[column] = len(sketch.distinct)
+            top_values[column] = [(_python_value(value), int(count))
+                                  for value, count in sketch.topk.top(top_k).items()]
+        else:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            present = codes >= 0
+            counts = np.bincount(codes[present], minlength=len(uniques))
+            distinct[column] = len(uniques)
+            # factorize sırası ilk görülme sırasıdır; kararlı sıralama eşitlikte bunu korur
+            order = np.argsort(-counts, kind='stable')[:top_k]
+            top_values[column] = [(_python_value(uniques[i]), int(counts[i])) for i in order]
+
+        nulls[column] = int(len(series) - np.count_nonzero(present))
+        samples[column] = series.iloc[np.flatnonzero(present)[:sample_size]].tolist()
+        if present.any() and (pd.api.types.is_datetime64_any_dtype(series) or
+                              (pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series))):
+            min_max[column] = (_python_value(series.min()), _python_value(series.max()))
+
+    type_counts = pd.Series(list(dtypes.values()), dtype=object).value_counts()
+    return {
+        'veri_tipleri': {
+            'tip_dagilimi': {str(k): int(v) for k, v in type_counts.items()},
+            'detaylar': dtypes
+        },
+        'icerik_analizi': {
+            'bos_degerler': nulls,
+            'benzersiz_degerler': distinct,
+            'benzersiz_modu': distinct_mode,
+            'ornek_veriler': samples,
+            'min_max': min_max,
+            'en_sik_degerler': top_values
+        }
+    }
+
+def _python_value(value):
+    # numpy skalerlerini (np.int64 vb.) JSON/raporlama için Python tiplerine çevirir
+    return value.item() if isinstance(value, np.generic) else value
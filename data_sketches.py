@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Olasılıksal Veri Özetleri (Sketch) - Benzersiz Değer ve En Sık Değer Tahmini
+Büyük kolonlarda benzersiz değer sayısını ve en sık değerleri sabit bellekle tahmin eder.
+"""
+
+# Bu modülün amacı:
+# - Kolon değerlerini vektörel olarak 64-bit özetlere (hash) çevirmek
+# - HyperLogLog kayıtçılarını (register) grup bazında (örn. gün gün) tek geçişte doldurmak
+# - Kayıtçıları birleştirerek (eleman bazında max) herhangi bir aralığın benzersiz
+#   değer sayısını, ham veriye dönmeden tahmin etmek
+# - En sık değerleri SpaceSaving özetiyle (sınırlı aday + hata payı) tutmak; özetler
+#   chunk'lar ve tarih aralıkları arasında birleştirilebilir
+#
+# precision=10 → 1024 kayıtçı (1 KB), tipik hata ≈ %3.2; küçük kümelerde doğrusal
+# sayım düzeltmesi sayesinde sonuç pratikte kesindir.
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+HLL_DEFAULT_PRECISION = 10
+
+def hash_values(series: pd.Series) -> np.ndarray:
+    """Boş olmayan değerlerin 64-bit özetlerini döndürür (uint64)"""
+    # Not: object kolonlarda özet metin gösterimi üzerinden alınır (1 ve '1' aynı sayılır)
+    return pd.util.hash_pandas_object(series.dropna(), index=False).to_numpy(dtype=np.uint64)
+
+def _register_positions(hashes: np.ndarray, precision: int):
+    """Özetlerden (kayıtçı indeksi, ilk 1 bitinin sırası) çiftlerini hesaplar"""
+    # Üst precision bit kayıtçıyı seçer; kalan (64 - precision) bitteki baştaki sıfır sayısı + 1 sıradır
+    rest_bits = 64 - precision
+    index = (hashes >> np.uint64(rest_bits)).astype(np.intp)
+    rest = hashes & np.uint64((1 << rest_bits) - 1)
+    # Bit uzunluğu float64 üssünden okunur; 53 biti aşan kısım kesin dönüşüm için atılır
+    dropped = max(0, rest_bits - 53)
+    _, exponent = np.frexp((rest >> np.uint64(dropped)).astype(np.float64))
+    bit_length = np.where(exponent > 0, exponent + dropped, 0)
+    rank = (rest_bits - bit_length + 1).astype(np.uint8)
+    return index, rank
+
+def hll_registers(hashes: np.ndarray, precision: int = HLL_DEFAULT_PRECISION,
+                  groups: Optional[np.ndarray] = None, n_groups: int = 1) -> np.ndarray:
+    """Özetlerden grup başına HyperLogLog kayıtçıları üretir: (n_groups, 2**precision) uint8"""
+    registers = np.zeros((n_groups, 1 << precision), dtype=np.uint8)
+    if len(hashes) == 0:
+        return registers
+    index, rank = _register_positions(hashes, precision)
+    if groups is None:
+        # Tek grup: (kayıtçı, sıra) çiftleri bincount ile işaretlenir, her kayıtçının en büyük
+        # işaretli sırası alınır (np.maximum.at'ten belirgin hızlı)
+        max_rank = 64 - precision + 1
+        seen = np.bincount(index * (max_rank + 1) + rank, minlength=(1 << precision) * (max_rank + 1))
+        seen = seen.reshape(1 << precision, max_rank + 1) > 0
+        registers[0] = np.where(seen.any(axis=1), max_rank - np.argmax(seen[:, ::-1], axis=1), 0)
+        return registers
+    np.maximum.at(registers, (groups, index), rank)
+    return registers
+
+def hll_estimate(registers: np.ndarray) -> float:
+    """Tek bir kayıtçı dizisinden (veya birleştirilmişinden) benzersiz sayı tahmini"""
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / float(np.sum(np.ldexp(1.0, -registers.astype(np.int64))))
+    zeros = int(np.count_nonzero(registers == 0))
+    # Küçük aralık düzeltmesi: boş kayıtçı varken doğrusal sayım daha isabetlidir
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * np.log(m / zeros)
+    return float(estimate)
+
+class HyperLogLog:
+    """Birleştirilebilir benzersiz değer sayacı"""
+
+    def __init__(self, precision: int = HLL_DEFAULT_PRECISION, registers: Optional[np.ndarray] = None):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision 4 ile 16 arasında olmalıdır")
+        self.precision = precision
+        self.registers = (registers if registers is not None
+                          else np.zeros(1 << precision, dtype=np.uint8))
+
+    def add(self, series: pd.Series) -> 'HyperLogLog':
+        """Serinin boş olmayan değerlerini ekler"""
+        np.maximum(self.registers, hll_registers(hash_values(series), self.precision)[0], out=self.registers)
+        return self
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Başka bir sayacı (aynı precision) bu sayaca katar"""
+        if other.precision != self.precision:
+            raise ValueError("Farklı precision değerine sahip sayaçlar birleştirilemez")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        return hll_estimate(self.registers)
+
+    def __len__(self) -> int:
+        return int(round(self.estimate()))
+
+# Bu kadar (ve üzeri) satırlı metin kolonlarında çağıranlar kesin sayım yerine özet kullanabilir
+SKETCH_MIN_ROWS = 100_000
+
+# En sık değer özetinde tutulan aday sayısı ve özetlemede tek seferde işlenen satır sayısı
+TOPK_DEFAULT_CAPACITY = 64
+SKETCH_CHUNK_ROWS = 65_536
+
+def wants_sketch(series: pd.Series, min_rows: int = SKETCH_MIN_ROWS) -> bool:
+    """Kolon özetle sayılmaya değer mi? (büyük metin/object kolonları)"""
+    # Sayısal, tarih ve category kolonları zaten ucuz sayılır; pahalı olan uzun metinlerin özetlenmesidir
+    return series.dtype == object and len(series) >= min_rows
+
+def combine_topk(hashes: np.ndarray, counts: np.ndarray, errors: np.ndarray, entry_floors: np.ndarray,
+                 total_floor: int, capacity: int):
+    """Birden çok en sık değer özetini birleştirir: (özetler, sayılar, hatalar, yeni taban)"""
+    # Girdiler tüm özetlerin girişlerinin art arda eklenmiş halidir; entry_floors her girişin ait
+    # olduğu özetin tabanıdır (o özette listelenmeyen bir değerin sayısı için üst sınır).
+    # Bir değerin tahmini = listelendiği özetlerdeki sayılar + listelenmediği özetlerin tabanları
+    #                     = toplam taban + Σ (sayı - kendi özetinin tabanı)
+    if len(hashes) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return np.empty(0, dtype=np.uint64), empty, empty, int(total_floor)
+    codes, unique_hashes = pd.factorize(hashes)
+    estimates = total_floor + np.bincount(codes, weights=counts - entry_floors).astype(np.int64)
+    bounds = total_floor + np.bincount(codes, weights=errors - entry_floors).astype(np.int64)
+    order = np.argsort(-estimates, kind='stable')
+    kept, dropped = order[:capacity], order[capacity:]
+    # Atılan en büyük tahmin, listede kalmayan değerler için yeni üst sınırdır
+    floor = max(int(total_floor), int(estimates[dropped[0]]) if len(dropped) else 0)
+    return unique_hashes[kept].astype(np.uint64), estimates[kept], bounds[kept], floor
+
+class SpaceSaving:
+    """Birleştirilebilir en sık değer (top-k) özeti"""
+    # En fazla capacity aday tutulur. counts üst sınır tahminidir; gerçek sayı
+    # [count - error, count] aralığındadır. Listede olmayan her değerin sayısı <= floor.
+    # Chunk'lar kesin sayılıp kırpılarak eklenir; iki özet birleştirilebilir (günler/aralıklar).
+
+    def __init__(self, capacity: int = TOPK_DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.errors = np.empty(0, dtype=np.int64)
+        self.floor = 0
+        self.labels = {}                      # özet → ilk görülen değer
+
+    def add(self, series: pd.Series) -> 'SpaceSaving':
+        """Serinin boş olmayan değerlerini ekler"""
+        values = series.dropna()
+        for start in range(0, len(values), SKETCH_CHUNK_ROWS):
+            chunk = values.iloc[start:start + SKETCH_CHUNK_ROWS]
+            self.add_hashes(hash_values(chunk), chunk)
+        return self
+
+    def add_hashes(self, hashes: np.ndarray, values: pd.Series) -> 'SpaceSaving':
+        """Önceden hesaplanmış özetleri (values ile aynı sırada) ekler"""
+        if len(hashes) == 0:
+            return self
+        codes, unique_hashes = pd.factorize(hashes)
+        counts = np.bincount(codes, minlength=len(unique_hashes))
+        # factorize kodları ilk görülme sırasındadır; tersten atama her kodun ilk konumunu bırakır
+        first_positions = np.empty(len(unique_hashes), dtype=np.intp)
+        first_positions[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)
+
+        chunk = SpaceSaving(self.capacity)
+        order = np.argsort(-counts, kind='stable')
+        kept = order[:self.capacity]
+        chunk.hashes = unique_hashes[kept].astype(np.uint64)
+        chunk.counts = counts[kept].astype(np.int64)
+        chunk.errors = np.zeros(len(kept), dtype=np.int64)
+        chunk.floor = int(counts[order[self.capacity]]) if len(order) > self.capacity else 0
+        chunk.labels = {int(h): values.iloc[p] for h, p in zip(chunk.hashes, first_positions[kept])}
+        return self.merge(chunk)
+
+    def merge(self, other: 'SpaceSaving') -> 'SpaceSaving':
+        """Başka bir özeti bu özete katar"""
+        floors = np.concatenate([np.full(len(self.hashes), self.floor), np.full(len(other.hashes), other.floor)])
+        self.hashes, self.counts, self.errors, self.floor = combine_topk(
+            np.concatenate([self.hashes, other.hashes]), np.concatenate([self.counts, other.counts]),
+            np.concatenate([self.errors, other.errors]), floors, self.floor + other.floor, self.capacity
+        )
+        labels = {**other.labels, **self.labels}
+        self.labels = {int(h): labels[int(h)] for h in self.hashes}
+        return self
+
+    def top(self, k: Optional[int] = None) -> pd.Series:
+        """En sık değerler → tahmini sayı (azalan)"""
+        k = len(self.hashes) if k is None else k
+        return pd.Series(self.counts[:k], index=pd.Index([self.labels[int(h)] for h in self.hashes[:k]], dtype=object))
+
+class ColumnSketch:
+    """Bir kolonun benzersiz sayı (HyperLogLog) ve en sık değer (SpaceSaving) özeti"""
+    # Değerler chunk chunk bir kez özetlenir; iki özet de aynı özet dizisinden beslenir.
+    # Bellek, kolon uzunluğundan bağımsız olarak kayıtçılar + capacity aday ile sınırlıdır.
+
+    def __init__(self, precision: int = HLL_DEFAULT_PRECISION, capacity: int = TOPK_DEFAULT_CAPACITY):
+        self.distinct = HyperLogLog(precision)
+        self.topk = SpaceSaving(capacity)
+        self.count = 0
+
+    def add(self, series: pd.Series) -> 'ColumnSketch':
+        values = series.dropna()
+        for start in range(0, len(values), SKETCH_CHUNK_ROWS):
+            chunk = values.iloc[start:start + SKETCH_CHUNK_ROWS]
+            hashes = hash_values(chunk)
+            np.maximum(self.distinct.registers, hll_registers(hashes, self.distinct.precision)[0],
+                       out=self.distinct.registers)
+            self.topk.add_hashes(hashes, chunk)
+        self.count += len(values)
+        return self
+
+    def merge(self, other: 'ColumnSketch') -> 'ColumnSketch':
+        self.distinct.merge(other.distinct)
+        self.topk.merge(other.topk)
+        self.count += other.count
+        return self
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Temiz Veri Yazıcıları - Excel / CSV / Parquet Çıktı
+Temizlenmiş veriyi seçilen formatta geçici dosyaya yazıp atomik olarak yerine taşır.
+"""
+
+# Bu modülün amacı:
+# - save_cleaned_data için çalıştırma başına seçilebilen çıktı formatı sunmak
+# - Excel'i openpyxl write-only (akış) modunda yazmak: hücre nesneleri bellekte birikmez,
+#   satırlar kolon dizilerinden doğrudan üretilir (lxml kuruluysa openpyxl XML'i onunla
+#   yazar; saf Python yazıcıya göre belirgin hızlıdır)
+# - Yarım yazılmış dosya bırakmamak: önce <hedef>.<pid>.tmp, sonra os.replace
+# - Hedef kilitliyse (Excel'de açık) veriyi yeniden yazmadan geçici dosyayı zaman damgalı
+#   alternatif ada taşımak
+#
+# Yeni format eklemek için: register_writer("json", ".json", yazici_fonksiyon)
+
+import os
+from datetime import datetime
+from typing import Callable, Dict, Tuple
+
+import pandas as pd
+from openpyxl import Workbook
+
+from columnar_cache import PYARROW_AVAILABLE, to_arrow_table
+
+if PYARROW_AVAILABLE:
+    import pyarrow.parquet as pq
+else:
+    pq = None
+
+# Excel sayfa sınırı (başlık satırı dahil)
+EXCEL_MAX_ROWS = 1_048_576
+
+DEFAULT_OUTPUT_FORMAT = "xlsx"
+
+# format → (dosya uzantısı, yazıcı(df, yol))
+_WRITERS: Dict[str, Tuple[str, Callable[[pd.DataFrame, str], None]]] = {}
+
+def register_writer(output_format: str, extension: str, writer: Callable[[pd.DataFrame, str], None]):
+    """Çıktı formatı için yazıcı kaydeder (aynı ad varsa değiştirir)"""
+    _WRITERS[output_format] = (extension, writer)
+
+def output_formats() -> Tuple[str, ...]:
+    return tuple(_WRITERS)
+
+def output_path(output_dir: str, file_name: str, output_format: str, prefix: str = "clean_") -> str:
+    """Kaynak dosya adından çıktı yolunu üretir (uzantı formata göre değişir)"""
+    extension, _ = _get_writer(output_format)
+    base, _ = os.path.splitext(file_name)
+    return os.path.join(output_dir, f"{prefix}{base}{extension}")
+
+def write_frame(df: pd.DataFrame, path: str, output_format: str = DEFAULT_OUTPUT_FORMAT) -> str:
+    """DataFrame'i atomik olarak yazar; yazılan yolu döndürür"""
+    # Hedef başka bir uygulamada açık olduğu için değiştirilemiyorsa (PermissionError) aynı
+    # geçici dosya clean_<saat>_<ad> biçimli alternatif ada taşınır; veri ikinci kez yazılmaz.
+    _, writer = _get_writer(output_format)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        writer(df, tmp_path)
+        try:
+            os.replace(tmp_path, path)
+            return path
+        except PermissionError:
+            directory, name = os.path.split(path)
+            prefix = "clean_" if name.startswith("clean_") else ""
+            alt_path = os.path.join(directory, f"{prefix}{datetime.now().strftime('%H%M%S')}_{name[len(prefix):]}")
+            os.replace(tmp_path, alt_path)
+            return alt_path
+    finally:
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+def _get_writer(output_format: str) -> Tuple[str, Callable[[pd.DataFrame, str], None]]:
+    if output_format not in _WRITERS:
+        raise ValueError(f"Desteklenmeyen çıktı formatı: {output_format} "
+                         f"(seçenekler: {', '.join(_WRITERS)})")
+    return _WRITERS[output_format]
+
+def _write_xlsx(df: pd.DataFrame, path: str):
+    """openpyxl write-only modunda tek sayfa yazar (indeks yazılmaz)"""
+    if len(df) + 1 > EXCEL_MAX_ROWS:
+        raise ValueError(f"{len(df):,} satır Excel sınırını aşıyor; csv veya parquet formatını kullanın")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append([str(column) for column in df.columns])
+    # Kolonlar bir kez object dizisine çevrilir; boş hücreler (NaN/NaT/None) None olarak yazılır
+    columns = []
+    for position in range(df.shape[1]):
+        series = df.iloc[:, position]
+        values = series.to_numpy(dtype=object, copy=True)
+        values[series.isna().to_numpy()] = None
+        columns.append(values)
+    for row in zip(*columns):
+        sheet.append(row)
+    workbook.save(path)
+
+def _write_csv(df: pd.DataFrame, path: str):
+    # utf-8-sig: Türkçe karakterler Excel'de doğru açılsın
+    df.to_csv(path, index=False, encoding='utf-8-sig')
+
+def _write_parquet(df: pd.DataFrame, path: str):
+    if pq is None:
+        raise RuntimeError("Parquet çıktısı için pyarrow gerekli (pip install pyarrow)")
+    # Kolon adları Arrow'da metin olmalıdır; karışık tipli kolonlar önbellekteki gibi metne çevrilir
+    table, _ = to_arrow_table(df.rename(columns=str))
+    pq.write_table(table, path)
+
+register_writer("xlsx", ".xlsx", _write_xlsx)
+register_writer("csv", ".csv", _write_csv)
+register_writer("parquet", ".parquet", _write_parquet)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tarih Kolonu Yardımcıları - Format Sezme ve Tek Seferlik Ayrıştırma
+Vardiya kayıtlarındaki tarih kolonlarını bir kez datetime64'e çevirir.
+"""
+
+# Bu modülün amacı:
+# - Tarih kolonunun formatını küçük bir örneklemden sezmek (ISO, gg.aa.yyyy, Excel seri no)
+# - Tüm kolonu sezilen tek formatla (hızlı yol) ayrıştırmak
+# - Analiz, GUI filtresi ve AI özeti gibi tüketicilerin aynı kolonu tekrar tekrar
+#   pd.to_datetime ile ayrıştırmasını önlemek (kolon zaten datetime64 ise olduğu gibi kullanılır)
+# - Temiz veriyi tarihe göre sıralı DatetimeIndex ile tutup aralık filtrelerini ikili aramaya çevirmek
+
+import re
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Tarih kolonunu adından tanımak için anahtar kelimeler
+DATE_NAME_KEYWORDS = ('tarih', 'date', 'zaman', 'time')
+
+# Kolonun datetime64'e çevrilmesi için gereken minimum başarı oranı (dolu değerler içinde)
+DATE_PARSE_MIN_RATIO = 0.8
+
+# Sezme sırasında denenen formatlar (Türkçe kayıtlarda gün önce gelir)
+DATE_FORMATS = (
+    'ISO8601',
+    '%d.%m.%Y',
+    '%d.%m.%Y %H:%M',
+    '%d.%m.%Y %H:%M:%S',
+    '%d/%m/%Y',
+    '%d/%m/%Y %H:%M',
+    '%d-%m-%Y',
+)
+
+# Excel seri tarih aralığı (~1954 - ~2119); bu aralıktaki sayısal kolonlar seri tarih kabul edilir
+_EXCEL_SERIAL_RANGE = (20000, 80000)
+_EXCEL_EPOCH = '1899-12-30'
+
+# Değerde yıl içeren tarih bileşeni (gg.aa.yyyy, yyyy-aa-gg, "5 Jan 2024" ...). Sadece saat ("08:00")
+# veya yılsız değerler serbest ayrıştırmada bugünün tarihini/yılını alacağından tarih sayılmaz.
+_DATE_COMPONENT_RE = re.compile(r'\d{1,4}[./-]\d{1,2}[./-]\d{1,4}|(?<!\d)\d{4}(?!\d)')
+
+def has_date_name(column) -> bool:
+    """Kolon adı tarih/zaman bildiriyor mu?"""
+    column_lower = str(column).lower()
+    return any(keyword in column_lower for keyword in DATE_NAME_KEYWORDS)
+
+def has_date_component(sample: pd.Series) -> bool:
+    """Örneklem değerlerinin yeterli kısmı (DATE_PARSE_MIN_RATIO) yıl içeren bir tarih taşıyor mu?"""
+    values = sample.dropna().astype(str)
+    if len(values) == 0:
+        return False
+    return float(values.str.contains(_DATE_COMPONENT_RE).mean()) >= DATE_PARSE_MIN_RATIO
+
+def sniff_date_format(series: pd.Series, sample_size: int = 50) -> Tuple[Optional[str], float]:
+    """Dolu değerlerin ilk sample_size kadarından formatı sezer: (format, örneklem başarı oranı)"""
+    # Dönen format: 'datetime' (zaten tipli), 'excel_serial', DATE_FORMATS'tan biri,
+    # 'karisik' (tek format yok, değer bazlı gün-önce ayrıştırma) veya None.
+    # Değerlerde tarih bileşeni yoksa (ör. sadece saat) 'karisik' dönmez: serbest ayrıştırma
+    # eksik tarihi bugünle doldurur, yani veride olmayan tarih uydurur.
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'datetime', 1.0
+
+    sample = series.dropna().head(sample_size)
+    if len(sample) == 0:
+        return None, 0.0
+
+    if pd.api.types.is_bool_dtype(series):
+        return None, 0.0
+    if pd.api.types.is_numeric_dtype(series):
+        low, high = _EXCEL_SERIAL_RANGE
+        ratio = float(sample.between(low, high).mean())
+        return ('excel_serial', ratio) if ratio > 0 else (None, 0.0)
+
+    best_format, best_ratio = None, 0.0
+    for date_format in DATE_FORMATS:
+        ratio = float(pd.to_datetime(sample, format=date_format, errors='coerce').notna().mean())
+        if ratio > best_ratio:
+            best_format, best_ratio = date_format, ratio
+            if ratio == 1.0:
+                break
+    if best_ratio >= DATE_PARSE_MIN_RATIO:
+        return best_format, best_ratio
+
+    if not has_date_component(sample):
+        return None, 0.0
+    ratio = float(pd.to_datetime(sample, format='mixed', dayfirst=True, errors='coerce').notna().mean())
+    return ('karisik', ratio) if ratio > 0 else (None, 0.0)
+
+def parse_date_series(series: pd.Series) -> Tuple[pd.Series, Optional[str], float]:
+    """Kolonu sezilen formatla tek seferde ayrıştırır: (datetime64 seri, format, başarı oranı)"""
+    # Başarı oranı tüm dolu değerler üzerinden hesaplanır; ayrıştırılamayanlar NaT olur.
+    date_format, _ = sniff_date_format(series)
+    if date_format is None:
+        return pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]'), None, 0.0
+    if date_format == 'datetime':
+        return series, date_format, 1.0
+
+    parsed = parse_with_format(series, date_format)
+    non_null = int(series.notna().sum())
+    ratio = float(parsed.notna().sum()) / non_null if non_null else 0.0
+    return parsed, date_format, ratio
+
+def parse_with_format(series: pd.Series, date_format: str) -> pd.Series:
+    """Kolonu verilen (daha önce sezilmiş) formatla ayrıştırır; ayrıştırılamayanlar NaT olur"""
+    # Artımlı içe aktarmada yeni satırlar, ilk analizde sezilen formatla ayrıştırılır
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if date_format == 'excel_serial':
+        low, high = _EXCEL_SERIAL_RANGE
+        numbers = pd.to_numeric(series, errors='coerce')
+        serials = numbers.where(numbers.between(low, high))
+        return pd.to_datetime(serials, unit='D', origin=_EXCEL_EPOCH, errors='coerce')
+    if date_format == 'karisik':
+        return pd.to_datetime(series, format='mixed', dayfirst=True, errors='coerce')
+    if date_format == 'datetime':
+        return pd.to_datetime(series, errors='coerce')
+    return pd.to_datetime(series, format=date_format, errors='coerce')
+
+def as_datetime(series: pd.Series) -> pd.Series:
+    """Kolon datetime64 ise aynen, değilse format sezerek ayrıştırılmış halini döndürür"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return parse_date_series(series)[0]
+
+def index_by_date(df: pd.DataFrame, column) -> pd.DataFrame:
+    """Veriyi tarih kolonuna göre kararlı sıralar ve DatetimeIndex kurar (kolon korunur)"""
+    # Tarihi olmayan (NaT) satırlar başa alınır: NaT en küçük int64 değerine sahip olduğundan
+    # indeksin ham değerleri (asi8) baştan sona artan kalır ve ikili arama doğrudan çalışır.
+    # İndeks adı boş bırakılır; aynı adlı kolonla "belirsiz etiket" hatası oluşmaz.
+    ordered = df.sort_values(column, kind='stable', na_position='first')
+    ordered.index = pd.DatetimeIndex(ordered[column], name=None)
+    ordered.attrs['tarih_indeksi'] = column
+    return ordered
+
+def date_slice_bounds(index: pd.DatetimeIndex, start=None, end=None) -> Tuple[int, int]:
+    """index_by_date sıralı indekste [start, end] aralığının konum sınırları: (alt, üst)"""
+    # Sınır verilmezse (None, None) tüm satırlar döner: slice_by_date ile aynı, tarihsiz (NaT)
+    # satırlar dahil. En az bir sınır verildiğinde NaT satırları (baştaki blok) hiçbir aralığa
+    # girmez; arama geri kalan (sıralı) dilimde DatetimeIndex.searchsorted ile yapılır
+    # (zaman birimi farklarını pandas yönetir).
+    if start is None and end is None:
+        return 0, len(index)
+    first_valid = int(np.searchsorted(index.asi8, pd.NaT.value, side='right'))
+    dated = index[first_valid:]
+    lower, upper = 0, len(dated)
+    if start is not None:
+        lower = int(dated.searchsorted(pd.Timestamp(start), side='left'))
+    if end is not None:
+        upper = int(dated.searchsorted(pd.Timestamp(end), side='right'))
+    lower, upper = first_valid + lower, first_valid + upper
+    return lower, max(lower, upper)
+
+def slice_by_date(df: pd.DataFrame, start=None, end=None, column=None) -> pd.DataFrame:
+    """[start, end] aralığındaki satırları döndürür (uçlar dahil)"""
+    # index_by_date ile hazırlanmış veride O(log n) ikili arama + iloc dilimi (kopya yok);
+    # diğer durumlarda kolon üzerinden maske ile süzülür.
+    if start is None and end is None:
+        return df
+
+    column = column if column is not None else df.attrs.get('tarih_indeksi')
+    if df.attrs.get('tarih_indeksi') == column and isinstance(df.index, pd.DatetimeIndex):
+        lower, upper = date_slice_bounds(df.index, start, end)
+        return df.iloc[lower:upper]
+
+    dates = as_datetime(df[column])
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= dates >= start
+    if end is not None:
+        mask &= dates <= end
+    return df[mask]
@@ -57,15 +57,13 @@ def run_console_demo():
         from excel_analyzer import ExcelAnalyzer
         
         analyzer = ExcelAnalyzer()
-        results = analyzer.analyze_all_files()
+        # Temiz veriler her dosyanın analizi bitince kaydedilir
+        results = analyzer.analyze_all_files(output_dir="cleaned_data")
         
         if results:
             summary = analyzer.generate_summary_report(results)
             print(summary)
             
-            # Temizlenmiş verileri kaydet
-            analyzer.save_cleaned_data(results)
-            
             print(f"\n✅ Demo tamamlandı!")
             print(f"📁 Temizlenmiş veriler 'cleaned_data/' klasöründe")
         else:
@@ -13,12 +13,228 @@ Bu sistem Excel dosyalarını analiz eder ve kişisel verileri temizler.
 import pandas as pd
 import numpy as np
 import re
+import hashlib
+import json
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
+import argparse
+import glob
 import os
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Sequence
+import logging
+import multiprocessing
+import sys
 import warnings
+from file_security import get_artifacts_dir
+from columnar_cache import ColumnarAnalysisCache
+from date_utils import has_date_name, parse_date_series, index_by_date, DATE_PARSE_MIN_RATIO
+from daily_aggregates import DailyAggregateCube
+from data_profile import profile_dataframe
+from data_handle import CleanDataHandle
+from data_writers import DEFAULT_OUTPUT_FORMAT, output_formats, output_path, write_frame
+from incremental_ingest import (INGEST_EDGE_ROWS, WorkbookRegistry, align_new_rows, build_tail_workbook,
+                                rows_fingerprint, workbook_identity)
 warnings.filterwarnings('ignore')
 
+# KVKK tanı kanalı: kolon kararları INFO, değer/kural detayları DEBUG seviyesinde loglanır.
+# Varsayılan olarak (yapılandırılmadıkça) sessizdir; bkz. configure_kvkk_logging
+logger = logging.getLogger(__name__)
+
+# İçerik analizi kuralları - modül yüklenirken bir kez derlenir
+_NUMERIC_CODE_RE = re.compile(r'^[\d\-\:\#\_]+$')
+_TC_NO_RE = re.compile(r'^\d{11}$')
+_PHONE_RE = re.compile(r'^(\+90|0)?\s*\d{3}\s*\d{3}\s*\d{2}\s*\d{2}$')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Temizlik sonrası 'category' tipine çevrilecek metin kolonları için sınırlar: en fazla
+# CATEGORICAL_MAX_UNIQUE benzersiz değer ve benzersiz/dolu oranı en fazla CATEGORICAL_MAX_RATIO
+CATEGORICAL_MAX_UNIQUE = 256
+CATEGORICAL_MAX_RATIO = 0.5
+
+# Yaygın Türkçe isimler (izole kelime olarak aranır)
+COMMON_TURKISH_NAMES = (
+    'mehmet', 'ahmet', 'mustafa', 'ali', 'hasan', 'hüseyin', 'ibrahim', 'ismail',
+    'murat', 'osman', 'süleyman', 'yusuf', 'fatma', 'ayşe', 'emine', 'hatice',
+    'zeynep', 'şerife', 'sultan', 'özlem', 'elif', 'sema', 'nuriye', 'gülsün',
+    'serkan', 'onur', 'burak', 'emre', 'kemal', 'deniz', 'yasemin', 'selin',
+    'pınar', 'sibel', 'dilek', 'gül', 'mine', 'özge'
+)
+
+# Teknik terimler (isim değil) - değer içinde alt dize olarak aranır
+TECHNICAL_TERMS = (
+    'çim', 'cem', 'çd', 'cd', 'df', 'mb', 'gb', 'kg', 'lt', 'mt', 'cm',
+    'mm', 'bar', 'psi', 'rpm', 'kwh', 'mw', 'kw', 'amp', 'volt', 'hz',
+    'flux', 'silo', 'bunker', 'mill', 'coal', 'cso', 'lab', 'test',
+    'deg', 'temp', 'press', 'flow', 'level', 'speed', 'load', 'run',
+    'stop', 'start', 'auto', 'manual', 'alarm', 'trip', 'fault'
+)
+
+# Personel ilişkili kolonlar (içerik analizinde daha sıkı eşik)
+PERSONNEL_RELATED_KEYWORDS = ('vardiyacı', 'vardiyaci', 'personel', 'calisan', 'çalışan')
+
+# İçerik kuralı adları (DEBUG tanı izi için, skorlama koşul sırasıyla aynı)
+_VALUE_RULE_LABELS = (
+    "Kısa değer", "Sayısal kod", "📱 TC no tespit", "📞 Telefon tespit",
+    "📧 Email tespit", "👤 İsim format tespit", "👤 Türkçe isim tespit"
+)
+
+_TECHNICAL_TERM_RE = re.compile('|'.join(re.escape(term) for term in TECHNICAL_TERMS))
+_COMMON_NAME_RE = re.compile(
+    r'(?:^|\s)(?:' + '|'.join(re.escape(name) for name in COMMON_TURKISH_NAMES) + r')(?=\s|$)'
+)
+
+def configure_kvkk_logging(level="INFO"):
+    """KVKK tanı mesajlarının konsol ayrıntı seviyesini ayarlar"""
+    # level: "DEBUG" (değer bazlı iz), "INFO" (kolon kararları), "WARNING" (sessiz)
+    # Konsola sade biçimde (sadece mesaj) yazan tek bir handler eklenir
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+    if not any(getattr(handler, '_kvkk_console', False) for handler in logger.handlers):
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        handler._kvkk_console = True
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+class _KeywordAutomaton:
+    """Çoklu anahtar kelime alt dize araması için Aho-Corasick otomatı"""
+    # Metin tek geçişte taranır; tüm anahtar kelimeler için ayrı 'in' kontrolüne gerek kalmaz.
+    # Birden fazla kelime eşleşirse listede önce gelen döndürülür (eski döngüyle aynı öncelik).
+    
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._best: List[int] = [-1]  # durumda biten en öncelikli kelimenin indeksi
+        
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(-1)
+                state = next_state
+            if self._best[state] == -1 or index < self._best[state]:
+                self._best[state] = index
+        
+        # Başarısızlık bağlantıları (BFS) ve çıktıların fail zinciri boyunca birleştirilmesi
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                inherited = self._best[self._fail[next_state]]
+                if inherited != -1 and (self._best[next_state] == -1 or inherited < self._best[next_state]):
+                    self._best[next_state] = inherited
+    
+    def first_match(self, *texts: str) -> Optional[str]:
+        """Metinlerde geçen, listede en önce yer alan anahtar kelimeyi döndürür"""
+        best = -1
+        for text in texts:
+            state = 0
+            for char in text:
+                while state and char not in self._goto[state]:
+                    state = self._fail[state]
+                state = self._goto[state].get(char, 0)
+                found = self._best[state]
+                if found != -1 and (best == -1 or found < best):
+                    best = found
+                    if best == 0:
+                        return self.keywords[0]
+        return self.keywords[best] if best != -1 else None
+
+@lru_cache(maxsize=32)
+def _build_keyword_automaton(keywords: Tuple[str, ...]) -> _KeywordAutomaton:
+    return _KeywordAutomaton(keywords)
+
+@lru_cache(maxsize=32)
+def _build_alternation_regex(patterns: Tuple[str, ...]) -> 're.Pattern':
+    # Her desen kendi grubunda; eşleşen desen match.lastindex ile bulunur
+    return re.compile('|'.join(f'({pattern})' for pattern in patterns))
+
+# KVKK içerik tarama modları
+# - sample: her kolonun ilk N dolu değeri (varsayılan N=20)
+# - full:   tüm dolu değerler, chunk'lı ve erken sonlandırmalı
+SCAN_MODES = ("sample", "full")
+
+class _ContentScanState:
+    """Chunk'lı içerik taramasında tek kolonun çalışan skor durumu"""
+    # Karar iki şekilde netleşir:
+    # 1) Kesin sınır: toplam değer sayısı biliniyorsa, kalan değerlerin hepsi 0 ya da
+    #    hepsi en yüksek skoru alsa bile sonuç değişmiyorsa
+    # 2) İstatistiksel sınır: rastgele sıralı örneklemde Hoeffding güven aralığı
+    #    eşiğin tamamen üstünde veya altında kaldığında
+    MAX_VALUE_SCORE = 5
+    
+    def __init__(self, threshold: float, total: Optional[int] = None,
+                 min_samples: int = 200, delta: float = 0.001):
+        self.threshold = threshold
+        self.total = total
+        self.min_samples = min_samples
+        self.delta = delta
+        self.score = 0
+        self.seen = 0
+        self.decision = None
+    
+    @property
+    def ratio(self) -> float:
+        return self.score / self.seen if self.seen else 0.0
+    
+    def update(self, value_scores: np.ndarray) -> Optional[bool]:
+        """Yeni chunk skorlarını ekler; karar netleştiyse True/False, değilse None döndürür"""
+        if self.decision is not None:
+            return self.decision
+        self.score += int(value_scores.sum())
+        self.seen += len(value_scores)
+        
+        if self.total:
+            target = self.threshold * self.total
+            if self.score >= target:
+                self.decision = True
+            elif self.score + self.MAX_VALUE_SCORE * (self.total - self.seen) < target:
+                self.decision = False
+            elif self.seen >= self.total:
+                self.decision = self.ratio >= self.threshold
+        
+        if self.decision is None and self.seen >= self.min_samples:
+            margin = self.MAX_VALUE_SCORE * np.sqrt(np.log(2 / self.delta) / (2 * self.seen))
+            if self.ratio - margin >= self.threshold:
+                self.decision = True
+            elif self.ratio + margin < self.threshold:
+                self.decision = False
+        
+        return self.decision
+    
+    def finish(self) -> bool:
+        """Akış bittiğinde nihai kararı verir"""
+        if self.decision is None:
+            self.decision = self.seen > 0 and self.ratio >= self.threshold
+        return self.decision
+    
+    def as_dict(self) -> Dict:
+        decision = self.finish()
+        return {
+            'skor': self.score,
+            'ornek_sayisi': self.seen,
+            'oran': self.ratio,
+            'esik': self.threshold,
+            'kisisel': decision,
+            'erken_durdu': self.total is not None and self.seen < self.total
+        }
+
 class KVKKDataCleaner:
     """KVKK uyumlu veri temizleme sınıfı"""
     # Sorumluluklar:
@@ -26,7 +242,10 @@ class KVKKDataCleaner:
     # - Kolon içeriğinden kişisel veriyi saptama (regex + skor bazlı eşik)
     # - Güvenli (işe özgü) kolonları koruma
     
-    def __init__(self):
+    # (kural imzası, kolon adı) → kolon adı sınıflandırma sonucu; tüm örnekler arasında paylaşılır
+    _name_decision_cache: Dict[Tuple[str, str], Tuple[bool, str, Optional[str]]] = {}
+    
+    def __init__(self, decision_cache: Optional['ColumnDecisionCache'] = None):
         # Kişisel veri olabilecek kolon isimleri (Türkçe + İngilizce)
         # Not: İsim/iletişim/kimlik gibi alanlar burada geniş kapsanır
         self.personal_data_keywords = [
@@ -89,23 +308,9 @@ class KVKKDataCleaner:
             'remarks', 'bilgi', 'info', 'information', 'description', 'desc',
             'detay', 'detail', 'details', 'özet', 'summary', 'text', 'metin'
         ]
-    
-    def is_personal_data_column(self, column_name: str) -> bool:
-        """Kolonun kişisel veri içerip içermediğini kontrol eder"""
-        # Öncelik: güvenli kelime (erken dönüş) → belirgin kişisel desenler → dar kelime eşleşmesi
-        column_lower = column_name.lower().strip()
-        
-        # Boşlukları ve özel karakterleri temizle
-        column_clean = re.sub(r'[^\w]', '', column_lower)
-        
-        # Önce güvenli kelimeler kontrol et (GÜVENLİ ÖNCE!)
-        for safe_word in self.safe_keywords:
-            if safe_word in column_lower or safe_word in column_clean:
-                print(f"         ℹ️ '{column_name}' güvenli kelime içeriyor: '{safe_word}'")
-                return False
         
         # Kesinlikle kişisel veri içeren kolon isimleri (ÇOK DAHA SPESİFİK)
-        definite_personal_patterns = [
+        self.definite_personal_patterns = [
             # Sadece kesin isim kolonları - daha sıkı kontrol
             r'^personel$', r'^personnel$', r'^başlatan$', r'^baslatan$', 
             r'^vardiyaci$', r'^vardiyacı$', r'^onaylayan$', r'^approver$',
@@ -119,181 +324,785 @@ class KVKKDataCleaner:
             r'.*çalışılan.*personel.*', r'.*working.*with.*'
         ]
         
-        for pattern in definite_personal_patterns:
-            if re.match(pattern, column_lower):
-                print(f"         🎯 '{column_name}' kesin kişisel veri pattern: '{pattern}'")
-                return True
-        
-        # Sadece çok spesifik kişisel veri kelimelerini kontrol et
-        strict_personal_keywords = [
+        # Sadece çok spesifik kişisel veri kelimeleri (kolon adıyla birebir eşleşme)
+        self.strict_personal_keywords = [
             'isim', 'ad', 'soyad', 'name', 'surname', 'firstname', 'lastname',
             'full_name', 'tam_ad', 'personel_adi', 'calisan_adi',
             'tc', 'tcno', 'tc_no', 'kimlik', 'identity', 'sicil_no',
             'telefon', 'phone', 'email', 'mail', 'eposta'
         ]
         
-        for personal_word in strict_personal_keywords:
-            if personal_word == column_lower or personal_word == column_clean:
-                print(f"         🎯 '{column_name}' kesin kişisel veri kelimesi: '{personal_word}'")
-                return True
-                
-        return False
+        # İçerik skoru eşikleri (skor / örnek oranı)
+        # Personel ile ilgili kolonlar için %50 eşik (daha sıkı), diğerleri için %80
+        self.content_threshold = 0.8
+        self.personnel_content_threshold = 0.5
+        
+        # Opsiyonel kalıcı kolon kararı önbelleği (bkz. ColumnDecisionCache)
+        self.decision_cache = decision_cache
+        
+        self.compile_rules()
+    
+    def __getstate__(self):
+        # Process havuzuna gönderilirken disk önbelleği taşınmaz (sadece ana süreç yazar)
+        state = self.__dict__.copy()
+        state['decision_cache'] = None
+        return state
+    
+    def compile_rules(self):
+        """Kolon adı kurallarını derler (anahtar kelime listeleri değişirse yeniden çağrılmalı)"""
+        # Güvenli kelimeler tek bir Aho-Corasick otomatına, kesin kişisel desenler tek bir
+        # alternation regex'ine, dar kişisel kelimeler sözlüğe derlenir. Derlenmiş yapılar
+        # aynı kural setini kullanan tüm örnekler arasında paylaşılır.
+        self._safe_matcher = _build_keyword_automaton(tuple(self.safe_keywords))
+        self._definite_personal_re = _build_alternation_regex(tuple(self.definite_personal_patterns))
+        self._strict_personal_index = {}
+        for index, keyword in enumerate(self.strict_personal_keywords):
+            self._strict_personal_index.setdefault(keyword, index)
+        # Kural imzası: anahtar kelimeler, desenler, içerik kuralları ve eşikler.
+        # Kolon kararı önbellekleri (bellek + disk) bu imza değişince geçersiz olur.
+        self.rules_signature = hashlib.sha1(repr((
+            self.personal_data_keywords, self.safe_keywords,
+            self.definite_personal_patterns, self.strict_personal_keywords,
+            self.content_threshold, self.personnel_content_threshold,
+            COMMON_TURKISH_NAMES, TECHNICAL_TERMS, PERSONNEL_RELATED_KEYWORDS,
+            _NUMERIC_CODE_RE.pattern, _TC_NO_RE.pattern, _PHONE_RE.pattern, _EMAIL_RE.pattern
+        )).encode('utf-8')).hexdigest()
     
-    def detect_personal_data_by_content(self, series: pd.Series, column_name: str = "") -> bool:
+    def classify_column_name(self, column_name: str) -> Tuple[bool, str, Optional[str]]:
+        """Kolon adını sınıflandırır: (kişisel_mi, kural_türü, eşleşen_kelime/desen)"""
+        # Öncelik: güvenli kelime → belirgin kişisel desenler → dar kelime eşleşmesi
+        # Sonuç kolon adı + kural imzası ile süreç genelinde önbelleklenir; birleştirilmiş
+        # dosyalarda tekrar eden kolon adları tekrar sınıflandırılmaz.
+        cache_key = (self.rules_signature, column_name)
+        cached = KVKKDataCleaner._name_decision_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        column_lower = str(column_name).lower().strip()
+        # Boşlukları ve özel karakterleri temizle
+        column_clean = re.sub(r'[^\w]', '', column_lower)
+        
+        safe_word = self._safe_matcher.first_match(column_lower, column_clean)
+        if safe_word is not None:
+            result = (False, 'guvenli_kelime', safe_word)
+        else:
+            match = self._definite_personal_re.match(column_lower)
+            if match is not None:
+                result = (True, 'kesin_desen', self.definite_personal_patterns[match.lastindex - 1])
+            else:
+                hits = [self._strict_personal_index[text] for text in (column_lower, column_clean)
+                        if text in self._strict_personal_index]
+                if hits:
+                    result = (True, 'kesin_kelime', self.strict_personal_keywords[min(hits)])
+                else:
+                    result = (False, 'eslesme_yok', None)
+        
+        if len(KVKKDataCleaner._name_decision_cache) >= 100000:
+            KVKKDataCleaner._name_decision_cache.clear()
+        KVKKDataCleaner._name_decision_cache[cache_key] = result
+        return result
+    
+    def is_personal_data_column(self, column_name: str) -> bool:
+        """Kolonun kişisel veri içerip içermediğini kontrol eder"""
+        is_personal, rule, matched = self.classify_column_name(column_name)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            if rule == 'guvenli_kelime':
+                logger.debug("         ℹ️ '%s' güvenli kelime içeriyor: '%s'", column_name, matched)
+            elif rule == 'kesin_desen':
+                logger.debug("         🎯 '%s' kesin kişisel veri pattern: '%s'", column_name, matched)
+            elif rule == 'kesin_kelime':
+                logger.debug("         🎯 '%s' kesin kişisel veri kelimesi: '%s'", column_name, matched)
+        
+        return is_personal
+    
+    def _content_threshold(self, column_name: str) -> float:
+        """Kolon için içerik skoru eşiğini döndürür"""
+        # Personel ile ilgili kolonlar için daha sıkı eşik (bkz. __init__)
+        column_lower = str(column_name).lower()
+        if any(keyword in column_lower for keyword in PERSONNEL_RELATED_KEYWORDS):
+            return self.personnel_content_threshold
+        return self.content_threshold
+    
+    def score_personal_data_values(self, values: pd.Series) -> np.ndarray:
+        """Değer bazında kişisel veri skorlarını vektörel olarak hesaplar"""
+        # Kurallar ve öncelik sırası eski değer-değer döngüsüyle aynıdır:
+        # kısa değer / sayısal kod → 0, TC/telefon/email → 5, isim formatı → 3,
+        # (teknik terim içermeyen) yaygın Türkçe isim → 4, diğer → 0
+        s = values.astype(str).str.strip().reset_index(drop=True)
+        if len(s) == 0:
+            return np.zeros(0, dtype=np.int64)
+        
+        lengths = s.str.len()
+        is_short = lengths <= 2
+        is_numeric_code = s.str.match(_NUMERIC_CODE_RE)
+        is_tc_no = s.str.match(_TC_NO_RE)
+        is_phone = s.str.match(_PHONE_RE)
+        is_email = s.str.match(_EMAIL_RE)
+        
+        # İsim formatı: 2-3 kelime, her kelime 3-15 harf ve "Büyük + küçük" yazım
+        # (Türkçe harfler str.isalpha() için zaten harf sayılır, çevirme gerekmez)
+        word_counts = s.str.count(r'\S+')
+        is_name_format = pd.Series(False, index=s.index)
+        candidates = s[(word_counts >= 2) & (word_counts <= 3)]
+        if len(candidates) > 0:
+            words = candidates.str.split().explode()
+            word_ok = (
+                words.str.len().between(3, 15)
+                & words.str.isalpha()
+                & words.str[0].str.isupper()
+                & words.str[1:].str.islower()
+            )
+            name_rows = word_ok.groupby(level=0).all()
+            is_name_format.loc[name_rows.index] = name_rows.astype(bool)
+        
+        # Yaygın isim (izole kelime) - teknik terim içeren değerlerde yok sayılır
+        s_lower = s.str.lower()
+        is_technical = s_lower.str.contains(_TECHNICAL_TERM_RE)
+        has_common_name = s_lower.str.contains(_COMMON_NAME_RE) & ~is_technical
+        
+        conditions = [is_short, is_numeric_code, is_tc_no, is_phone, is_email, is_name_format, has_common_name]
+        value_scores = np.select(conditions, [0, 0, 5, 5, 5, 3, 4], default=0).astype(np.int64)
+        
+        # Değer bazlı tanı izi sadece DEBUG seviyesinde (maskeli) üretilir
+        if logger.isEnabledFor(logging.DEBUG):
+            rule_index = np.select(conditions, list(range(len(conditions))), default=-1)
+            for position in np.flatnonzero(value_scores):
+                logger.debug("           %s: '%s***'", _VALUE_RULE_LABELS[rule_index[position]],
+                             s.iat[position][:3])
+        
+        return value_scores
+    
+    def score_columns(self, df: pd.DataFrame, sample_size: Optional[int] = 20,
+                      scan_mode: str = "sample", chunk_size: int = 2000) -> Dict[str, Dict]:
+        """Tüm metin kolonlarının içerik skorlarını tek geçişte hesaplar"""
+        # "sample": her kolonun örneklemi tek bir uzun seride birleştirilir, bir kez skorlanır
+        #           ve kolon bazında toplanır. sample_size=None tüm satırları skorlar.
+        # "full":   her kolonun tüm dolu değerleri chunk'lar halinde taranır; karar netleşince durur.
+        if scan_mode not in SCAN_MODES:
+            raise ValueError(f"Geçersiz tarama modu: {scan_mode} (seçenekler: {', '.join(SCAN_MODES)})")
+        
+        samples = {}
+        for column in df.columns:
+            series = df[column]
+            if series.dtype != 'object':
+                continue
+            non_null = series.dropna()
+            if scan_mode == "sample" and sample_size is not None:
+                non_null = non_null.head(sample_size)
+            if len(non_null) > 0:
+                samples[column] = non_null
+        
+        scores = {}
+        if not samples:
+            return scores
+        
+        if scan_mode == "full":
+            for column, non_null in samples.items():
+                scores[column] = self._scan_column_content(non_null, column, chunk_size)
+            return scores
+        
+        stacked = pd.concat(list(samples.values()), ignore_index=True)
+        value_scores = self.score_personal_data_values(stacked)
+        offset = 0
+        for column, sample in samples.items():
+            total = len(sample)
+            score = int(value_scores[offset:offset + total].sum())
+            offset += total
+            threshold = self._content_threshold(column)
+            scores[column] = {
+                'skor': score,
+                'ornek_sayisi': total,
+                'oran': score / total,
+                'esik': threshold,
+                'kisisel': score / total >= threshold
+            }
+        return scores
+    
+    def _scan_column_content(self, values: pd.Series, column_name: str, chunk_size: int) -> Dict:
+        """Bir kolonun tüm dolu değerlerini chunk'lar halinde tarar (erken sonlandırmalı)"""
+        # Değerler sabit tohumlu rastgele sırayla taranır; böylece dosyanın sonunda yoğunlaşan
+        # isimler de ilk chunk'larda temsil edilir ve ara oran tüm kolonun tahmini olur.
+        total = len(values)
+        state = _ContentScanState(self._content_threshold(column_name), total=total)
+        order = np.random.default_rng(0).permutation(total)
+        
+        for start in range(0, total, max(1, chunk_size)):
+            chunk = values.iloc[order[start:start + chunk_size]]
+            if state.update(self.score_personal_data_values(chunk)) is not None:
+                break
+        
+        return state.as_dict()
+    
+    def detect_personal_data_by_content(self, series: pd.Series, column_name: str = "",
+                                        sample_size: Optional[int] = 20) -> bool:
         """İçeriğe bakarak kişisel veri tespiti yapar - DAHA HASSAS"""
         # Yaklaşım:
-        # 1) Küçük örneklem al
+        # 1) Örneklem al (sample_size=None → tüm dolu değerler)
         # 2) Telefon/TC/email regex'leriyle yüksek ağırlıklı skorla
         # 3) İsim formatı ve yaygın isim sözlüğüyle ek puanla
         # 4) Teknik terim içeriyorsa isim sayımını yok say
         # 5) Skor/örnek oranı eşik (personel ilişkili kolonlar için daha sıkı)
-        if series.dtype == 'object':
-            sample_values = series.dropna().head(20).astype(str)
-            if len(sample_values) == 0:
-                return False
-                
-            personal_data_count = 0
-            total_samples = len(sample_values)
-            
-            print(f"         🔍 '{column_name}' içerik analizi: {total_samples} örnek")
-            
-            for i, value in enumerate(sample_values):
-                value_clean = value.strip()
-                
-                # Çok kısa değerler (1-2 karakter) muhtemelen kişisel değil
-                if len(value_clean) <= 2:
-                    continue
-                
-                # Sayısal kodlar (ID, saat, tarih vs) kişisel değil
-                if re.match(r'^[\d\-\:\#\_]+$', value_clean):
-                    continue
-                
-                # TC kimlik no pattern (11 haneli sayı) - KESİN KİŞİSEL
-                if re.match(r'^\d{11}$', value_clean):
-                    personal_data_count += 5  # Çok yüksek ağırlık
-                    print(f"           📱 TC no tespit: '{value_clean[:3]}***'")
-                    continue
-                
-                # Telefon no pattern - KESİN KİŞİSEL
-                if re.match(r'^(\+90|0)?\s*\d{3}\s*\d{3}\s*\d{2}\s*\d{2}$', value_clean):
-                    personal_data_count += 5  # Çok yüksek ağırlık
-                    print(f"           📞 Telefon tespit: '{value_clean[:5]}***'")
-                    continue
-                
-                # Email pattern - KESİN KİŞİSEL
-                if re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', value_clean):
-                    personal_data_count += 5  # Çok yüksek ağırlık
-                    print(f"           📧 Email tespit: '{value_clean.split('@')[0]}@***'")
-                    continue
-                
-                # İsim pattern - DAHA SIKI KONTROL
-                words = value_clean.split()
-                if len(words) >= 2 and len(words) <= 3:  # Sadece 2-3 kelime
-                    # Tüm kelimeler harf mi ve makul uzunlukta mı?
-                    if all(3 <= len(word) <= 15 and word.replace('ç','c').replace('ğ','g').replace('ı','i').replace('ö','o').replace('ş','s').replace('ü','u').replace('Ç','C').replace('Ğ','G').replace('İ','I').replace('Ö','O').replace('Ş','S').replace('Ü','U').isalpha() for word in words):
-                        # Tüm kelimeler büyük harfle başlıyor mu? (İsim formatı)
-                        if all(word[0].isupper() and word[1:].islower() for word in words):
-                            personal_data_count += 3
-                            print(f"           👤 İsim format tespit: '{words[0]} {words[1][0]}***'")
-                            continue
-                
-                # Yaygın Türkçe isimler kontrol et - ÇOK DAHA SIKI
-                common_turkish_names = [
-                    'mehmet', 'ahmet', 'mustafa', 'ali', 'hasan', 'hüseyin', 'ibrahim', 'ismail',
-                    'murat', 'osman', 'süleyman', 'yusuf', 'fatma', 'ayşe', 'emine', 'hatice',
-                    'zeynep', 'şerife', 'sultan', 'özlem', 'elif', 'sema', 'nuriye', 'gülsün',
-                    'serkan', 'onur', 'burak', 'emre', 'kemal', 'deniz', 'yasemin', 'selin', 
-                    'pınar', 'sibel', 'dilek', 'gül', 'mine', 'özge'
-                ]
-                
-                # Teknik terimler (isim değil)
-                technical_terms = [
-                    'çim', 'cem', 'çd', 'cd', 'df', 'mb', 'gb', 'kg', 'lt', 'mt', 'cm',
-                    'mm', 'bar', 'psi', 'rpm', 'kwh', 'mw', 'kw', 'amp', 'volt', 'hz',
-                    'flux', 'silo', 'bunker', 'mill', 'coal', 'cso', 'lab', 'test',
-                    'deg', 'temp', 'press', 'flow', 'level', 'speed', 'load', 'run',
-                    'stop', 'start', 'auto', 'manual', 'alarm', 'trip', 'fault'
-                ]
-                
-                value_lower = value_clean.lower()
-                name_found = False
-                
-                # Önce teknik terim kontrolü
-                is_technical = False
-                for tech_term in technical_terms:
-                    if tech_term in value_lower:
-                        is_technical = True
-                        print(f"           🔧 Teknik terim tespit: '{tech_term}' in '{value_clean[:15]}***'")
-                        break
-                
-                if not is_technical:
-                    # Sadece izole kelime eşleşmesi (teknik terim değilse)
-                    words_in_value = value_lower.split()
-                    for name in common_turkish_names:
-                        if name in words_in_value:  # Tam kelime eşleşmesi
-                            personal_data_count += 4
-                            print(f"           👤 Türkçe isim tespit: '{name}' as word in '{value_clean[:15]}***'")
-                            name_found = True
-                            break
-                
-                if name_found:
-                    continue
-            
-            # Skorlama: %80 veya daha fazlası kişisel veri benziyorsa (DAHA SIKI)
-            score_ratio = personal_data_count / total_samples if total_samples > 0 else 0
-            print(f"         📊 İçerik skoru: {personal_data_count}/{total_samples} = {score_ratio:.2f}")
-            
-            # Özel durumlar: Vardiyacı gibi kolonlar için daha sıkı kontrol
-            is_personnel_related = any(keyword in column_name.lower() for keyword in 
-                                     ['vardiyacı', 'vardiyaci', 'personel', 'calisan', 'çalışan'])
-            
-            if is_personnel_related:
-                # Personel ile ilgili kolonlar için %50 eşik (daha sıkı)
-                threshold = 0.5
-                print(f"         ⚠️ Personel ilişkili kolon - sıkı eşik: %{threshold*100}")
-            else:
-                # Normal kolonlar için %80 eşik
-                threshold = 0.8
-            
-            if score_ratio >= threshold:
-                print(f"         ❌ Kişisel veri tespit edildi (skor: {score_ratio:.2f}, eşik: {threshold:.2f})")
-                return True
-            else:
-                print(f"         ✅ Güvenli içerik (skor: {score_ratio:.2f}, eşik: {threshold:.2f})")
-                return False
+        if series.dtype != 'object':
+            return False
+        
+        sample_values = series.dropna()
+        if sample_size is not None:
+            sample_values = sample_values.head(sample_size)
+        total_samples = len(sample_values)
+        if total_samples == 0:
+            return False
+        
+        personal_data_count = int(self.score_personal_data_values(sample_values).sum())
+        score_ratio = personal_data_count / total_samples
+        threshold = self._content_threshold(column_name)
         
-        return False
+        logger.debug("         📊 '%s' içerik skoru: %d/%d = %.2f (eşik: %.2f)",
+                     column_name, personal_data_count, total_samples, score_ratio, threshold)
+        
+        return score_ratio >= threshold
     
-    def clean_dataframe(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
-        """DataFrame'i KVKK uyumlu hale getirir"""
-        # İki aşamalı kontrol uygular: önce kolon adı, sonra içerik.
-        # Eşik üstü kişisel veri şüphesinde ilgili kolon tamamen kaldırılır.
+    def classify_columns(self, df: pd.DataFrame, sample_size: Optional[int] = 20,
+                         scan_mode: str = "sample", chunk_size: int = 2000
+                         ) -> Tuple[Dict[str, Tuple[bool, str, Optional[str]]], Dict[str, Dict]]:
+        """Kolon adı ve içerik kontrollerini çalıştırır: (ad_kuralları, içerik_skorları)"""
+        # İçerik skorları sadece adı kişisel görünmeyen kolonlar için hesaplanır
+        name_rules = {column: self.classify_column_name(column) for column in df.columns}
+        content_scores = self.score_columns(
+            df[[column for column in df.columns if not name_rules[column][0]]],
+            sample_size=sample_size,
+            scan_mode=scan_mode,
+            chunk_size=chunk_size
+        )
+        return name_rules, content_scores
+    
+    def _classify_columns_parallel(self, df: pd.DataFrame, workers: int, executor: str,
+                                   **scan_options) -> Tuple[Dict, Dict]:
+        """Kolon sınıflandırmasını kolon grupları halinde havuza dağıtır"""
+        # Kolonlar sıralı, ardışık gruplara bölünür; sonuçlar orijinal kolon sırasıyla birleştirilir,
+        # bu nedenle çıktı çalışan sayısından bağımsız ve deterministiktir.
+        positions = list(range(len(df.columns)))
+        batch_count = min(len(positions), workers * 2)
+        batch_size = -(-len(positions) // batch_count)
+        batches = [positions[i:i + batch_size] for i in range(0, len(positions), batch_size)]
+        
+        pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        with pool_class(max_workers=workers) as pool:
+            futures = [pool.submit(_classify_column_batch, self, df.iloc[:, batch], scan_options)
+                       for batch in batches]
+            results = [future.result() for future in futures]
+        
+        name_rules, content_scores = {}, {}
+        for batch_names, batch_scores in results:
+            name_rules.update(batch_names)
+            content_scores.update(batch_scores)
+        # Alt süreçlerde hesaplanan ad kararlarını bu sürecin önbelleğine de al
+        for column, rule in name_rules.items():
+            KVKKDataCleaner._name_decision_cache.setdefault((self.rules_signature, column), rule)
+        return name_rules, content_scores
+    
+    def _resolve_decisions(self, columns, name_rules: Dict, content_scores: Dict
+                           ) -> Tuple[List[str], Dict[str, Dict], List[int]]:
+        """Ad kuralları ve içerik skorlarından kolon kararlarını üretir ve loglar"""
+        # Dönüş: (kaldırılan_kolonlar, removal_reasons, korunan_kolon_pozisyonları)
         removed_columns = []
         removal_reasons = {}
-        df_clean = df.copy()
-        
-        print("   🔍 KVKK Analizi:")
+        kept_positions = []
         
-        for column in df.columns:
+        for position, column in enumerate(columns):
+            is_personal_name, rule, matched = name_rules[column]
+            score = content_scores.get(column)
+            decision = {
+                'kaldirildi': False,
+                'asama': None,
+                'neden': "Güvenli",
+                'kural': rule,
+                'eslesme': matched
+            }
+            if score is not None:
+                decision.update({
+                    'icerik_skoru': round(score['oran'], 4),
+                    'esik': score['esik'],
+                    'ornek_sayisi': score['ornek_sayisi']
+                })
+            removal_reasons[column] = decision
+            
             # Kolon adına göre kontrol
-            if self.is_personal_data_column(column):
+            if is_personal_name:
                 removed_columns.append(column)
-                removal_reasons[column] = "Kolon adı (kişisel veri)"
-                df_clean = df_clean.drop(column, axis=1)
-                print(f"      ❌ '{column}' -> Kolon adı nedeniyle kaldırıldı")
+                decision.update(kaldirildi=True, asama='kolon_adi', neden="Kolon adı (kişisel veri)")
+                logger.info("      ❌ '%s' -> Kolon adı nedeniyle kaldırıldı ('%s')", column, matched)
                 continue
             
             # İçeriğe göre kontrol
-            if self.detect_personal_data_by_content(df[column], column):
+            if score is not None and score['kisisel']:
                 removed_columns.append(column)
-                removal_reasons[column] = "İçerik analizi (kişisel veri)"
-                df_clean = df_clean.drop(column, axis=1)
-                print(f"      ❌ '{column}' -> İçerik analizi nedeniyle kaldırıldı")
+                decision.update(kaldirildi=True, asama='icerik', neden="İçerik analizi (kişisel veri)")
+                logger.info("      ❌ '%s' -> İçerik analizi nedeniyle kaldırıldı (skor: %.2f, eşik: %.2f, %d değer)",
+                            column, score['oran'], score['esik'], score['ornek_sayisi'])
                 continue
             
-            print(f"      ✅ '{column}' -> Güvenli, korunuyor")
+            kept_positions.append(position)
+            logger.info("      ✅ '%s' -> Güvenli, korunuyor", column)
         
-        return df_clean, removed_columns
+        return removed_columns, removal_reasons, kept_positions
+    
+    def clean_dataframe(self, df: pd.DataFrame, sample_size: Optional[int] = 20,
+                        scan_mode: str = "sample", chunk_size: int = 2000,
+                        inplace: bool = False, workers: int = 1,
+                        executor: str = "process") -> Tuple[pd.DataFrame, List[str], Dict[str, Dict]]:
+        """DataFrame'i KVKK uyumlu hale getirir"""
+        # İki aşamalı kontrol uygular: önce kolon adı, sonra içerik.
+        # İçerik skorları, adı güvenli görünen tüm kolonlar için tek geçişte hesaplanır.
+        # scan_mode="full" tüm satırları chunk'lar halinde tarar (bkz. SCAN_MODES).
+        # Eşik üstü kişisel veri şüphesinde ilgili kolon tamamen kaldırılır.
+        # Önce tüm kolonların kararı verilir, temiz DataFrame sonra tek bir kolon seçimiyle kurulur.
+        # inplace=True: kolonlar verilen DataFrame'den çıkarılır (orijinali atan çağıranlar için).
+        # workers>1: kolon kontrolleri "process" veya "thread" havuzunda paralel çalışır.
+        # Dönüş: (temiz_df, kaldırılan_kolonlar, removal_reasons)
+        # removal_reasons: her kolon için karar izi (kaldırılan ve korunan kolonların tümü)
+        logger.info("   🔍 KVKK Analizi:")
+        
+        scan_options = {'sample_size': sample_size, 'scan_mode': scan_mode, 'chunk_size': chunk_size}
+        
+        # Kalıcı önbellekte (kolon adı + örnek değer özeti) kararı olan kolonlar yeniden sınıflandırılmaz
+        name_rules, content_scores, cache_keys = {}, {}, {}
+        pending_positions = list(range(len(df.columns)))
+        if self.decision_cache is not None:
+            pending_positions = []
+            for position, column in enumerate(df.columns):
+                key = self.decision_cache.make_key(column, df.iloc[:, position], scan_mode, sample_size)
+                cached = self.decision_cache.get(key, self.rules_signature)
+                if cached is None:
+                    cache_keys[column] = key
+                    pending_positions.append(position)
+                    continue
+                name_rules[column], score = cached
+                if score is not None:
+                    content_scores[column] = score
+            if len(df.columns):
+                logger.info("   💾 KVKK önbelleği: %d/%d kolon kararı hazır",
+                            len(df.columns) - len(pending_positions), len(df.columns))
+        
+        if pending_positions:
+            pending = df.iloc[:, pending_positions] if len(pending_positions) < len(df.columns) else df
+            if workers > 1 and len(pending_positions) > 1:
+                new_rules, new_scores = self._classify_columns_parallel(pending, workers, executor, **scan_options)
+            else:
+                new_rules, new_scores = self.classify_columns(pending, **scan_options)
+            name_rules.update(new_rules)
+            content_scores.update(new_scores)
+            if self.decision_cache is not None:
+                for column, key in cache_keys.items():
+                    self.decision_cache.put(key, self.rules_signature, name_rules[column], content_scores.get(column))
+                self.decision_cache.save()
+        
+        removed_columns, removal_reasons, kept_positions = self._resolve_decisions(
+            df.columns, name_rules, content_scores
+        )
+        
+        if inplace:
+            if removed_columns:
+                df.drop(columns=removed_columns, inplace=True)
+            df_clean = df
+        else:
+            df_clean = df.iloc[:, kept_positions]
+        
+        return df_clean, removed_columns, removal_reasons
+
+class ColumnDecisionCache:
+    """KVKK kolon kararlarının kalıcı (disk) önbelleği"""
+    # Anahtar: kolon adı + tarama ayarları + taranan örnek değerlerin ucuz özeti (hash).
+    # Her kayıt, üretildiği kural imzasıyla saklanır; KVKKDataCleaner.__init__ içindeki
+    # anahtar kelime listeleri veya eşikler değişirse eski kayıtlar kullanılmaz.
+    # Aynı şablon (aynı kolonlar, aynı ilk değerler) tekrar açıldığında sınıflandırma atlanır.
+    
+    VERSION = 1
+    
+    def __init__(self, cache_path: Optional[str] = None, max_entries: int = 20000):
+        self.cache_path = cache_path or get_artifacts_dir("cache", "kvkk_column_decisions.json")
+        self.max_entries = max_entries
+        self._entries = None
+        self._dirty = False
+    
+    @staticmethod
+    def make_key(column_name, series: pd.Series, scan_mode: str, sample_size: Optional[int]) -> str:
+        """Kolon adı ve taranacak değerlerden önbellek anahtarı üretir"""
+        # Metin olmayan kolonlarda içerik taranmadığından sadece tip yeterlidir
+        if series.dtype == 'object':
+            values = series.dropna()
+            if scan_mode == "sample" and sample_size is not None:
+                values = values.head(sample_size)
+            value_hash = hashlib.sha1(
+                pd.util.hash_pandas_object(values.astype(str), index=False).values.tobytes()
+            ).hexdigest()
+            content = f"{len(values)}:{value_hash}"
+        else:
+            content = str(series.dtype)
+        raw = f"{column_name}|{scan_mode}|{sample_size}|{content}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    
+    def _load(self) -> Dict:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('versiyon') == self.VERSION:
+                    self._entries = data.get('kayitlar', {})
+            except (OSError, ValueError):
+                pass
+        return self._entries
+    
+    def get(self, key: str, rules_signature: str) -> Optional[Tuple[Tuple[bool, str, Optional[str]], Optional[Dict]]]:
+        """Geçerli bir kayıt varsa (ad_kuralı, içerik_skoru) döndürür"""
+        entries = self._load()
+        entry = entries.get(key)
+        if entry is None or entry.get('kurallar') != rules_signature:
+            return None
+        # LRU: kullanılan kaydı sona taşı. Sıra sadece bellekte güncellenir; dosya yalnızca yeni
+        # kayıt eklenince yazılır (sadece isabet alan temizliklerde diske yazma olmaz)
+        entries[key] = entries.pop(key)
+        return tuple(entry['ad']), entry.get('icerik')
+    
+    def put(self, key: str, rules_signature: str, name_rule: Tuple[bool, str, Optional[str]],
+            content_score: Optional[Dict]):
+        entries = self._load()
+        entries.pop(key, None)
+        entries[key] = {'kurallar': rules_signature, 'ad': list(name_rule), 'icerik': content_score}
+        while len(entries) > self.max_entries:
+            entries.pop(next(iter(entries)))
+        self._dirty = True
+    
+    def save(self):
+        """Değişiklik varsa önbelleği atomik olarak diske yazar"""
+        if not self._dirty or self._entries is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'versiyon': self.VERSION, 'kayitlar': self._entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning("⚠️ KVKK önbelleği kaydedilemedi: %s", e)
+
+class StreamingKVKKCleaner:
+    """Chunk akışı üzerinde KVKK temizliği (tüm sayfa belleğe alınmadan)"""
+    # Kullanım: her chunk feed() ile verilir, en sonda finish() temiz DataFrame'i döndürür.
+    # - Kolon adı kararları başlık okunduğunda verilir; bu kolonlar hiçbir chunk'ta tutulmaz.
+    # - "sample": kolonun ilk sample_size dolu değeri toplanınca içerik kararı verilir;
+    #   kişisel çıkan kolon o ana kadar tutulan chunk'lardan da silinir.
+    # - "full": tüm dolu değerler chunk chunk skorlanır (sadece çalışan toplam tutulur).
+    #   Akış sıralı olduğundan (rastgele değil) istatistiksel erken durdurma kullanılmaz.
+    # - Tutulan chunk'lar kolon kolon (ayrı Series) saklanır; finish() birleşik veriyi kolon kolon
+    #   kurup her kolonun parçalarını hemen bırakır. Tepe bellek ≈ temiz veri + bir kolon
+    #   (tüm chunk'lar + birleşik kopya, yani temiz verinin iki katı yerine).
+    # Sonuçlar clean_dataframe ile aynı kurallar ve aynı karar izi formatındadır.
+    # Kalıcı karar önbelleği (cleaner.decision_cache) "sample" modunda kullanılır: kolonun örneklemi
+    # tamamlanınca anahtar (ad + örnek değerler) üretilir; kayıt varsa skorlama atlanır, yoksa skor
+    # hesaplanıp saklanır. Ad kararları zaten süreç içinde paylaşılır (_name_decision_cache); "full"
+    # modunda anahtar ancak tüm değerler okununca belli olduğundan önbellek kullanılmaz.
+    # Sonraki bir chunk'ta yeni kolon belirirse (sayfa boyutu olmayan kitapta genişlik büyür) kolon
+    # o anda kayda alınır; önceki chunk'larda o kolonda değer yoktur.
+    
+    def __init__(self, cleaner: KVKKDataCleaner, columns: Sequence, sample_size: Optional[int] = 20,
+                 scan_mode: str = "sample"):
+        if scan_mode not in SCAN_MODES:
+            raise ValueError(f"Geçersiz tarama modu: {scan_mode} (seçenekler: {', '.join(SCAN_MODES)})")
+        self.cleaner = cleaner
+        self.columns = []
+        self.limit = sample_size if scan_mode == "sample" else None
+        self.name_rules = {}
+        self.dropped = set()
+        self.states = {}
+        self.pending = set()
+        # Önbellek açıksa örneklem değerleri kolon tamamlanana kadar biriktirilir (en fazla sample_size)
+        self.decision_cache = cleaner.decision_cache if self.limit is not None else None
+        self.samples = {}
+        self.chunks = []
+        self.coerced_columns = []
+        self.row_count = 0
+        self._add_columns(columns)
+    
+    def _add_columns(self, columns: Sequence):
+        """Kolonların ad kararını verir; adı kişisel olmayanları içerik taramasına alır"""
+        for column in columns:
+            self.columns.append(column)
+            self.name_rules[column] = rule = self.cleaner.classify_column_name(column)
+            if rule[0]:
+                self.dropped.add(column)
+                continue
+            self.states[column] = _ContentScanState(self.cleaner._content_threshold(column),
+                                                    min_samples=sys.maxsize)
+            self.pending.add(column)
+            if self.decision_cache is not None:
+                self.samples[column] = []
+    
+    def feed(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Chunk'ı işler; o ana kadar kaldırılmamış kolonlarla chunk'ı döndürür"""
+        self.row_count += len(chunk)
+        if len(chunk.columns) > len(self.columns):
+            self._add_columns([column for column in chunk.columns if column not in self.name_rules])
+        for column in self.pending.copy():
+            state = self.states[column]
+            values = chunk[column].dropna()
+            if self.decision_cache is not None:
+                sample = self.samples[column]
+                sample.extend(values.head(self.limit - len(sample)).tolist())
+                if len(sample) >= self.limit:
+                    self._complete_sample(column)
+                continue
+            if self.limit is not None:
+                values = values.head(self.limit - state.seen)
+            if len(values) > 0:
+                state.update(self.cleaner.score_personal_data_values(values))
+            if self.limit is not None and state.seen >= self.limit:
+                self.pending.discard(column)
+                if state.finish():
+                    self._drop(column)
+        
+        # Tek boyutlu kopyalar: ham chunk'ın (çok kolonlu) bloğu finish()'e kadar tutulmaz
+        kept = {column: chunk[column].copy() for column in chunk.columns if column not in self.dropped}
+        self.chunks.append((len(chunk), kept))
+        return pd.DataFrame(kept, copy=False)
+    
+    def _complete_sample(self, column):
+        """Örneklemi tamamlanan kolonun içerik kararını önbellekten alır veya skorlayıp saklar"""
+        self.pending.discard(column)
+        sample = pd.Series(self.samples.pop(column), dtype=object)
+        state = self.states[column]
+        if len(sample) == 0:
+            return
+        key = self.decision_cache.make_key(column, sample, "sample", self.limit)
+        cached = self.decision_cache.get(key, self.cleaner.rules_signature)
+        score = cached[1] if cached is not None else None
+        if score is not None:
+            state.score, state.seen, state.decision = score['skor'], score['ornek_sayisi'], score['kisisel']
+        else:
+            state.update(self.cleaner.score_personal_data_values(sample))
+            score = state.as_dict()
+            score.pop('erken_durdu')
+            self.decision_cache.put(key, self.cleaner.rules_signature, self.name_rules[column], score)
+        if state.finish():
+            self._drop(column)
+    
+    def _drop(self, column):
+        # Geç netleşen kişisel kolonu tutulan chunk'lardan da çıkar (bellek hemen serbest kalır)
+        self.dropped.add(column)
+        for _, kept in self.chunks:
+            kept.pop(column, None)
+    
+    def finish(self) -> Tuple[pd.DataFrame, List[str], Dict[str, Dict]]:
+        """Akışı kapatır: (temiz_df, kaldırılan_kolonlar, removal_reasons)"""
+        logger.info("   🔍 KVKK Analizi:")
+        if self.decision_cache is not None:
+            # sample_size'dan az dolu değeri olan kolonlar eldeki örneklemle karara bağlanır
+            for column in list(self.samples):
+                self._complete_sample(column)
+            self.decision_cache.save()
+        kept_columns = [column for column in self.columns if column not in self.dropped]
+        if self.chunks:
+            # Kolon sonraki bir chunk'ta belirdiyse önceki chunk'lar için boş (kolonsuz) parça verilir;
+            # pd.concat satırları tüm chunk'ların birleştirilmesindeki gibi boş doldurur (aynı tip)
+            data = {}
+            for column in kept_columns:
+                parts = [kept.pop(column).to_frame() if column in kept else pd.DataFrame(index=pd.RangeIndex(length))
+                         for length, kept in self.chunks]
+                data[column] = pd.concat(parts, ignore_index=True)[column]
+                del parts
+            self.chunks = []
+            df_clean = pd.DataFrame(data, columns=kept_columns, copy=False)
+        else:
+            df_clean = pd.DataFrame(columns=kept_columns)
+        # Tip çıkarımı tüm kolon üzerinden (pd.read_excel ile aynı sonuç)
+        self.coerced_columns = ExcelChunkReader.coerce_numeric_columns(df_clean)
+        
+        # clean_dataframe ile aynı: içerik skoru sadece metin (object) kolonları için geçerlidir
+        content_scores = {}
+        for column, state in self.states.items():
+            if state.seen == 0:
+                continue
+            is_text = column in self.dropped or df_clean[column].dtype == 'object'
+            if is_text:
+                score = state.as_dict()
+                if self.limit is not None:
+                    score.pop('erken_durdu')
+                content_scores[column] = score
+        
+        removed_columns, removal_reasons, _ = self.cleaner._resolve_decisions(
+            self.columns, self.name_rules, content_scores
+        )
+        late_removed = [column for column in removed_columns if column in df_clean.columns]
+        if late_removed:
+            df_clean.drop(columns=late_removed, inplace=True)
+        return df_clean, removed_columns, removal_reasons
+
+def _classify_column_batch(cleaner: KVKKDataCleaner, batch: pd.DataFrame, scan_options: Dict) -> Tuple[Dict, Dict]:
+    """Havuz çalışanı: bir kolon grubunu sınıflandırır (process havuzu için modül seviyesinde)"""
+    return cleaner.classify_columns(batch, **scan_options)
+
+# pandas.read_excel'in varsayılan olarak boş (NaN) saydığı metinler + Excel hata hücreleri
+_EXCEL_NA_VALUES = frozenset((
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+    '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#NULL!'
+))
+
+class ExcelChunkReader:
+    """Excel sayfasını satır chunk'ları halinde okuyan akış okuyucu"""
+    # openpyxl read_only + iter_rows ile hücreler satır satır okunur; bellekte en fazla
+    # chunk_rows satır tutulur. Çıktı pd.read_excel ile uyumludur:
+    # - İlk satır başlıktır; boş başlık "Unnamed: i", tekrar eden başlık "ad.1" olur
+    # - Sondaki tamamen boş satırlar atılır, tam sayı değerli float'lar int olur
+    # - Sadece sayıya çevrilebilen metin kolonları birleştirme sonrası sayısal yapılır
+    #   (bkz. coerce_numeric_columns; StreamingKVKKCleaner.finish bunu çağırır)
+    # .xls gibi openpyxl'in okuyamadığı formatlarda tek chunk olarak pd.read_excel kullanılır.
+    # edge_rows > 0 ise ilk ve son edge_rows veri satırı (dönüştürülmüş ham liste olarak)
+    # head_rows / tail_rows içinde tutulur (artımlı içe aktarmada kitap tanıma için).
+    # source: dosya yolu yerine okunacak bellek içi kitap (örn. BytesIO); uzantı file_path'ten alınır.
+    # Sayfa boyutu (dimension) yoksa genişlik okudukça büyür: daha geniş bir satır gelince sonuna
+    # "Unnamed: i" kolonları eklenir (önceki adlar değişmez). Bu durumda chunk'ların kolonları
+    # self.columns'un (okuma bitince kesinleşir) önekidir; pd.concat eksik kolonları boş doldurur.
+    
+    STREAMABLE_EXTENSIONS = ('.xlsx', '.xlsm')
+    
+    def __init__(self, file_path: str, chunk_rows: int = 50000, edge_rows: int = 0, source=None):
+        self.file_path = file_path
+        self.chunk_rows = max(1, int(chunk_rows))
+        self.source = source
+        self.columns = []
+        self.row_count = 0
+        # Veri içeren en geniş satırın genişliği (okuma bitince kesinleşir)
+        self.data_width = 0
+        self.edge_rows = max(0, int(edge_rows))
+        self.head_rows = []
+        self.tail_rows = deque(maxlen=self.edge_rows)
+    
+    @property
+    def streamable(self) -> bool:
+        return self.file_path.lower().endswith(self.STREAMABLE_EXTENSIONS)
+    
+    @staticmethod
+    def _make_columns(header: Sequence, width: int) -> List:
+        """Başlık satırından pandas ile aynı kolon adlarını üretir"""
+        # pandas kuralı: önce adı olan kolonlar, sonra "Unnamed" kolonlar tekilleştirilir;
+        # "ad.N" adayı başlıkta zaten varsa bir sonraki numara denenir
+        header = list(header) + [None] * (width - len(header))
+        unnamed = [index for index, value in enumerate(header) if value is None]
+        names = [f"Unnamed: {index}" if value is None else value for index, value in enumerate(header)]
+        counts = {}
+        for index in [i for i in range(width) if header[i] is not None] + unnamed:
+            original = name = names[index]
+            count = counts.get(name, 0)
+            while count > 0:
+                counts[original] = count + 1
+                name = f"{original}.{count}"
+                count = count + 1 if name in names else counts.get(name, 0)
+            names[index] = name
+            counts[name] = count + 1
+        return names
+    
+    @staticmethod
+    def _convert_cell(value):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return None if value in _EXCEL_NA_VALUES else value
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+    
+    def _build_chunk(self, rows: List[List]) -> pd.DataFrame:
+        # Genişlik bu chunk okunurken büyüdüyse önceki (kısa) satırlar tamamlanır
+        # (kopya ile: aynı satırlar head_rows/tail_rows içinde okundukları genişlikte kalır)
+        width = len(self.columns)
+        rows = [row if len(row) == width else row + [None] * (width - len(row)) for row in rows]
+        return pd.DataFrame(rows, columns=self.columns)
+    
+    @staticmethod
+    def coerce_numeric_columns(df: pd.DataFrame) -> List:
+        """Tamamen sayıya çevrilebilen metin kolonlarını sayısal yapar (pd.read_excel ile aynı)"""
+        # Chunk bazında yapılırsa aynı kolon chunk'tan chunk'a farklı tip alabilir;
+        # bu nedenle birleştirilmiş (temiz) veri üzerinde kolon bazında bir kez çalıştırılır.
+        coerced = []
+        if df.empty:
+            return coerced
+        for column in df.columns:
+            if df[column].dtype == 'object':
+                try:
+                    df[column] = pd.to_numeric(df[column])
+                    coerced.append(column)
+                except (ValueError, TypeError):
+                    pass
+        return coerced
+    
+    def __iter__(self):
+        if not self.streamable:
+            df = pd.read_excel(self.file_path)
+            self.columns = list(df.columns)
+            self.row_count = len(df)
+            self.data_width = len(df.columns)
+            yield df
+            return
+        
+        from openpyxl import load_workbook
+        workbook = load_workbook(self.source if self.source is not None else self.file_path,
+                                 read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            rows = sheet.iter_rows(values_only=True)
+            # Başlık metinleri NA listesine tabi değildir (sadece boş hücre "Unnamed" olur)
+            header = [value or None if isinstance(value, str) else self._convert_cell(value)
+                      for value in next(rows, ())]
+            while header and header[-1] is None:
+                header.pop()
+            
+            # Sayfa boyutu (dimension) yoksa genişlik başlıktan başlar ve satırlar okundukça büyür
+            width = max(sheet.max_column or 0, len(header))
+            self.columns = self._make_columns(header, width)
+            self.data_width = len(header)
+            
+            buffer, empty_rows = [], []
+            for raw_row in rows:
+                row = [self._convert_cell(value) for value in raw_row]
+                while row and row[-1] is None:
+                    row.pop()
+                if not row:
+                    empty_rows.append([None] * width)
+                    continue
+                # Boş satırlar sadece ardından dolu satır gelirse veriye dahildir
+                self.data_width = max(self.data_width, len(row))
+                if len(row) > width:
+                    width = len(row)
+                    self.columns = self._make_columns(header, width)
+                row.extend([None] * (width - len(row)))
+                if self.edge_rows:
+                    for kept in empty_rows + [row]:
+                        self._track_edge_row(kept)
+                buffer.extend(empty_rows)
+                empty_rows = []
+                buffer.append(row)
+                if len(buffer) >= self.chunk_rows:
+                    self.row_count += len(buffer)
+                    yield self._build_chunk(buffer)
+                    buffer = []
+            if buffer:
+                self.row_count += len(buffer)
+                yield self._build_chunk(buffer)
+        finally:
+            workbook.close()
+    
+    def _track_edge_row(self, row: List):
+        if len(self.head_rows) < self.edge_rows:
+            self.head_rows.append(row)
+        self.tail_rows.append(row)
+    
+    @property
+    def trailing_empty_columns(self) -> List:
+        """Sayfa boyutundan gelen, hiç veri içermeyen sondaki kolonlar (pd.read_excel bunları atar)"""
+        return self.columns[self.data_width:]
 
 class ExcelAnalyzer:
     """Excel dosyalarını analiz eden ana sınıf"""
@@ -303,88 +1112,368 @@ class ExcelAnalyzer:
     # - Tarih/Tip/İçerik analizleri yapmak
     # - Rapor ve çıktı operasyonlarını koordine etmek
     
-    def __init__(self):
-        self.cleaner = KVKKDataCleaner()
+    def __init__(self, kvkk_workers: int = 1, kvkk_executor: str = "process",
+                 use_decision_cache: bool = True, stream_chunk_rows: Optional[int] = 50000,
+                 use_table_cache: bool = True, use_incremental: bool = True,
+                 profile_distinct: str = "exact", use_categorical: bool = True,
+                 output_format: str = DEFAULT_OUTPUT_FORMAT):
+        # kvkk_workers: KVKK kolon sınıflandırması için paralel çalışan sayısı (1 = sıralı)
+        # kvkk_executor: "process" (CPU yoğun geniş dosyalar) veya "thread"
+        #                Bu ikisi tüm sayfanın bellekte sınıflandırıldığı yolda (.xls/.csv veya
+        #                stream_chunk_rows=None) geçerlidir; .xlsx akış okumasında içerik chunk geldikçe
+        #                kolon başına küçük parçalarla skorlanır ve havuz kullanılmaz
+        # use_decision_cache: KVKK kolon kararlarını artifacts/cache altında sakla ve yeniden kullan
+        #                     (akış okumasında "sample" modunda da kullanılır)
+        # stream_chunk_rows: .xlsx dosyalarını bu kadar satırlık chunk'larla akış halinde oku
+        #                    (None/0 = tüm sayfayı pd.read_excel ile tek seferde oku)
+        # use_table_cache: aynı içerikli dosyanın temiz verisini/özetini Arrow önbelleğinden yükle
+        # use_incremental: daha önce analiz edilmiş ve sonuna satır eklenmiş kitapta sadece yeni
+        #                  satırları oku (tablo önbelleği ve .xlsx akış okuması gerektirir)
+        # profile_distinct: içerik profilinde benzersiz/en sık değer sayımı: "exact" (factorize),
+        #                   "approx" (HyperLogLog + SpaceSaving özetleri; sabit bellek, yaklaşık ±%3)
+        #                   veya "auto" (sadece büyük metin kolonları özetlenir)
+        # use_categorical: düşük kardinaliteli metin kolonlarını (vardiya, ekipman, kategori) temizlik
+        #                  sonrası pandas 'category' tipinde tut (bellek ve gruplama/sayım hızı için)
+        # output_format: save_cleaned_data çıktı formatı: "xlsx" (akış modunda), "csv" veya "parquet"
+        self.cleaner = KVKKDataCleaner(decision_cache=ColumnDecisionCache() if use_decision_cache else None)
         self.analysis_results = {}
+        self.kvkk_workers = max(1, int(kvkk_workers))
+        self.kvkk_executor = kvkk_executor
+        self.stream_chunk_rows = stream_chunk_rows
+        self.table_cache = ColumnarAnalysisCache() if use_table_cache else None
+        self.profile_distinct = profile_distinct
+        self.use_categorical = use_categorical
+        self.output_format = output_format
+        self.workbook_registry = (WorkbookRegistry()
+                                  if use_incremental and self.table_cache is not None and stream_chunk_rows
+                                  else None)
+        # Paralel toplu analizde alt süreçler aynı ayarlarla kendi analyzer'larını kurar
+        self.options = {
+            'kvkk_workers': self.kvkk_workers,
+            'kvkk_executor': kvkk_executor,
+            'use_decision_cache': use_decision_cache,
+            'stream_chunk_rows': stream_chunk_rows,
+            'use_table_cache': use_table_cache,
+            'use_incremental': use_incremental,
+            'profile_distinct': profile_distinct,
+            'use_categorical': use_categorical,
+            'output_format': output_format
+        }
+    
+    def _cache_settings(self) -> Dict:
+        """Önbelleğe alınan temiz veriyi/özeti değiştiren ayarlar (tablo ve kitap defteri anahtarına girer)"""
+        return {'kategori': self.use_categorical, 'benzersiz': self.profile_distinct}
     
-    def analyze_excel_file(self, file_path: str) -> Dict:
+    def analyze_excel_file(self, file_path: str, kvkk_scan_mode: str = "sample") -> Dict:
         """Tek bir Excel dosyasını analiz eder"""
+        # kvkk_scan_mode: "sample" (ilk 20 dolu değer) veya "full" (tüm satırlar, erken sonlandırmalı)
         # Akış:
         # 1) Dosyayı oku → 2) KVKK temizliği → 3) Tarih kolonlarını bul
         # 4) Veri tipleri ve içerik özetini çıkar → 5) Yapılandırılmış sonuç döndür
+        # .xlsx dosyalarında 1-4 akış halinde, chunk chunk yapılır (bkz. _analyze_excel_stream)
+        # Aynı içerik daha önce aynı KVKK kurallarıyla analiz edildiyse sonuç önbellekten gelir.
         try:
             print(f"\n🔍 Analiz ediliyor: {os.path.basename(file_path)}")
             
-            # Excel dosyasını oku
-            df = pd.read_excel(file_path)
+            cache_key = None
+            if self.table_cache is not None and self.table_cache.enabled:
+                cache_key = self.table_cache.make_key(file_path, self.cleaner.rules_signature, kvkk_scan_mode,
+                                                      self._cache_settings())
+                cached = self.table_cache.load(cache_key)
+                if cached is not None:
+                    return self._analysis_from_cache(file_path, *cached)
+                # Bilinen bir kitabın sonuna satır eklendiyse sadece yeni satırlar işlenir
+                incremental = self._analyze_incremental(file_path, kvkk_scan_mode, cache_key)
+                if incremental is not None:
+                    return incremental
+            
+            reader = None
+            if self.stream_chunk_rows and file_path.lower().endswith(ExcelChunkReader.STREAMABLE_EXTENSIONS):
+                (df_clean, removed_columns, removal_reasons,
+                 columns, row_count, reader) = self._analyze_excel_stream(file_path, kvkk_scan_mode)
+            else:
+                # Excel dosyasını oku
+                df = pd.read_excel(file_path)
+                columns, row_count = list(df.columns), len(df)
+                print(f"   📊 {row_count} satır, {len(columns)} kolon")
+                
+                # KVKK temizleme
+                # Ham DataFrame bu metoda ait olduğundan temizlik yerinde yapılır (ek kopya yok)
+                df_clean, removed_columns, removal_reasons = self.cleaner.clean_dataframe(
+                    df, scan_mode=kvkk_scan_mode, inplace=True,
+                    workers=self.kvkk_workers, executor=self.kvkk_executor
+                )
             
             # Temel bilgiler
             basic_info = {
                 'dosya_adi': os.path.basename(file_path),
                 'dosya_boyutu': f"{os.path.getsize(file_path) / 1024:.1f} KB",
-                'satir_sayisi': len(df),
-                'kolon_sayisi': len(df.columns),
-                'kolonlar': list(df.columns)
+                'satir_sayisi': row_count,
+                'kolon_sayisi': len(columns),
+                'kolonlar': columns
             }
             
-            print(f"   📊 {basic_info['satir_sayisi']} satır, {basic_info['kolon_sayisi']} kolon")
-            
-            # KVKK temizleme
-            df_clean, removed_columns = self.cleaner.clean_dataframe(df)
-            
             if removed_columns:
                 print(f"   🔒 KVKK: {len(removed_columns)} kolon kaldırıldı: {removed_columns}")
             else:
                 print("   ✅ KVKK: Kişisel veri tespit edilmedi")
             
-            # Tarih kolonlarını tespit et
+            # Tarih kolonlarını tespit et ve bir kez datetime64'e çevir (tüketiciler tekrar ayrıştırmaz)
             date_columns = self.detect_date_columns(df_clean)
             if date_columns:
                 print(f"   📅 Tarih kolonları: {date_columns}")
+            date_formats = self.convert_date_columns(df_clean, date_columns)
+            if self.use_categorical:
+                self.convert_categorical_columns(df_clean)
             
-            # Veri tipleri analizi
-            data_types = self.analyze_data_types(df_clean)
+            # Veri tipleri ve içerik analizi (kolon başına tek geçişli profil)
+            profile = profile_dataframe(df_clean, self.profile_distinct)
+            data_types = profile['veri_tipleri']
+            content_analysis = profile['icerik_analizi']
             
-            # İçerik analizi
-            content_analysis = self.analyze_content(df_clean)
+            # Temiz veriyi ilk tarih kolonuna göre sıralı DatetimeIndex ile tut
+            # (GUI tarih aralığı filtresi tam tarama yerine ikili arama ile dilimler)
+            date_index = self._pick_date_index(df_clean, date_formats)
+            daily_cube = None
+            if date_index is not None:
+                df_clean = index_by_date(df_clean, date_index)
+                # Gün bazında özet hücreleri (GUI/AI aralık özetleri bunlardan birleştirilir)
+                daily_cube = DailyAggregateCube.build(df_clean, date_index)
             
             # Sonuçları birleştir
             analysis = {
                 'temel_bilgiler': basic_info,
                 'kvkk_temizlik': {
                     'kaldirilan_kolonlar': removed_columns,
+                    'kaldirma_nedenleri': removal_reasons,
+                    'tarama_modu': kvkk_scan_mode,
                     'temiz_kolon_sayisi': len(df_clean.columns),
                     'temiz_kolonlar': list(df_clean.columns)
                 },
                 'tarih_kolonlari': date_columns,
+                'tarih_formatlari': date_formats,
+                'tarih_indeksi': date_index,
                 'veri_tipleri': data_types,
                 'icerik_analizi': content_analysis,
+                'gunluk_ozet': daily_cube,
                 'temiz_veri': df_clean
             }
             
+            if cache_key is not None:
+                stored = self.table_cache.store(cache_key, df_clean, {
+                    'temel_bilgiler': basic_info,
+                    'kvkk_temizlik': analysis['kvkk_temizlik'],
+                    'tarih_kolonlari': date_columns,
+                    'tarih_formatlari': date_formats,
+                    'tarih_indeksi': date_index,
+                    'bos_degerler': content_analysis['bos_degerler'],
+                    'benzersiz_degerler': content_analysis['benzersiz_degerler'],
+                    'benzersiz_modu': content_analysis['benzersiz_modu'],
+                    'min_max': content_analysis['min_max'],
+                    'en_sik_degerler': content_analysis['en_sik_degerler']
+                })
+                if stored and reader is not None:
+                    self._register_workbook(reader, cache_key, kvkk_scan_mode)
+            
             return analysis
             
         except Exception as e:
             print(f"   ❌ Hata: {str(e)}")
             return {'hata': str(e)}
     
-    def detect_date_columns(self, df: pd.DataFrame) -> List[str]:
+    def _analysis_from_cache(self, file_path: str, df_clean: pd.DataFrame, summary: Dict,
+                             source_note: str = "⚡ Önbellekten yüklendi (dosya içeriği değişmemiş)") -> Dict:
+        """Önbellekteki temiz veri ve özetten analyze_excel_file sonucunu kurar"""
+        # Sayım gibi pahalı içerik metrikleri özetten gelir; tipler ve örnekler veriden okunur.
+        # (JSON özetinde min/max ve en sık değerlerdeki tarihler ISO metni olarak saklanır)
+        basic_info = dict(summary['temel_bilgiler'],
+                          dosya_adi=os.path.basename(file_path),
+                          dosya_boyutu=f"{os.path.getsize(file_path) / 1024:.1f} KB")
+        kvkk_info = summary['kvkk_temizlik']
+        removed_columns = kvkk_info['kaldirilan_kolonlar']
+        
+        print(f"   {source_note}")
+        print(f"   📊 {basic_info['satir_sayisi']} satır, {basic_info['kolon_sayisi']} kolon")
+        if removed_columns:
+            print(f"   🔒 KVKK: {len(removed_columns)} kolon kaldırıldı: {removed_columns}")
+        else:
+            print("   ✅ KVKK: Kişisel veri tespit edilmedi")
+        date_columns = summary['tarih_kolonlari']
+        if date_columns:
+            print(f"   📅 Tarih kolonları: {date_columns}")
+        
+        # Arrow tablosu indeks taşımaz; sıralı veri yazıldığından indeks kolondan yeniden kurulur
+        date_index = summary.get('tarih_indeksi')
+        daily_cube = None
+        if date_index in df_clean.columns:
+            df_clean.index = pd.DatetimeIndex(df_clean[date_index], name=None)
+            df_clean.attrs['tarih_indeksi'] = date_index
+            daily_cube = DailyAggregateCube.build(df_clean, date_index)
+        
+        return {
+            'temel_bilgiler': basic_info,
+            'kvkk_temizlik': kvkk_info,
+            'tarih_kolonlari': date_columns,
+            'tarih_formatlari': summary.get('tarih_formatlari', {}),
+            'tarih_indeksi': date_index,
+            'veri_tipleri': self.analyze_data_types(df_clean),
+            'icerik_analizi': {
+                'bos_degerler': summary['bos_degerler'],
+                'benzersiz_degerler': summary['benzersiz_degerler'],
+                'benzersiz_modu': summary.get('benzersiz_modu', 'exact'),
+                'ornek_veriler': {col: df_clean[col].dropna().head(3).tolist() for col in df_clean.columns},
+                'min_max': summary.get('min_max', {}),
+                'en_sik_degerler': summary.get('en_sik_degerler', {})
+            },
+            'gunluk_ozet': daily_cube,
+            'temiz_veri': df_clean
+        }
+    
+    def _register_workbook(self, reader: 'ExcelChunkReader', cache_key: str, kvkk_scan_mode: str):
+        """Tam okunan kitabı artımlı içe aktarma defterine kaydeder"""
+        if self.workbook_registry is None or not reader.edge_rows:
+            return
+        identity = workbook_identity(reader.columns, reader.head_rows)
+        key = self.workbook_registry.make_key(identity, self.cleaner.rules_signature, kvkk_scan_mode,
+                                              self._cache_settings())
+        self.workbook_registry.put(key, {
+            'satir_sayisi': reader.row_count,
+            'son_satirlar': rows_fingerprint(reader.tail_rows),
+            'kolonlar': [str(column) for column in reader.columns],
+            'onbellek': cache_key
+        })
+    
+    def _analyze_incremental(self, file_path: str, kvkk_scan_mode: str, cache_key: str) -> Optional[Dict]:
+        """Bilinen kitaba eklenen satırları okuyup önceki temiz veriye ekler; mümkün değilse None"""
+        # Adımlar: kitabı baştaki satırlarından tanı → önceki temiz veriyi önbellekten yükle →
+        # sadece kuyruğu (son bilinen satırlar + yenileri) oku → örtüşen satırlar aynı mı kontrol et →
+        # önceki KVKK kararlarını ve tarih formatlarını yeni satırlara uygula → birleştir ve sakla.
+        if self.workbook_registry is None or not file_path.lower().endswith(ExcelChunkReader.STREAMABLE_EXTENSIONS):
+            return None
+        
+        head_reader = ExcelChunkReader(file_path, INGEST_EDGE_ROWS, edge_rows=INGEST_EDGE_ROWS)
+        chunks = iter(head_reader)
+        next(chunks, None)
+        chunks.close()
+        identity = workbook_identity(head_reader.columns, head_reader.head_rows)
+        key = self.workbook_registry.make_key(identity, self.cleaner.rules_signature, kvkk_scan_mode,
+                                              self._cache_settings())
+        entry = self.workbook_registry.get(key)
+        if entry is None:
+            return None
+        cached = self.table_cache.load(entry['onbellek'])
+        if cached is None:
+            return None
+        stored_df, summary = cached
+        
+        known_rows = entry['satir_sayisi']
+        overlap = min(INGEST_EDGE_ROWS, known_rows)
+        source = build_tail_workbook(file_path, known_rows - overlap)
+        if source is None:
+            return None
+        reader = ExcelChunkReader(file_path, self.stream_chunk_rows, edge_rows=INGEST_EDGE_ROWS, source=source)
+        tail_chunks = list(reader)
+        # Başlık aynı ve bilinen son satırlar birebir korunmuş olmalı (aksi halde tam analiz)
+        if ([str(column) for column in reader.columns] != entry['kolonlar']
+                or len(reader.head_rows) < overlap
+                or rows_fingerprint(reader.head_rows[:overlap]) != entry['son_satirlar']):
+            return None
+        
+        tail_df = pd.concat(tail_chunks, ignore_index=True) if tail_chunks else pd.DataFrame(columns=reader.columns)
+        new_rows = tail_df.iloc[overlap:].reset_index(drop=True)
+        kvkk_info = summary['kvkk_temizlik']
+        removed_columns = set(kvkk_info['kaldirilan_kolonlar'])
+        # Önceden boş olduğu için atılan (sondaki) kolonlara veri geldiyse kolon yapısı değişmiştir
+        dropped = [column for column in new_rows.columns
+                   if column not in stored_df.columns and column not in removed_columns]
+        if dropped and new_rows[dropped].notna().any().any():
+            return None
+        new_clean = align_new_rows(stored_df, new_rows, summary.get('tarih_formatlari', {}),
+                                   summary.get('metne_cevrilen_kolonlar', []))
+        if new_clean is None:
+            return None
+        
+        df_clean = pd.concat([stored_df, new_clean], ignore_index=True) if len(new_clean) else stored_df
+        if self.use_categorical and len(new_clean):
+            # Yeni değerler kategorileri değiştirebilir; tam analizdeki gibi birleşik veriden yeniden karar verilir
+            categorical = [column for column in stored_df.columns
+                           if isinstance(stored_df[column].dtype, pd.CategoricalDtype)]
+            df_clean[categorical] = df_clean[categorical].astype(object)
+            # Önbellekte metne çevrilmiş karışık kolonlar tam analizde de object kalır
+            stringified = set(summary.get('metne_cevrilen_kolonlar', []))
+            self.convert_categorical_columns(df_clean, [column for column in df_clean.columns
+                                                        if column not in stringified])
+        date_index = summary.get('tarih_indeksi')
+        if date_index in df_clean.columns:
+            # Önceki veri zaten sıralı; kararlı sıralama eşit tarihlerde dosya sırasını korur
+            df_clean = index_by_date(df_clean, date_index)
+        
+        row_count = known_rows - overlap + reader.row_count
+        summary = dict(summary)
+        summary['temel_bilgiler'] = dict(summary['temel_bilgiler'], satir_sayisi=row_count)
+        # İçerik profili birleşik veriden yeniden çıkarılır (benzersiz sayılar eklemeyle toplanamaz)
+        content_analysis = profile_dataframe(df_clean, self.profile_distinct)['icerik_analizi']
+        for field in ('bos_degerler', 'benzersiz_degerler', 'benzersiz_modu', 'min_max', 'en_sik_degerler'):
+            summary[field] = content_analysis[field]
+        summary.pop('metne_cevrilen_kolonlar', None)
+        
+        if self.table_cache.store(cache_key, df_clean, summary):
+            self.workbook_registry.put(key, {
+                'satir_sayisi': row_count,
+                'son_satirlar': rows_fingerprint(reader.tail_rows),
+                'kolonlar': entry['kolonlar'],
+                'onbellek': cache_key
+            })
+        return self._analysis_from_cache(
+            file_path, df_clean, summary,
+            source_note=f"➕ Artımlı içe aktarma: {len(new_clean)} yeni satır (önceki {known_rows} satır önbellekten)"
+        )
+    
+    def _analyze_excel_stream(self, file_path: str, kvkk_scan_mode: str) -> Tuple:
+        """Excel dosyasını chunk'lar halinde okur, KVKK temizliği ve profil çıkarımını akışta yapar"""
+        # Bellekte aynı anda en fazla bir ham chunk + temiz veri bulunur; içerik profili
+        # birleşik temiz veriden tek geçişte çıkarılır (bkz. data_profile.profile_dataframe).
+        # Dönüş: (temiz_df, kaldırılan_kolonlar, removal_reasons, kolonlar, satır_sayısı, okuyucu)
+        edge_rows = INGEST_EDGE_ROWS if self.workbook_registry is not None else 0
+        reader = ExcelChunkReader(file_path, self.stream_chunk_rows, edge_rows=edge_rows)
+        stream = None
+        for chunk in reader:
+            if stream is None:
+                stream = StreamingKVKKCleaner(self.cleaner, chunk.columns, scan_mode=kvkk_scan_mode)
+            stream.feed(chunk)
+        if stream is None:
+            stream = StreamingKVKKCleaner(self.cleaner, reader.columns, scan_mode=kvkk_scan_mode)
+        
+        # Sayfa boyutundan gelen boş sondaki kolonlar pd.read_excel çıktısında da yoktur
+        trailing = set(reader.trailing_empty_columns)
+        columns = [column for column in reader.columns if column not in trailing]
+        print(f"   📊 {reader.row_count} satır, {len(columns)} kolon")
+        
+        df_clean, removed_columns, removal_reasons = stream.finish()
+        if trailing:
+            df_clean = df_clean.drop(columns=[column for column in df_clean.columns if column in trailing])
+            removed_columns = [column for column in removed_columns if column not in trailing]
+            removal_reasons = {column: reason for column, reason in removal_reasons.items()
+                               if column not in trailing}
+        return df_clean, removed_columns, removal_reasons, columns, reader.row_count, reader
+    
+    def detect_date_columns(self, df: pd.DataFrame, samples: Optional[Dict[str, List]] = None) -> List[str]:
         """Tarih kolonlarını otomatik tespit eder"""
         # İki strateji: isim bazlı ipucu + örnek değerleri datetime'a çevirme denemesi
+        # samples: akış okumasında biriktirilen kolon başına ilk dolu değerler (yoksa df'ten alınır)
         date_columns = []
         
         for column in df.columns:
-            # Kolon adına göre
-            if any(keyword in column.lower() for keyword in ['tarih', 'date', 'zaman', 'time']):
-                try:
-                    pd.to_datetime(df[column], errors='coerce')
-                    date_columns.append(column)
-                except:
-                    pass
+            # Kolon adına göre (ayrıştırma convert_date_columns'ta bir kez yapılır)
+            if has_date_name(column):
+                date_columns.append(column)
             
             # İçeriğe göre
             elif df[column].dtype == 'object':
-                sample = df[column].dropna().head(5)
+                if samples is not None:
+                    sample = pd.Series(samples.get(column, [])[:5], dtype=object)
+                else:
+                    sample = df[column].dropna().head(5)
                 try:
                     parsed_dates = pd.to_datetime(sample, errors='coerce')
                     if parsed_dates.notna().sum() >= len(sample) * 0.8:  # %80 başarı oranı
@@ -394,6 +1483,69 @@ class ExcelAnalyzer:
         
         return date_columns
     
+    def convert_date_columns(self, df: pd.DataFrame, date_columns: List[str]) -> Dict[str, str]:
+        """Tarih kolonlarını sezilen formatla bir kez ayrıştırıp yerinde datetime64 yapar"""
+        # Adı tarih bildiren kolonlar, dolu değerlerin en az %80'i ayrıştırılabiliyorsa çevrilir
+        # (kalanlar NaT olur; tüketiciler zaten errors='coerce' ile aynı sonucu alıyordu).
+        # Sadece içerikten tespit edilen kolonlar ancak kayıpsızsa (%100) çevrilir.
+        # Tarih bileşeni olmayan kolonlar (ör. "Başlangıç Zamanı": 08:00, 16:00) format sezilemediği
+        # için çevrilmez; değerleri aynen kalır (bkz. sniff_date_format).
+        # Dönüş: {kolon: sezilen_format}
+        converted = {}
+        for column in date_columns:
+            if pd.api.types.is_datetime64_any_dtype(df[column]):
+                converted[column] = 'datetime'
+                continue
+            parsed, date_format, ratio = parse_date_series(df[column])
+            if date_format is None:
+                continue
+            required = DATE_PARSE_MIN_RATIO if has_date_name(column) else 1.0
+            if date_format == 'karisik' and not has_date_name(column):
+                continue
+            if ratio >= required:
+                df[column] = parsed
+                converted[column] = date_format
+        return converted
+    
+    def convert_categorical_columns(self, df: pd.DataFrame, columns: Optional[Sequence] = None) -> List[str]:
+        """Düşük kardinaliteli metin kolonlarını yerinde 'category' tipine çevirir"""
+        # Değerler aynen korunur; sadece tüm dolu değerleri str olan object kolonlar çevrilir
+        # (karışık tipli kolonlar Arrow önbelleğinde metne çevrildiğinden dışarıda bırakılır).
+        # Sayım/gruplama kodlar üzerinden yapılır; metin temizliği (boş benzeri değerler vb.)
+        # satır başına değil kategori başına bir kez uygulanabilir (bkz. clean_count_series).
+        # columns: incelenecek kolonlar (varsayılan: tümü). Dönüş: çevrilen kolonlar
+        converted = []
+        for column in (df.columns if columns is None else columns):
+            series = df[column]
+            if series.dtype != 'object':
+                continue
+            uniques = series.dropna().unique()
+            if not 0 < len(uniques) <= CATEGORICAL_MAX_UNIQUE:
+                continue
+            if len(uniques) > CATEGORICAL_MAX_RATIO * series.count():
+                continue
+            if all(isinstance(value, str) for value in uniques):
+                df[column] = series.astype('category')
+                converted.append(column)
+        return converted
+    
+    @staticmethod
+    def _pick_date_index(df: pd.DataFrame, date_formats: Dict[str, str]) -> Optional[str]:
+        """Sıralı indeks için tarih kolonunu seçer (yoksa None)"""
+        # Öncelik: adı 'tarih'/'date' olup belirli bir formatla ayrıştırılan kolon, sonra diğer
+        # belirli formatlı kolonlar; değer bazlı ('karisik') çevrilenler ancak başka aday yoksa.
+        # Aynı öncelikte kolon sırası korunur.
+        candidates = [column for column in date_formats
+                      if pd.api.types.is_datetime64_any_dtype(df[column]) and df[column].notna().any()]
+        if not candidates:
+            return None
+        
+        def rank(column) -> Tuple[bool, bool]:
+            named = any(keyword in str(column).lower() for keyword in ('tarih', 'date'))
+            return date_formats[column] == 'karisik', not named
+        
+        return min(candidates, key=rank)
+    
     def analyze_data_types(self, df: pd.DataFrame) -> Dict:
         """Veri tiplerini analiz eder"""
         # Çıktı: tip dağılımı (adet) ve kolon bazında dtype haritası
@@ -406,24 +1558,21 @@ class ExcelAnalyzer:
     
     def analyze_content(self, df: pd.DataFrame) -> Dict:
         """İçerik analizini yapar"""
-        # Basit içerik özeti: boşluk sayıları, benzersiz değer sayıları ve örnekler
-        analysis = {
-            'bos_degerler': df.isnull().sum().to_dict(),
-            'benzersiz_degerler': {col: df[col].nunique() for col in df.columns},
-            'ornek_veriler': {}
-        }
-        
-        # Her kolondan örnek veriler al
-        for col in df.columns:
-            sample_values = df[col].dropna().head(3).tolist()
-            analysis['ornek_veriler'][col] = sample_values
-        
-        return analysis
+        # Boşluk/benzersiz sayıları, min/max, en sık değerler ve örnekler tek geçişte çıkarılır
+        # (analyze_excel_file tipleri de aynı profilden alır; bkz. data_profile.profile_dataframe)
+        return profile_dataframe(df, self.profile_distinct)['icerik_analizi']
     
-    def analyze_all_files(self) -> Dict:
-        """Workspace'teki tüm Excel dosyalarını analiz eder"""
-        # Kök dizinde .xlsx/.xls dosyalarını dolaşır; her biri için tekil analiz uygular
-        excel_files = [f for f in os.listdir('.') if f.endswith(('.xlsx', '.xls'))]
+    def analyze_all_files(self, source: Optional[str] = None, workers: int = 1,
+                          output_dir: Optional[str] = None, kvkk_scan_mode: str = "sample") -> Dict:
+        """Bir klasördeki (veya glob desenine uyan) tüm Excel dosyalarını analiz eder"""
+        # source: klasör yolu (içindeki .xlsx/.xls) veya glob deseni; None → çalışma dizini
+        # workers>1: dosyalar process havuzunda paralel işlenir (dosya başına bir görev)
+        # output_dir: verilirse her dosyanın temiz verisi biter bitmez buraya kaydedilir ve
+        #             sonuçtan çıkarılır ('temiz_dosya' yolu eklenir); böylece tüm dosyaların
+        #             DataFrame'leri aynı anda bellekte tutulmaz. None → temiz veri diske taşınır ve
+        #             sonuçta 'temiz_veri_tutamaci' (CleanDataHandle) olarak döner; işi biten
+        #             çağıran release() ile dosyayı siler
+        excel_files = self._resolve_excel_files(source)
         
         if not excel_files:
             print("❌ Excel dosyası bulunamadı!")
@@ -431,12 +1580,76 @@ class ExcelAnalyzer:
         
         print(f"📁 {len(excel_files)} Excel dosyası bulundu")
         
+        # Sonuç anahtarı dosya adıdır; farklı klasörlerde aynı ad varsa klasör adı eklenir
+        keys = {}
+        for file_path in excel_files:
+            key = os.path.basename(file_path)
+            if key in keys.values():
+                key = f"{os.path.basename(os.path.dirname(os.path.abspath(file_path)))}_{key}"
+            keys[file_path] = key
+        
         all_results = {}
-        for file in excel_files:
-            result = self.analyze_excel_file(file)
-            all_results[file] = result
+        workers = max(1, min(int(workers), len(excel_files)))
+        if workers == 1:
+            for file_path in excel_files:
+                all_results[keys[file_path]] = self._analyze_and_save(
+                    file_path, keys[file_path], kvkk_scan_mode, output_dir
+                )
+            return all_results
         
-        return all_results
+        # Alt süreçlerde iç içe havuz açılmaması için KVKK sınıflandırması sıralı çalışır
+        options = dict(self.options, kvkk_workers=1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_analyze_file_task, options, file_path, keys[file_path], kvkk_scan_mode, output_dir): file_path
+                for file_path in excel_files
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                file_path = futures[future]
+                try:
+                    all_results[keys[file_path]] = future.result()
+                except Exception as e:
+                    all_results[keys[file_path]] = {'hata': str(e)}
+                print(f"   ⏱️ {done}/{len(excel_files)} tamamlandı: {keys[file_path]}")
+        
+        # Rapor sırası dosya sırasıyla aynı kalsın
+        return {keys[file_path]: all_results[keys[file_path]] for file_path in excel_files}
+    
+    @staticmethod
+    def _resolve_excel_files(source: Optional[str] = None) -> List[str]:
+        """Klasör veya glob deseninden sıralı Excel dosya listesi üretir"""
+        source = source or '.'
+        if os.path.isdir(source):
+            candidates = [os.path.join(source, name) for name in os.listdir(source)]
+        else:
+            candidates = glob.glob(source, recursive=True)
+        return sorted(path for path in candidates
+                      if path.endswith(('.xlsx', '.xls')) and os.path.isfile(path))
+    
+    def _analyze_and_save(self, file_path: str, result_key: str, kvkk_scan_mode: str,
+                          output_dir: Optional[str]) -> Dict:
+        """Tek dosya için analiz → (opsiyonel) kaydet → temiz veriyi bırak"""
+        result = self.analyze_excel_file(file_path, kvkk_scan_mode=kvkk_scan_mode)
+        if output_dir and 'hata' not in result:
+            saved = self.save_cleaned_data({result_key: result}, output_dir)
+            if result_key in saved:
+                result['temiz_dosya'] = saved[result_key]
+            result.pop('temiz_veri', None)
+            result.pop('gunluk_ozet', None)
+        elif 'hata' not in result:
+            self.detach_clean_data(result)
+        return result
+    
+    @staticmethod
+    def detach_clean_data(result: Dict) -> Optional[CleanDataHandle]:
+        """Sonuçtaki temiz DataFrame'i diske taşır; yerine 'temiz_veri_tutamaci' koyar"""
+        # Tutamaç kolonları/tarih aralıklarını ihtiyaç anında yükler (bkz. data_handle)
+        df_clean = result.pop('temiz_veri', None)
+        if df_clean is None:
+            return result.get('temiz_veri_tutamaci')
+        handle = CleanDataHandle.spill(df_clean)
+        result['temiz_veri_tutamaci'] = handle
+        return handle
     
     def generate_summary_report(self, results: Dict) -> str:
         """Analiz sonuçlarının özetini oluşturur"""
@@ -490,48 +1703,75 @@ class ExcelAnalyzer:
         
         return "\n".join(report)
     
-    def save_cleaned_data(self, results: Dict, output_dir: str = "cleaned_data"):
+    def save_cleaned_data(self, results: Dict, output_dir: str = "cleaned_data",
+                          output_format: Optional[str] = None) -> Dict[str, str]:
         """Temizlenmiş verileri kaydeder"""
-        # Excel olarak yazar; ad çakışması/dosya kilitlenmesi durumunda zaman damgalı alternatif üretir
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        # output_format verilmezse analyzer ayarı kullanılır (bkz. data_writers)
+        # Her dosya geçici dosyaya yazılıp atomik olarak taşınır; hedef kilitliyse (dosya açık)
+        # aynı geçici dosya zaman damgalı alternatif ada taşınır
+        # Dönüş: {dosya_adı: kaydedilen_yol} (sadece başarılı kayıtlar)
+        output_format = output_format or self.output_format
+        os.makedirs(output_dir, exist_ok=True)
+        saved = {}
         
         for file_name, result in results.items():
-            if 'hata' in result or 'temiz_veri' not in result:
+            if 'hata' in result:
+                continue
+            clean_df = result.get('temiz_veri')
+            if clean_df is None and result.get('temiz_veri_tutamaci') is not None:
+                clean_df = result['temiz_veri_tutamaci'].load()
+            if clean_df is None:
                 continue
             
-            clean_df = result['temiz_veri']
-            clean_file_name = f"clean_{file_name}"
-            clean_path = os.path.join(output_dir, clean_file_name)
-            
+            clean_path = output_path(output_dir, file_name, output_format)
             try:
-                # Dosya kaydetme denemesi
-                clean_df.to_excel(clean_path, index=False)
-                print(f"✅ Temiz veri kaydedildi: {clean_path}")
-            except PermissionError:
-                # Dosya açıksa alternatif isim dene
-                timestamp = datetime.now().strftime("%H%M%S")
-                alt_file_name = f"clean_{timestamp}_{file_name}"
-                alt_path = os.path.join(output_dir, alt_file_name)
-                try:
-                    clean_df.to_excel(alt_path, index=False)
-                    print(f"✅ Temiz veri kaydedildi (alternatif): {alt_path}")
-                except Exception as e:
-                    print(f"❌ Kaydetme hatası: {clean_path} - {str(e)}")
+                written_path = write_frame(clean_df, clean_path, output_format)
+                saved[file_name] = written_path
+                if written_path == clean_path:
+                    print(f"✅ Temiz veri kaydedildi: {written_path}")
+                else:
+                    print(f"✅ Temiz veri kaydedildi (alternatif): {written_path}")
             except Exception as e:
-                print(f"❌ Beklenmeyen kaydetme hatası: {clean_path} - {str(e)}")
+                print(f"❌ Kaydetme hatası: {clean_path} - {str(e)}")
+        
+        return saved
+
+def _analyze_file_task(options: Dict, file_path: str, result_key: str, kvkk_scan_mode: str,
+                       output_dir: Optional[str]) -> Dict:
+    """Havuz çalışanı: dosyayı analiz eder, temiz veriyi kaydeder, hafif sonucu döndürür"""
+    # Process havuzu için modül seviyesinde; DataFrame ana sürece taşınmaz
+    result = ExcelAnalyzer(**options)._analyze_and_save(file_path, result_key, kvkk_scan_mode, output_dir)
+    handle = result.get('temiz_veri_tutamaci')
+    if handle is not None:
+        # Diske taşınan verinin sahipliği ana sürece geçer
+        handle.detach()
+    return result
 
 def main():
     """Ana çalıştırma fonksiyonu"""
     # CLI kullanım senaryosu: tüm dosyaları analiz et → özet yazdır → temiz verileri ve raporu kaydet
+    # Örn. gece işi: python excel_analyzer.py "D:/hatlar/**/*.xlsx" --workers 4
+    parser = argparse.ArgumentParser(description="Excel analiz ve KVKK temizleme")
+    parser.add_argument("kaynak", nargs="?", default=".",
+                        help="Excel klasörü veya glob deseni (varsayılan: çalışma dizini)")
+    parser.add_argument("--workers", "-j", type=int, default=1,
+                        help="Paralel işlenecek dosya sayısı (process havuzu)")
+    parser.add_argument("--output-dir", default="cleaned_data", help="Temiz verilerin kaydedileceği klasör")
+    parser.add_argument("--format", dest="output_format", default=DEFAULT_OUTPUT_FORMAT, choices=output_formats(),
+                        help="Temiz veri çıktı formatı (varsayılan: xlsx)")
+    args = parser.parse_args()
+    
     print("🚀 Akıllı Üretim Günlüğü - Excel Analiz Sistemi")
     print("=" * 50)
     
+    # KVKK kolon kararlarını konsola yaz (KVKK_LOG_LEVEL=DEBUG ile değer bazlı iz)
+    configure_kvkk_logging(os.environ.get("KVKK_LOG_LEVEL", "INFO"))
+    
     # Analyzer'ı başlat
-    analyzer = ExcelAnalyzer()
+    analyzer = ExcelAnalyzer(output_format=args.output_format)
     
-    # Tüm dosyaları analiz et
-    results = analyzer.analyze_all_files()
+    # Tüm dosyaları analiz et (her dosyanın temiz verisi bittiği anda kaydedilir)
+    results = analyzer.analyze_all_files(args.kaynak, workers=args.workers, output_dir=args.output_dir)
     
     if not results:
         return
@@ -540,15 +1780,14 @@ def main():
     summary = analyzer.generate_summary_report(results)
     print(summary)
     
-    # Temizlenmiş verileri kaydet
-    analyzer.save_cleaned_data(results)
-    
     # Raporu dosyaya kaydet
     with open("analiz_raporu.txt", "w", encoding="utf-8") as f:
         f.write(summary)
     
     print(f"\n📄 Detaylı rapor 'analiz_raporu.txt' dosyasına kaydedildi")
-    print(f"📁 Temizlenmiş veriler 'cleaned_data/' klasörüne kaydedildi")
+    print(f"📁 Temizlenmiş veriler '{args.output_dir}/' klasörüne kaydedildi")
 
 if __name__ == "__main__":
+    # Process havuzu için (Windows / PyInstaller exe)
+    multiprocessing.freeze_support()
     main()
@@ -92,16 +92,7 @@ class SecureFileValidator:
             # 2. Hedef klasörü oluştur (yoksa) - Exe için mutlak yol kullan
             if target_dir == "artifacts":
                 # Exe dosyasının bulunduğu klasörde artifacts klasörü oluştur
-                if getattr(sys, 'frozen', False):
-                    # Exe'den çalıştırılıyor
-                    exe_dir = os.path.dirname(sys.executable)
-                    print(f"🔍 Exe dizini tespit edildi: {exe_dir}")
-                else:
-                    # Python script'ten çalıştırılıyor
-                    exe_dir = os.getcwd()
-                    print(f"🔍 Python çalışma dizini: {exe_dir}")
-                
-                target_dir = os.path.join(exe_dir, "artifacts")
+                target_dir = get_artifacts_dir()
                 print(f"📁 Hedef artifacts dizini: {target_dir}")
             
             if not os.path.exists(target_dir):
@@ -471,6 +462,26 @@ def validate_excel_file(file_path: str, detailed: bool = True) -> Tuple[bool, st
     return is_valid, message
 
 
+def get_artifacts_dir(*parts: str) -> str:
+    """
+    artifacts klasörünün (veya altındaki bir yolun) mutlak yolunu döndürür
+    
+    Exe'den çalıştırılıyorsa exe'nin bulunduğu klasör, script'ten çalıştırılıyorsa
+    çalışma dizini esas alınır. Klasör oluşturulmaz.
+    
+    Args:
+        *parts: artifacts altındaki alt yol parçaları (örn. "cache", "kvkk")
+        
+    Returns:
+        str: Mutlak yol
+    """
+    if getattr(sys, 'frozen', False):
+        base_dir = os.path.dirname(sys.executable)
+    else:
+        base_dir = os.getcwd()
+    return os.path.join(base_dir, "artifacts", *parts)
+
+
 # ========================================================================================  
 # TEST FONKSİYONU
 # ========================================================================================
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Artımlı İçe Aktarma - Büyüyen Vardiya Defteri Kitapları
+Daha önce analiz edilmiş bir kitaba sadece eklenen satırları okuyup mevcut temiz veriye ekler.
+"""
+
+# Bu modülün amacı:
+# - Kitabı içeriğinin başından tanımak (başlık + ilk veri satırının özeti);
+#   dosya adı/yolu değişse de (güvenli içe aktarma kopyaları) aynı kitap bulunur
+# - Son içe aktarmadaki satır sayısını ve son satırların özetini saklamak
+# - Yeni dosyada sadece bilinen son satırlardan sonrasını okumak: sayfa XML'inden başlık
+#   satırı + kuyruk satırları alınıp küçük bir bellek içi kitap kurulur (openpyxl tüm
+#   geçmişi ayrıştırmaz)
+# - Örtüşen son satırlar birebir aynı değilse (satır silinmiş/değişmiş) None döner ve
+#   çağıran tam analize geçer
+#
+# Kayıt defteri: artifacts/cache/workbook_registry.json
+# Temiz veri ve özet ColumnarAnalysisCache'te (Arrow) durur; defter sadece anahtarını tutar.
+
+import hashlib
+import io
+import json
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from date_utils import parse_with_format
+from file_security import get_artifacts_dir
+
+# Kitap tanıma ve örtüşme kontrolü için kullanılan satır sayısı (baştan ve sondan)
+INGEST_EDGE_ROWS = 5
+
+_ROW_TAG = re.compile(rb'<row\b[^>]*?\sr="(\d+)"')
+_CELL_REF = re.compile(rb'(<c\b[^>]*?\sr="[A-Z]+)(\d+)"')
+_RELS_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+def rows_fingerprint(rows: Sequence[Sequence]) -> str:
+    """Dönüştürülmüş ham satırların (liste listesi) özeti"""
+    # Tip bilgisi de özete girer: 5 ile '5' veya 5.5 ile '5.5' farklı sayılır
+    raw = json.dumps([[f"{type(value).__name__}:{value!r}" for value in row] for row in rows],
+                     ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def workbook_identity(columns: Sequence, head_rows: Sequence[Sequence]) -> str:
+    """Kitabın kimliği: başlık + ilk veri satırı"""
+    # Sadece ilk satır kullanılır; birkaç satırlık kitap büyüdükçe kimliği değişmemelidir.
+    # Aynı kimlikli farklı kitaplar örtüşme kontrolünde ayrışır (tam analize düşer).
+    return rows_fingerprint([list(columns)] + [list(row) for row in head_rows[:1]])
+
+class WorkbookRegistry:
+    """Artımlı içe aktarılabilecek kitapların kalıcı defteri"""
+    # Kayıt: {'satir_sayisi', 'son_satirlar' (son satırların özeti), 'kolonlar', 'onbellek' (tablo anahtarı)}
+    # Anahtar kitap kimliği + KVKK kural imzası + tarama modu + analiz ayarlarından üretilir;
+    # kurallar veya ayarlar değişince eski kayıt kullanılmaz ve kitap tam analizden geçer.
+
+    VERSION = 2
+
+    def __init__(self, registry_path: Optional[str] = None, max_entries: int = 200):
+        self.registry_path = registry_path or get_artifacts_dir("cache", "workbook_registry.json")
+        self.max_entries = max_entries
+        self._entries = None
+
+    @staticmethod
+    def make_key(identity: str, rules_signature: str, scan_mode: str, settings: Optional[Dict] = None) -> str:
+        raw = f"{identity}|{rules_signature}|{scan_mode}|{json.dumps(settings or {}, sort_keys=True)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _load(self) -> Dict:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.registry_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('versiyon') == self.VERSION:
+                    self._entries = data.get('kayitlar', {})
+            except (OSError, ValueError):
+                pass
+        return self._entries
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self._load().get(key)
+
+    def put(self, key: str, entry: Dict):
+        """Kaydı ekler/günceller ve defteri atomik olarak yazar"""
+        entries = self._load()
+        entries.pop(key, None)
+        entries[key] = entry
+        while len(entries) > self.max_entries:
+            entries.pop(next(iter(entries)))
+        try:
+            os.makedirs(os.path.dirname(self.registry_path), exist_ok=True)
+            tmp_path = f"{self.registry_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'versiyon': self.VERSION, 'kayitlar': entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.registry_path)
+        except OSError as e:
+            print(f"⚠️ Kitap defteri kaydedilemedi: {e}")
+
+def _first_sheet_path(archive: zipfile.ZipFile) -> Optional[str]:
+    """Kitaptaki ilk sayfanın (openpyxl worksheets[0]) zip içi yolu"""
+    workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+    sheet = next((element for element in workbook.iter() if element.tag.endswith('}sheet')), None)
+    if sheet is None:
+        return None
+    rel_id = sheet.get(f'{_RELS_NS}id')
+    rels = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    for rel in rels:
+        if rel.get('Id') == rel_id:
+            target = rel.get('Target', '')
+            return target.lstrip('/') if target.startswith('/') else f"xl/{target}"
+    return None
+
+def build_tail_workbook(file_path: str, first_data_index: int) -> Optional[io.BytesIO]:
+    """Başlık satırı + first_data_index'ten itibaren veri satırlarını içeren bellek içi kitap"""
+    # Veri satırı i, sayfada r = i + 2 numaralı satırdır (1. satır başlık). Kuyruk satırları
+    # 2'den başlayacak şekilde yeniden numaralanır; aksi halde openpyxl aradaki tüm satırları
+    # boş satır olarak üretir. Sayfa XML'i beklenen yapıda değilse None döner.
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            sheet_path = _first_sheet_path(archive)
+            if sheet_path is None:
+                return None
+            xml = archive.read(sheet_path)
+
+            data_start = xml.find(b'<sheetData>')
+            data_end = xml.rfind(b'</sheetData>')
+            if data_start < 0 or data_end < 0:
+                return None
+            header = _ROW_TAG.search(xml, data_start)
+            if header is None or int(header.group(1)) != 1:
+                return None
+            header_end = xml.find(b'</row>', header.start())
+            if header_end < 0 or header_end > data_end:
+                return None
+            header_end += len(b'</row>')
+
+            target_row = first_data_index + 2
+            tail_start = xml.find(b'<row r="%d"' % target_row, header_end)
+            if tail_start < 0:
+                # Hızlı yol tutmadıysa (farklı öznitelik sırası / boş satır) satırlar taranır
+                tail_start = next((match.start() for match in _ROW_TAG.finditer(xml, header_end, data_end)
+                                   if int(match.group(1)) >= target_row), data_end)
+
+            offset = target_row - 2
+            tail = _ROW_TAG.sub(lambda m: _shift_ref(m, offset), xml[tail_start:data_end])
+            tail = _CELL_REF.sub(lambda m: _shift_cell_ref(m, offset), tail)
+            sheet_xml = xml[:header_end] + tail + xml[data_end:]
+
+            output = io.BytesIO()
+            with zipfile.ZipFile(output, 'w', zipfile.ZIP_STORED) as truncated:
+                for info in archive.infolist():
+                    data = sheet_xml if info.filename == sheet_path else archive.read(info.filename)
+                    truncated.writestr(info.filename, data)
+    except (OSError, KeyError, zipfile.BadZipFile, ET.ParseError):
+        return None
+    output.seek(0)
+    return output
+
+def _shift_ref(match, offset: int) -> bytes:
+    row = int(match.group(1)) - offset
+    return match.group(0)[:match.start(1) - match.start(0)] + str(row).encode() + b'"'
+
+def _shift_cell_ref(match, offset: int) -> bytes:
+    return match.group(1) + str(int(match.group(2)) - offset).encode() + b'"'
+
+def align_new_rows(stored: pd.DataFrame, new_rows: pd.DataFrame, date_formats: Dict[str, str],
+                   stringified: Sequence = ()) -> Optional[pd.DataFrame]:
+    """Yeni satırları saklanan temiz verinin kolon tiplerine uyarlar; uyumsuzsa None"""
+    # Tam analizde olacağı gibi: tarih kolonları ilk analizde sezilen formatla ayrıştırılır,
+    # sayısal kolonlar sayıya çevrilir (çevrilemeyen değer varsa kolon tipi değişirdi → None),
+    # önbellekte metne çevrilmiş kolonlar metin olarak eklenir.
+    aligned = {}
+    for column in stored.columns:
+        target = stored[column].dtype
+        values = new_rows[column]
+        if column in stringified:
+            values = values.map(lambda value: value if pd.isna(value) else str(_restore_int(value)))
+        elif pd.api.types.is_datetime64_any_dtype(target):
+            values = parse_with_format(values, date_formats.get(column, 'datetime')).astype(target)
+        elif pd.api.types.is_bool_dtype(target):
+            if not pd.api.types.is_bool_dtype(values):
+                return None
+        elif pd.api.types.is_numeric_dtype(target):
+            if values.dtype == 'object':
+                try:
+                    values = pd.to_numeric(values)
+                except (ValueError, TypeError):
+                    return None
+        else:
+            # Chunk'ta sayısal çıkan değerler metin kolonunda okuyucunun ürettiği tipe döner
+            values = values.astype(object).map(_restore_int)
+        aligned[column] = values.reset_index(drop=True)
+    return pd.DataFrame(aligned, columns=list(stored.columns))
+
+def _restore_int(value):
+    # Boş hücre içeren int kolonu chunk'ta float olur; okuyucu tam sayıları int döndürür
+    if isinstance(value, float):
+        if value != value:
+            return None
+        if value.is_integer():
+            return int(value)
+    return value
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LLM Yanıt Önbelleği - İçerik Adresli
+Aynı sağlayıcı/model/ayar ve aynı prompt ile yapılan analizin yanıtını diskten döndürür.
+"""
+
+# Bu modülün amacı:
+# - Aynı filtrelenmiş aralık aynı ayarlarla tekrar analiz edildiğinde API'ye tekrar gitmemek
+#   (maliyet ve 30-60 sn bekleme)
+# - Anahtarı (sağlayıcı, model, max_tokens, sıcaklık, prompt) özetinden üretmek; prompt
+#   veriden üretildiği için veri veya seçenekler değişince anahtar da değişir
+# - Kayıtları süre (TTL) ve boyut sınırıyla tutmak: süresi dolan silinir, sınır aşılınca
+#   en uzun süredir kullanılmayan (LRU, dosya değişiklik zamanı) kayıtlar atılır
+#
+# Dosyalar: artifacts/cache/llm/<anahtar>.json (yanıt metni + yapılandırılmış analiz)
+# Prompt'un kendisi saklanmaz; prompt KVKK temizliği sonrası veriden üretilir.
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+
+from file_security import get_artifacts_dir
+
+class LLMResponseCache:
+    """Başarılı LLM yanıtlarının kalıcı (disk) önbelleği"""
+
+    # Yanıt/ayrıştırma biçimi değişirse artırılır (eski kayıtlar kullanılmaz)
+    VERSION = 1
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl_seconds: float = 7 * 24 * 60 * 60,
+                 max_entries: int = 200, max_bytes: int = 50 * 1024 * 1024):
+        # ttl_seconds: kaydın geçerlilik süresi (0/None = süresiz)
+        # max_entries / max_bytes: kayıt sayısı ve toplam boyut sınırı (LRU ile budanır)
+        self.cache_dir = cache_dir or get_artifacts_dir("cache", "llm")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def make_key(cls, provider: str, model: str, max_tokens: int, temperature: float, prompt: str) -> str:
+        """İstek parametreleri ve prompt'tan önbellek anahtarı üretir"""
+        raw = json.dumps([cls.VERSION, provider, model, int(max_tokens), round(float(temperature), 4), prompt],
+                         ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _expired(self, created: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - created > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Geçerli kayıt varsa yanıtı döndürür; yoksa, süresi dolmuşsa veya okunamazsa None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('versiyon') != self.VERSION or self._expired(entry.get('olusturma', 0), time.time()):
+            _remove_file(path)
+            return None
+        # Son kullanım zamanı (LRU budaması için)
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry.get('yanit')
+
+    def put(self, key: str, response: Dict, provider: str = "", model: str = "") -> bool:
+        """Yanıtı atomik olarak yazar; başarılıysa True (hatalı yanıtlar saklanmaz)"""
+        if not response or response.get('error'):
+            return False
+        path = self._path(key)
+        entry = {
+            'versiyon': self.VERSION,
+            'olusturma': time.time(),
+            'saglayici': provider,
+            'model': model,
+            'yanit': response
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ LLM yanıt önbelleği yazılamadı: {e}")
+            return False
+        self._prune()
+        return True
+
+    def invalidate(self, key: str):
+        _remove_file(self._path(key))
+
+    def clear(self):
+        """Tüm kayıtları siler"""
+        for path, _, _ in self._entries():
+            _remove_file(path)
+
+    def _entries(self):
+        """(yol, son kullanım zamanı, boyut) listesi"""
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _prune(self):
+        """Süresi dolan kayıtları, ardından sınırlar aşılıyorsa en eski kullanılanları siler"""
+        # TTL oluşturma zamanına göredir; son kullanım (mtime) oluşturmadan eski olamaz, bu yüzden
+        # son kullanımı TTL'den eski olan kayıt kesinlikle süresi dolmuştur (dosyayı açmadan anlaşılır)
+        now = time.time()
+        entries = []
+        for path, used, size in self._entries():
+            if self._expired(used, now):
+                _remove_file(path)
+            else:
+                entries.append((path, used, size))
+        entries.sort(key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+            path, _, size = entries.pop(0)
+            _remove_file(path)
+            total -= size
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
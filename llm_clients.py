@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LLM Sağlayıcı İstemci Kaydı - Kalıcı (keep-alive) Bağlantılar
+Sağlayıcı başına tek bir bağlantı havuzlu HTTP oturumu / OpenAI istemcisi tutar.
+"""
+
+# Bu modülün amacı:
+# - Her AI analizinde yeni CimentoVardiyaAI kurulsa da bağlantıları yeniden kullanmak:
+#   ardışık analizlerde DNS + TCP + TLS el sıkışması tekrar ödenmez
+# - Anthropic/xAI REST çağrıları için sağlayıcı başına havuzlu requests.Session
+# - OpenAI için API anahtarı + adres başına tek OpenAI istemcisi (kendi httpx havuzuyla)
+# - REST havuz boyutu ve zaman aşımlarını config.py'den almak
+#
+# İstemciler thread güvenli şekilde tembel kurulur; close_all() uygulama kapanırken çağrılır.
+# API anahtarları sadece bellekte durur; kayıt anahtarında anahtarın özeti kullanılır.
+
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+from openai import OpenAI
+from requests.adapters import HTTPAdapter
+
+from config import LLM_HTTP_CONNECT_TIMEOUT, LLM_HTTP_POOL_SIZE, LLM_HTTP_READ_TIMEOUT
+
+_lock = threading.Lock()
+_sessions: Dict[str, requests.Session] = {}
+_openai_clients: Dict[Optional[str], Tuple[str, object]] = {}   # adres → (anahtar özeti, istemci)
+
+def request_timeout() -> Tuple[float, float]:
+    """requests için (bağlantı, okuma) zaman aşımı"""
+    # Okuma süresi baytlar arası beklemedir; akış modunda her parça sayacı sıfırlar
+    return LLM_HTTP_CONNECT_TIMEOUT, LLM_HTTP_READ_TIMEOUT
+
+def get_session(provider: str) -> requests.Session:
+    """Sağlayıcının havuzlu HTTP oturumu (ilk çağrıda kurulur)"""
+    with _lock:
+        session = _sessions.get(provider)
+        if session is None:
+            session = requests.Session()
+            # Yeniden deneme yok: POST tekrarları maliyet doğurur; hata çağırana döner
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=LLM_HTTP_POOL_SIZE, max_retries=0)
+            session.mount("https://", adapter)
+            _sessions[provider] = session
+        return session
+
+def get_openai_client(api_key: str, base_url: Optional[str] = None):
+    """API anahtarı + adres için paylaşılan OpenAI istemcisi"""
+    # Anahtar değişirse (kullanıcı GUI'de yeni anahtar girdi) yeni istemci kurulur. Eski istemci
+    # kapatılmaz: başka bir thread'deki çağrı (paralel bölümler, GUI akışı) hâlâ onu kullanıyor
+    # olabilir; kayıttan çıkarılır ve son referans bırakılınca çöp toplayıcıyla kapanır.
+    key_digest = hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+    with _lock:
+        entry = _openai_clients.get(base_url)
+        if entry is not None and entry[0] == key_digest:
+            return entry[1]
+        # Zaman aşımı/yeniden deneme SDK varsayılanında kalır (uzun akışsız yanıtlar için geniş süre)
+        kwargs = {'api_key': api_key}
+        if base_url:
+            kwargs['base_url'] = base_url
+        client = OpenAI(**kwargs)
+        _openai_clients[base_url] = (key_digest, client)
+        return client
+
+def close_all():
+    """Tüm oturum ve istemcileri kapatır (uygulama kapanışı)"""
+    with _lock:
+        for session in _sessions.values():
+            _close_quietly(session)
+        for _, client in _openai_clients.values():
+            _close_quietly(client)
+        _sessions.clear()
+        _openai_clients.clear()
+
+def _close_quietly(client):
+    try:
+        client.close()
+    except Exception:
+        pass
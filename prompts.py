@@ -10,6 +10,8 @@
 # - Anti-tekrar / anti-halüsinasyon kurallarını standartlaştırmak
 # ==================================================================================================
 
+from typing import List, Tuple
+
 
 # --------------------------------------------------------------------------------------------------
 # 1. SİSTEM PROMPT (AI'ın Rolü ve Analiz Biçimi)
@@ -498,33 +500,21 @@ def test_prompts():
 # 🚀 ENHANCED PROMPT SYSTEM - Token Efficiency & Quality Optimization
 # --------------------------------------------------------------------------------------------------
 
-def create_enhanced_prompt(data_summary: str, model_name: str = "gpt-4o-mini", 
-                          min_executive_items: int = 15, max_executive_items: int = 20) -> str:
-    """
-    🚀 ENHANCED PROMPT SYSTEM v1.0
-    3 Ana Sorunu Çözen Akıllı Prompt Sistemi:
-    
-    1. ✅ MANDATORY ITEM COUNT - AI'ı belirtilen sayıda madde yazmaya zorlar
-    2. ✅ PROACTIVE ANALYSIS - "Veri yok" yerine çözüm algoritmaları önerir  
-    3. ✅ MODEL OPTIMIZATION - Farklı modeller için optimize edilmiş prompt'lar
-    """
-    
+def _executive_item_count(model_name: str, min_executive_items: int, max_executive_items: int) -> int:
+    """Modele göre Yönetici Özeti zorunlu madde sayısı"""
     # Model-specific optimizations
     if "mini" in model_name.lower():
         # GPT-4o-mini için optimize edilmiş (test sonucu: en iyi performans)
-        executive_items = max_executive_items
-        prompt_style = "DETAILED"
+        return max_executive_items
     elif "turbo" in model_name.lower():
         # GPT-4-turbo için tam performans (maliyet uyarısı var, kullanıcı biliyor)
-        executive_items = max_executive_items  # Tam kapasite kullan
-        prompt_style = "DETAILED"  # Full sections
-    else:
-        # Diğer modeller için dengeli
-        executive_items = min_executive_items
-        prompt_style = "BALANCED"
-    
-    # Enhanced Executive Summary with Mandatory Item Count
-    enhanced_executive = f"""
+        return max_executive_items  # Tam kapasite kullan
+    # Diğer modeller için dengeli
+    return min_executive_items
+
+def _executive_section(executive_items: int) -> str:
+    """Enhanced Executive Summary with Mandatory Item Count"""
+    return f"""
 🚨 **ZORUNLU MADDE SAYISI: {executive_items} MADDE - EKSİK YASAK!**
 
 ## 🎯 1. YÖNETİCİ ÖZETİ (EXECUTIVE SUMMARY)
@@ -536,8 +526,8 @@ def create_enhanced_prompt(data_summary: str, model_name: str = "gpt-4o-mini",
 """ + "\n".join([f"{i}. **[Kritik Bulgu {i}]:** [Detaylı açıklama + veri dayanağı + etki analizi]" 
                   for i in range(1, executive_items + 1)])
 
-    # Proactive Analysis Templates
-    proactive_templates = """
+# Proactive Analysis Templates
+_PROACTIVE_TEMPLATES = """
 
 🔍 **PROACTIVE ANALYSIS TEMPLATES:**
 
@@ -562,63 +552,33 @@ Her eksik/belirsiz durumda MUTLAKA şu yapıyı kullan:
 
 """
 
-    # Not: Sections artık enhanced_prompt'ta full template olarak tanımlanmış
-
-    # Final enhanced prompt construction - FULL TEMPLATE SYSTEM
-    enhanced_prompt = f"""
-{SYSTEM_PROMPT}
-
-Aşağıda çimento fabrikasının son vardiya verilerine ait özet bilgileri paylaşıyorum.
-Lütfen bu verileri analiz ederek, sistem talimatlarında belirtilen kurallara uygun, aşağıdaki bölümleri içeren bir iş zekası raporu hazırla.
-
-**--- ANALİZ EDİLECEK VERİ ÖZETİ ---**
-{data_summary}
-**--- VERİ ÖZETİ SONU ---**
-
-{proactive_templates}
-
----
-
-# 🏭 VARDİYA VERİLERİ KAPSAMLI İŞ ZEKASI RAPORU
-
----
-
-{enhanced_executive}
-
----
-
-## 📊 2. DETAYLI PERFORMANS KARNESİ (ADVANCED KPI DASHBOARD)
+# Rapor bölümleri (sırası rapor sırasıdır); Yönetici Özeti madde sayısına göre üretilir
+_KPI_SECTION = """## 📊 2. DETAYLI PERFORMANS KARNESİ (ADVANCED KPI DASHBOARD)
 - **Genel Verimlilik Analizi:** (Yalnızca veri varsa) OEE, kullanılabilirlik, performans, kalite oranları
 - **Ekipman Performans Matrisi:** En sorunlu 5-10 ekipman (adet ve %), normalize toplam
 - **MTBF/MTTR Analizi:** SADECE veri uygunsa. Uygun değilse: "MTBF/MTTR: veri yok (başlangıç-bitiş/tarih sütunları eksik)"
 - **Pareto Analizi:** 80/20; ana nedenlerin kümülatif %'si (Toplam %100)
 - **Vardiya Karşılaştırması:** Gece/gündüz vb. (veri varsa)
-- **Trend Katsayıları:** İyileşme/kötüleşme oranları (veri varsa)
+- **Trend Katsayıları:** İyileşme/kötüleşme oranları (veri varsa)"""
 
----
-
-## 🔍 3. KÖK NEDEN ANALİZİ (COMPREHENSIVE ROOT CAUSE ANALYSIS)
+_ROOT_CAUSE_SECTION = """## 🔍 3. KÖK NEDEN ANALİZİ (COMPREHENSIVE ROOT CAUSE ANALYSIS)
 - **🔢 ADVANCED YÜZDELİK ANALİZ:** Ana kategorileri %5+ dilimlerle göster. Minimum %5 altı "Diğer"e dahil. ZORUNLU: Yüzde toplamı tam %100 olmalı. Pareto analizi (80/20) ile kritik kategorileri belirle
 - **Tekrarlayan Arıza Analizi:** Sıklık, pattern ve kök nedenler
 - **Sistem Arızaları:** Mekanik, elektriksel, yazılımsal sorunlar
 - **İnsan Faktörü:** Operatör hataları, eğitim eksikleri
 - **Çevresel Faktörler:** Sıcaklık, nem, titreşim etkileri
 - **Bakım Eksikleri:** Planlı/plansız bakım analizi
-- **Gizli Bulgular (12-18 madde):** Veri madenciliği ile bulunan ilişkiler (veriyle doğrulanmış)
-
----
+- **Gizli Bulgular (12-18 madde):** Veri madenciliği ile bulunan ilişkiler (veriyle doğrulanmış)"""
 
-## 📈 4. ZAMAN SERİSİ ANALİZİ VE RİSK MODELLEMESİ
+_TREND_SECTION = """## 📈 4. ZAMAN SERİSİ ANALİZİ VE RİSK MODELLEMESİ
 - **Haftalık/Aylık Trendler:** Detaylı zaman serisi grafikleri
 - **Mevsimsel Etkiler:** Yıl içindeki değişimler
 - **Korelasyon Analizi:** Değişkenler arası ilişkiler
 - **Risk Projeksiyonu:** 3-6-12 aylık tahminler
 - **Kritik Eşik Analizi:** Hangi noktada acil müdahale gerekli
-- **Erken Uyarı Sistemleri:** Öncü göstergeler
-
----
+- **Erken Uyarı Sistemleri:** Öncü göstergeler"""
 
-## 💡 5. KAPSAMLI SMART+ EYLEM PLANI (DİNAMİK — GÜNCELLİK ODAKLI)
+_ACTION_PLAN_SECTION = """## 💡 5. KAPSAMLI SMART+ EYLEM PLANI (DİNAMİK — GÜNCELLİK ODAKLI)
 **ZORUNLU: Her kategoriden en az 2 öneri olmalı**
 
 ### 🚨 ACİL EYLEMLER (0-7 gün) (dinamik adet):
@@ -644,15 +604,59 @@ Lütfen bu verileri analiz ederek, sistem talimatlarında belirtilen kurallara u
 - Teknik zorluğu (Kolay/Orta/Zor)
 - Uygulama süresi (gün)
 - Sorumlu departman
-- Başarı metriği (ölçülebilir)
-
----
+- Başarı metriği (ölçülebilir)"""
 
-## 📊 6. YÖNETİCİ AKSIYON PANOSU
+_ACTION_BOARD_SECTION = """## 📊 6. YÖNETİCİ AKSIYON PANOSU
 - **Kritik Kararlar:** Yönetimin alması gereken stratejik kararlar
 - **Bütçe Önerileri:** Yatırım ve maliyet optimizasyon önerileri
 - **KPI Hedefleri:** Gelecek dönem için hedef değerler
-- **Risk Matrisi:** Risk seviyesi ve aciliyet sıralaması
+- **Risk Matrisi:** Risk seviyesi ve aciliyet sıralaması"""
+
+REPORT_SECTIONS = ("yonetici_ozeti", "performans_karnesi", "kok_neden", "zaman_serisi",
+                   "eylem_plani", "aksiyon_panosu")
+
+def report_sections(model_name: str = "gpt-4o-mini", min_executive_items: int = 15,
+                    max_executive_items: int = 20) -> List[Tuple[str, str]]:
+    """Rapor bölümlerini sırasıyla (anahtar, bölüm şablonu) olarak döndürür"""
+    executive_items = _executive_item_count(model_name, min_executive_items, max_executive_items)
+    texts = (_executive_section(executive_items), _KPI_SECTION, _ROOT_CAUSE_SECTION, _TREND_SECTION,
+             _ACTION_PLAN_SECTION, _ACTION_BOARD_SECTION)
+    return list(zip(REPORT_SECTIONS, texts))
+
+def create_enhanced_prompt(data_summary: str, model_name: str = "gpt-4o-mini", 
+                          min_executive_items: int = 15, max_executive_items: int = 20) -> str:
+    """
+    🚀 ENHANCED PROMPT SYSTEM v1.0
+    3 Ana Sorunu Çözen Akıllı Prompt Sistemi:
+    
+    1. ✅ MANDATORY ITEM COUNT - AI'ı belirtilen sayıda madde yazmaya zorlar
+    2. ✅ PROACTIVE ANALYSIS - "Veri yok" yerine çözüm algoritmaları önerir  
+    3. ✅ MODEL OPTIMIZATION - Farklı modeller için optimize edilmiş prompt'lar
+    """
+    executive_items = _executive_item_count(model_name, min_executive_items, max_executive_items)
+    sections = "\n\n---\n\n".join(text for _, text in
+                                   report_sections(model_name, min_executive_items, max_executive_items))
+
+    # Final enhanced prompt construction - FULL TEMPLATE SYSTEM
+    enhanced_prompt = f"""
+{SYSTEM_PROMPT}
+
+Aşağıda çimento fabrikasının son vardiya verilerine ait özet bilgileri paylaşıyorum.
+Lütfen bu verileri analiz ederek, sistem talimatlarında belirtilen kurallara uygun, aşağıdaki bölümleri içeren bir iş zekası raporu hazırla.
+
+**--- ANALİZ EDİLECEK VERİ ÖZETİ ---**
+{data_summary}
+**--- VERİ ÖZETİ SONU ---**
+
+{_PROACTIVE_TEMPLATES}
+
+---
+
+# 🏭 VARDİYA VERİLERİ KAPSAMLI İŞ ZEKASI RAPORU
+
+---
+
+{sections}
 
 ⚠️ **SON UYARI:** 
 - {executive_items} maddelik Executive Summary ZORUNLU! TÜM bölümleri eksiksiz yaz!
@@ -662,6 +666,87 @@ Lütfen bu verileri analiz ederek, sistem talimatlarında belirtilen kurallara u
 
     return enhanced_prompt
 
+def create_section_prompt(data_summary: str, section_key: str, model_name: str = "gpt-4o-mini",
+                          min_executive_items: int = 15, max_executive_items: int = 20) -> str:
+    """Raporun tek bir bölümünü isteyen prompt (bölümler paralel üretilip sırayla birleştirilir)"""
+    # Sistem kuralları ve veri özeti tam rapordakiyle aynıdır; model sadece istenen bölümü yazar.
+    # Diğer bölümlerin başlıkları verilir ki aynı bulgular bölümler arasında tekrarlanmasın.
+    sections = report_sections(model_name, min_executive_items, max_executive_items)
+    texts = dict(sections)
+    if section_key not in texts:
+        raise ValueError(f"Bilinmeyen rapor bölümü: {section_key} (seçenekler: {', '.join(REPORT_SECTIONS)})")
+    others = "\n".join(f"- {_section_title(text)}" for key, text in sections if key != section_key)
+
+    return f"""
+{SYSTEM_PROMPT}
+
+Aşağıda çimento fabrikasının son vardiya verilerine ait özet bilgileri paylaşıyorum.
+Bu istekte iş zekası raporunun SADECE aşağıdaki bölümünü yaz. Diğer bölümler ayrı isteklerle üretilip
+rapora eklenecek; rapor başlığı, giriş/kapanış metni veya başka bölüm başlığı yazma.
+
+Diğer bölümler (konularına girme, bulgularını tekrarlama):
+{others}
+
+**--- ANALİZ EDİLECEK VERİ ÖZETİ ---**
+{data_summary}
+**--- VERİ ÖZETİ SONU ---**
+
+{_PROACTIVE_TEMPLATES}
+
+---
+
+{texts[section_key]}
+
+⚠️ **SON UYARI:** 
+- Bu bölümü eksiksiz yaz; bölüm başlığını aynen koru!
+- "Similasyondan dolayı doldurulmamıştır" gibi placeholder ifadeler KESINLIKLE YASAK!
+- Her madde spesifik, actionable, veri-dayanaklı olmalı!
+"""
+
+def _section_title(section_text: str) -> str:
+    # Bölüm şablonundaki ilk '## ' satırı başlıktır
+    for line in section_text.splitlines():
+        if line.startswith("## "):
+            return line[3:].strip()
+    return section_text.strip().splitlines()[0]
+
+def create_shard_summary_prompt(shard_label: str, records_text: str, record_count: int,
+                                part: int = 1, parts: int = 1, max_items: int = 8) -> str:
+    """Verinin bir parçasını (hafta/ekipman) özetleten map prompt'u (ucuz model için)"""
+    # Çıktı son rapor prompt'una girdi olacağından kısa, sayısal ve madde madde istenir
+    part_text = f" — bölüm {part}/{parts}" if parts > 1 else ""
+    return f"""
+Sen çimento fabrikası vardiya defteri kayıtlarını özetleyen bir analistsin.
+Aşağıda "{shard_label}"{part_text} dönemine/grubuna ait {record_count} kayıt var. Aynı içerikli kayıtlar
+tek satırda "(×adet)" ile verilmiştir.
+
+**--- KAYITLAR ---**
+{records_text}
+**--- KAYITLAR SONU ---**
+
+En fazla {max_items} madde ile Türkçe özetle:
+- Tekrarlayan arızalar/sorunlar (ekipman, adet, toplam duruş dakikası — kayıtlarda varsa)
+- Öne çıkan tekil olaylar (kalite, emniyet, uzun duruşlar)
+- Yapılan/bekleyen bakım ve takip işleri
+Kurallar: Sadece kayıtlardaki bilgiyi kullan, tahmin yürütme, kişi adı yazma, giriş/kapanış cümlesi
+yazma. Her madde tek satır olsun ve mümkünse sayı içersin.
+"""
+
+def create_shard_reduce_prompt(summaries_text: str, max_items: int = 12) -> str:
+    """Parça özetlerini tek bir özete indiren ara reduce prompt'u (özetler bağlama sığmadığında)"""
+    return f"""
+Sen çimento fabrikası vardiya defteri özetlerini birleştiren bir analistsin.
+Aşağıda ardışık dönemlerin/grupların özetleri var.
+
+**--- PARÇA ÖZETLERİ ---**
+{summaries_text}
+**--- PARÇA ÖZETLERİ SONU ---**
+
+Bu özetleri en fazla {max_items} maddede birleştir: tekrarlayan sorunları adetleriyle topla, dönemler
+arası artış/azalışı belirt, önemli tekil olayları koru. Sadece özetlerdeki bilgiyi kullan; giriş/kapanış
+cümlesi yazma. Her madde tek satır olsun.
+"""
+
 def get_prompt_info():
     """Prompt bilgilerini döndür"""
     return {
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parça Özetleme (Map-Reduce) Yardımcıları
+Büyük vardiya verisini haftalara/ekipmanlara böler ve her parçanın kayıtlarını LLM'e verilecek
+sıkı metin bloklarına dönüştürür.
+"""
+
+# Bu modülün amacı:
+# - _summarize_data'nın sabit top-10 listeleri ve birkaç örnek kaydı dışında kalan serbest metni
+#   de modele ulaştırmak: veri parçalanır, her parça ucuz bir modelle özetlenir (map), parça
+#   özetleri son prompt'a eklenir (reduce) — bkz. CimentoVardiyaAI.summarize_shards_async
+# - Parça içinde aynı içerikli kayıtları tek satıra indirip adetini yazmak (token tasarrufu)
+# - Satırları/özetleri verilen token bütçesine sığan gruplara bölmek (bütçe sağlayıcının bağlam sınırından gelir)
+#
+# Bu modül LLM çağırmaz; parçalar ve metinler deterministiktir. Parça özetleri prompt metnine göre
+# önbelleğe alındığından (artifacts/cache/llm_shards) tarih aralığı genişletildiğinde sadece içeriği
+# değişen/yeni parçalar yeniden özetlenir.
+# Girdi KVKK temizliği sonrası veridir; ham veri bu modüle gelmez.
+
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+import pandas as pd
+
+from date_utils import as_datetime
+
+# Kolon adlarında aranan anahtar kelimeler (_summarize_data ile aynı)
+DATE_KEYWORDS = ('tarih', 'date')
+EQUIPMENT_KEYWORDS = ('ekipman', 'makine', 'ünite', 'unite', 'unit')
+
+SHARD_MODES = ("week", "equipment")
+
+T = TypeVar('T')
+
+# Tek hücreden alınan en fazla karakter (uzun serbest metin notları kırpılır)
+MAX_CELL_CHARS = 300
+
+def find_column(columns: Sequence, keywords: Sequence[str]) -> Optional[str]:
+    """Adında anahtar kelimelerden biri geçen ilk kolon"""
+    return next((c for c in columns if any(k in str(c).lower() for k in keywords)), None)
+
+def shard_frame(data: pd.DataFrame, by: str = "week") -> List[Tuple[str, pd.DataFrame]]:
+    """Veriyi (etiket, parça) listesine böler.
+
+    by="week": tarih kolonuna göre ISO haftaları (Pazartesi başlangıçlı), kronolojik sırayla;
+    by="equipment": ekipman kolonuna göre, kayıt sayısı azalan sırayla.
+    Gerekli kolon yoksa veya ayrıştırılamıyorsa tüm veri tek parça döner. Gruba girmeyen
+    (tarihsiz/ekipmansız) satırlar ayrı bir parçada toplanır.
+    """
+    if by not in SHARD_MODES:
+        raise ValueError(f"Geçersiz parçalama: {by} (seçenekler: {', '.join(SHARD_MODES)})")
+    if by == "week":
+        column = find_column(data.columns, DATE_KEYWORDS)
+        if column is None:
+            return [("tüm kayıtlar", data)]
+        try:
+            dates = as_datetime(data[column])
+        except Exception:
+            return [("tüm kayıtlar", data)]
+        keys = dates.dt.to_period('W-SUN')
+        shards = []
+        for period, part in data.groupby(keys, sort=True, observed=True):
+            start, end = period.start_time.date(), period.end_time.date()
+            iso = period.start_time.isocalendar()
+            shards.append((f"{iso[0]}-H{iso[1]:02d} ({start} – {end})", part))
+        missing = data[keys.isna().to_numpy()]
+        if len(missing):
+            shards.append(("tarihsiz kayıtlar", missing))
+        return shards
+
+    column = find_column(data.columns, EQUIPMENT_KEYWORDS)
+    if column is None:
+        return [("tüm kayıtlar", data)]
+    groups = data.groupby(data[column].astype('string').str.strip(), sort=False, observed=True)
+    shards = sorted(((str(name), part) for name, part in groups if len(part)), key=lambda item: -len(item[1]))
+    missing = data[data[column].isna().to_numpy()]
+    if len(missing):
+        shards.append(("ekipmanı belirtilmemiş kayıtlar", missing))
+    return shards
+
+def shard_record_lines(shard: pd.DataFrame, max_cell_chars: int = MAX_CELL_CHARS) -> List[str]:
+    """Parça kayıtlarını 'kolon: değer | ...' satırlarına çevirir; aynı satırlar tekilleştirilir.
+
+    Satırlar ilk görülme sırasını korur; tekrar edenlerin sonuna "(×adet)" eklenir.
+    """
+    if shard.empty:
+        return []
+    # Boş hücreler satıra hiç yazılmaz (ne kolon adı ne ayraç)
+    joined = pd.Series("", index=shard.index, dtype='string')
+    for column in shard.columns:
+        values = shard[column].astype('string').str.strip()
+        values = values.where(values.str.len() > 0).str.slice(0, max_cell_chars)
+        joined = joined + (f"{column}: " + values + " | ").fillna("")
+    joined = joined.str.slice(0, -3)
+    joined = joined[joined.str.len() > 0]
+    counts = joined.value_counts(sort=False)
+    order = pd.unique(joined.to_numpy())
+    return [line if counts[line] == 1 else f"{line} (×{int(counts[line])})" for line in order]
+
+def pack_items(items: Sequence[T], token_budget: int, count_tokens: Callable[[T], int]) -> List[List[T]]:
+    """Öğeleri (kayıt satırı, parça özeti) toplamı token_budget'ı aşmayan gruplara paketler (sıra korunur).
+
+    Tek başına bütçeyi aşan öğe kendi grubuna konur (hücreler zaten kırpılmıştır).
+    """
+    groups: List[List[T]] = []
+    current: List[T] = []
+    used = 0
+    for item in items:
+        tokens = count_tokens(item) + 1
+        if current and used + tokens > token_budget:
+            groups.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += tokens
+    if current:
+        groups.append(current)
+    return groups
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""DailyAggregateCube.summarize: hücrelerden birleştirilen özet, veriden doğrudan groupby ile aynıdır"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from daily_aggregates import DailyAggregateCube, parse_duration_minutes
+from date_utils import index_by_date, slice_by_date
+
+def make_frame(rows: int = 500) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 30 * 24 * 60, rows), unit='min')
+    df = pd.DataFrame({
+        'Tarih': dates,
+        'Vardiya': rng.choice(['Gece', 'Gündüz', 'Akşam'], rows),
+        'Ekipman': rng.choice(['Fırın', 'Değirmen', 'Kırıcı', None], rows),
+        'Süre (dk)': [f'{value} dk' for value in rng.integers(5, 120, rows)],
+        'Açıklama': [f'arıza {value}' for value in rng.integers(0, 1000, rows)],
+    })
+    # Tarihsiz satırlar (hücre 0)
+    df.loc[rng.choice(rows, 20, replace=False), 'Tarih'] = pd.NaT
+    return index_by_date(df, 'Tarih')
+
+@pytest.fixture(scope='module')
+def data():
+    df = make_frame()
+    # Açıklama kesin sayım sınırının üstünde kalsın (HyperLogLog yolu)
+    return df, DailyAggregateCube.build(df, 'Tarih', max_categories=50)
+
+def expected_daily(part: pd.DataFrame) -> pd.DataFrame:
+    dated = part[part['Tarih'].notna()]
+    minutes = parse_duration_minutes(dated['Süre (dk)'])
+    grouped = pd.DataFrame({'kayit': 1, 'sure': minutes}).groupby(dated['Tarih'].dt.normalize().to_numpy())
+    return pd.DataFrame({'kayit': grouped['kayit'].sum(), 'sure_toplam': grouped['sure'].sum(),
+                         'sure_adet': grouped['sure'].count()})
+
+def assert_matches(summary, part: pd.DataFrame):
+    assert summary.row_count == len(part)
+    pd.testing.assert_series_equal(summary.non_null, part.notna().sum(), check_names=False,
+                                   check_index_type=False, check_dtype=False)
+    expected = expected_daily(part)
+    daily = summary.daily
+    np.testing.assert_array_equal(daily.index.to_numpy(), expected.index.to_numpy())
+    np.testing.assert_array_equal(daily['kayit'].to_numpy(), expected['kayit'].to_numpy())
+    np.testing.assert_allclose(daily['sure_toplam'].to_numpy(), expected['sure_toplam'].to_numpy())
+    np.testing.assert_array_equal(daily['sure_adet'].to_numpy(), expected['sure_adet'].to_numpy())
+    assert summary.duration_total == pytest.approx(parse_duration_minutes(part['Süre (dk)']).sum())
+    for column in ('Vardiya', 'Ekipman'):
+        assert summary.is_exact(column)
+        assert summary.value_counts(column).to_dict() == part[column].value_counts().to_dict()
+        assert summary.distinct(column) == part[column].nunique()
+
+def test_full_range_includes_undated_rows(data):
+    df, cube = data
+    summary = cube.summarize()
+    assert_matches(summary, df)
+    assert int(summary.daily_counts.sum()) == int(df['Tarih'].notna().sum())
+
+@pytest.mark.parametrize('start, end', [
+    ('2024-01-05', '2024-01-12'),
+    ('2024-01-05', None),
+    (None, '2024-01-12'),
+    ('2024-02-10', '2024-02-20'),   # veri aralığının dışında
+])
+def test_day_ranges_match_groupby(data, start, end):
+    df, cube = data
+    # Gün çözünürlüğü: uç günler tam sayılır
+    upper = pd.Timestamp(end) + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns') if end else None
+    assert_matches(cube.summarize(start, end), slice_by_date(df, start, upper))
+
+def test_partial_edge_days_are_exact(data):
+    df, cube = data
+    start, end = pd.Timestamp('2024-01-05 13:30'), pd.Timestamp('2024-01-12 06:15')
+    part = slice_by_date(df, start, end)
+    assert_matches(cube.summarize(start, end, frame=part), part)
+
+def test_approximate_distinct_is_close(data):
+    df, cube = data
+    summary = cube.summarize()
+    assert not summary.is_exact('Açıklama')
+    assert summary.distinct('Açıklama') == pytest.approx(df['Açıklama'].nunique(), rel=0.05)
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""CleanDataHandle dosya yaşam döngüsü: silinemeyen dosyalar kaybolmaz, yeniden denenir"""
+
+import os
+
+import data_handle
+
+def test_failed_remove_is_logged_and_retried(tmp_path, caplog):
+    # Silinemeyen "dosya" yerine aynı adlı bir klasör: os.remove OSError verir
+    path = str(tmp_path / "kilitli.arrow")
+    os.mkdir(path)
+    assert data_handle._remove_file(path) is False
+    assert path in data_handle._pending_removals
+    assert "silinemedi" in caplog.text
+
+    # Engel kalkınca sonraki taramada silinir
+    os.rmdir(path)
+    open(path, 'w').close()
+    data_handle._remove_stale_files(str(tmp_path))
+    assert path not in data_handle._pending_removals
+    assert not os.path.exists(path)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Tarih aralığı dilimleme: date_utils.slice_by_date ve CleanDataHandle.slice_dates"""
+
+import pandas as pd
+import pytest
+
+from columnar_cache import PYARROW_AVAILABLE
+from data_handle import CleanDataHandle
+from date_utils import date_slice_bounds, index_by_date, slice_by_date
+
+def make_frame() -> pd.DataFrame:
+    """4 satır: 2 tarihli, 2 tarihsiz (NaT)"""
+    df = pd.DataFrame({
+        'Tarih': pd.to_datetime(['2024-01-02', None, '2024-01-01', None]),
+        'Ekipman': ['Değirmen', 'Fırın', 'Fırın', 'Kırıcı'],
+    })
+    return index_by_date(df, 'Tarih')
+
+def test_bounds_without_range_cover_undated_rows():
+    df = make_frame()
+    assert date_slice_bounds(df.index) == (0, len(df))
+    assert date_slice_bounds(df.index, '2024-01-01', None) == (2, 4)
+    assert date_slice_bounds(df.index, None, '2024-01-01') == (2, 3)
+
+def test_slice_by_date_matches_mask():
+    df = make_frame()
+    assert len(slice_by_date(df)) == 4
+    part = slice_by_date(df, '2024-01-02', '2024-01-31')
+    assert list(part['Ekipman']) == ['Değirmen']
+    assert part['Tarih'].notna().all()
+
+@pytest.fixture(params=['disk', 'bellek'])
+def handle(request, tmp_path):
+    df = make_frame()
+    if request.param == 'disk':
+        if not PYARROW_AVAILABLE:
+            pytest.skip("pyarrow yok")
+        handle = CleanDataHandle.spill(df, directory=str(tmp_path))
+        assert handle.path is not None
+    else:
+        handle = CleanDataHandle(None, list(df.columns), len(df), 'Tarih', frame=df)
+    yield handle
+    handle.release()
+
+def test_slice_dates_without_range_keeps_undated_rows(handle):
+    # GUI "Tüm veriler": tarihsiz satırlar düşerse satır sayısı row_count'tan sapar
+    everything = handle.slice_dates(None, None)
+    assert len(everything) == handle.row_count == 4
+    assert int(everything['Tarih'].isna().sum()) == 2
+    assert list(handle.slice_dates(None, None, columns=['Ekipman']).columns) == ['Ekipman']
+
+def test_slice_dates_with_range_skips_undated_rows(handle):
+    part = handle.slice_dates(pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-01'))
+    assert list(part['Ekipman']) == ['Fırın']
+    assert len(handle.slice_dates(pd.Timestamp('2024-01-01'), None)) == 2
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""ExcelChunkReader: akış okuması pd.read_excel ile aynı veriyi üretir"""
+
+import re
+import zipfile
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+from excel_analyzer import ExcelChunkReader, KVKKDataCleaner, StreamingKVKKCleaner
+
+def write_workbook(path, rows, keep_dimension=True):
+    workbook = Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    if keep_dimension:
+        return
+    # Bazı araçların yazdığı gibi sayfa boyutu (dimension) olmayan kitap
+    with zipfile.ZipFile(path) as archive:
+        contents = {info.filename: archive.read(info.filename) for info in archive.infolist()}
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, data in contents.items():
+            if name.startswith('xl/worksheets/'):
+                data = re.sub(rb'<dimension[^>]*/>', b'', data)
+            archive.writestr(name, data)
+
+def sample_rows():
+    rows = [['Vardiya', 'Ekipman', 'Süre (dk)']]
+    rows += [[f'V{i % 3}', 'Fırın', i] for i in range(10)]
+    # Sonradan gelen daha geniş satırlar: başlıksız kolonlar ("Unnamed: i")
+    rows += [['V1', 'Değirmen', 5, None, f'kisi{i}@ornek.com'] for i in range(5)]
+    return rows
+
+def test_width_grows_without_dimension(tmp_path):
+    path = str(tmp_path / "boyutsuz.xlsx")
+    write_workbook(path, sample_rows(), keep_dimension=False)
+    reader = ExcelChunkReader(path, chunk_rows=4)
+    chunks = list(reader)
+
+    # İlk chunk'lar başlık genişliğinde; genişlik geniş satırlar gelince büyür
+    assert len(chunks[0].columns) == 3
+    assert len(chunks[-1].columns) == 5
+    expected = pd.read_excel(path)
+    assert reader.columns == list(expected.columns)
+    # Ham chunk'larda boş hücre None'dır (sayısal tip çıkarımı birleştirme sonrası yapılır)
+    combined = pd.concat(chunks, ignore_index=True)
+    combined = combined.where(combined.notna(), np.nan)
+    pd.testing.assert_frame_equal(combined, expected, check_dtype=False)
+
+def test_stream_cleaner_scans_late_columns(tmp_path):
+    path = str(tmp_path / "boyutsuz.xlsx")
+    write_workbook(path, sample_rows(), keep_dimension=False)
+    cleaner = KVKKDataCleaner()
+    stream = None
+    for chunk in ExcelChunkReader(path, chunk_rows=4):
+        stream = stream or StreamingKVKKCleaner(cleaner, chunk.columns)
+        stream.feed(chunk)
+    df_clean, removed, _ = stream.finish()
+
+    expected, expected_removed, _ = KVKKDataCleaner().clean_dataframe(pd.read_excel(path))
+    assert removed == expected_removed
+    assert 'Unnamed: 4' in removed
+    assert list(df_clean.columns) == list(expected.columns)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Artımlı içe aktarma: kuyruk kitabı ve yeni satırların saklanan veriye uyarlanması"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from excel_analyzer import ExcelAnalyzer, ExcelChunkReader
+from incremental_ingest import align_new_rows, build_tail_workbook
+
+def make_frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        'Tarih': [f'{day % 28 + 1:02d}.03.2024' for day in range(rows)],
+        'Vardiya': [('Gece', 'Gündüz', 'Akşam')[i % 3] for i in range(rows)],
+        'Süre (dk)': [10 + i % 50 for i in range(rows)],
+        'Üretim Miktarı (ton)': [round(100 + i * 1.25, 2) if i % 7 else None for i in range(rows)],
+        'Açıklama': [f'Bant {i % 4} kontrol edildi' for i in range(rows)],
+    })
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = str(tmp_path / "vardiya.xlsx")
+    make_frame(40).to_excel(path, index=False)
+    return path
+
+@pytest.mark.parametrize('first_data_index', [0, 1, 17, 39, 40])
+def test_tail_workbook_round_trip(workbook, first_data_index):
+    source = build_tail_workbook(workbook, first_data_index)
+    assert source is not None
+    expected = pd.read_excel(workbook).iloc[first_data_index:].reset_index(drop=True)
+    tail = pd.read_excel(source)
+    pd.testing.assert_frame_equal(tail, expected, check_dtype=len(expected) > 0)
+
+    # Akış okuyucusu kuyruk kitabını dosyanın kendisi gibi okur (başlık aynı, satırlar kaydırılmış)
+    source.seek(0)
+    reader = ExcelChunkReader(workbook, chunk_rows=8, source=source)
+    chunks = list(reader)
+    assert reader.columns == list(expected.columns)
+    assert reader.row_count == len(expected)
+    if chunks:
+        streamed = pd.concat(chunks, ignore_index=True)
+        streamed = streamed.where(streamed.notna(), np.nan)
+        pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+
+def test_align_new_rows_matches_stored_types(workbook):
+    stored = pd.read_excel(workbook).head(30)
+    stored['Tarih'] = pd.to_datetime(stored['Tarih'], format='%d.%m.%Y')
+    new_rows = pd.concat(list(ExcelChunkReader(workbook, chunk_rows=100)), ignore_index=True).iloc[30:]
+
+    aligned = align_new_rows(stored, new_rows, {'Tarih': '%d.%m.%Y'})
+    assert aligned is not None
+    assert aligned.dtypes.to_dict() == stored.dtypes.to_dict()
+    expected = pd.read_excel(workbook).iloc[30:].reset_index(drop=True)
+    expected['Tarih'] = pd.to_datetime(expected['Tarih'], format='%d.%m.%Y')
+    pd.testing.assert_frame_equal(aligned, expected)
+
+def test_align_new_rows_rejects_type_change(workbook):
+    stored = pd.read_excel(workbook)
+    new_rows = stored.tail(2).astype(object)
+    new_rows.loc[new_rows.index[0], 'Süre (dk)'] = 'yarım saat'
+    # Sayısal kolona metin gelirse tam analizde kolon tipi değişirdi: artımlı yol kullanılmaz
+    assert align_new_rows(stored, new_rows, {}) is None
+
+def test_appended_rows_match_full_analysis(tmp_path, monkeypatch, capsys):
+    # Önbellekler çalışma dizinindeki artifacts/ altına yazılır
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "vardiya.xlsx")
+    make_frame(40).to_excel(path, index=False)
+    ExcelAnalyzer(stream_chunk_rows=16).analyze_excel_file(path)
+
+    make_frame(55).to_excel(path, index=False)
+    capsys.readouterr()
+    incremental = ExcelAnalyzer(stream_chunk_rows=16).analyze_excel_file(path)
+    assert "Artımlı içe aktarma: 15 yeni satır" in capsys.readouterr().out
+
+    full = ExcelAnalyzer(stream_chunk_rows=16, use_table_cache=False,
+                         use_decision_cache=False).analyze_excel_file(path)
+    assert incremental['temel_bilgiler']['satir_sayisi'] == full['temel_bilgiler']['satir_sayisi'] == 55
+    pd.testing.assert_frame_equal(incremental['temiz_veri'], full['temiz_veri'])
+    assert incremental['icerik_analizi']['bos_degerler'] == full['icerik_analizi']['bos_degerler']
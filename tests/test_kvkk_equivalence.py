@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""KVKK kararları: tüm temizlik yolları sabit bir veride aynı kararı verir.
+
+Referans, pd.read_excel ile okunan sayfanın bellekte sıralı sınıflandırıldığı clean_dataframe
+yoludur; akış temizliği (ExcelChunkReader + StreamingKVKKCleaner), kalıcı karar önbelleği
+(soğuk/sıcak) ve paralel çalışanlar aynı kaldırılan kolonları ve aynı karar izini üretmelidir.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from excel_analyzer import ColumnDecisionCache, ExcelChunkReader, KVKKDataCleaner, StreamingKVKKCleaner
+
+ROWS = 60
+
+def make_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'Tarih': pd.date_range('2024-03-01', periods=ROWS, freq='8h'),
+        'Vardiya': [f'Vardiya {i % 3 + 1}' for i in range(ROWS)],
+        'Ekipman': [('Fırın', 'Değirmen', 'Kırıcı')[i % 3] for i in range(ROWS)],
+        'Süre (dk)': [15 + i % 40 for i in range(ROWS)],
+        'Açıklama': [f'Bant {i % 4} durdu, rulman değişti' for i in range(ROWS)],
+        # Kolon adından kaldırılanlar
+        'Personel': [('Ayşe Yılmaz', 'Mehmet Demir', 'Can Kaya')[i % 3] for i in range(ROWS)],
+        'Telefon': [f'0532 555 {i:04d}' for i in range(ROWS)],
+        # Adı masum, içeriği kişisel veri
+        'İletişim': [f'operator{i}@fabrika.com.tr' for i in range(ROWS)],
+        'Not': [f'Sorumlu: 0533 444 {i:04d}' if i % 2 else None for i in range(ROWS)],
+        'Kod': [f'{10000000000 + i * 7919:011d}' for i in range(ROWS)],
+    })
+
+@pytest.fixture(scope='module')
+def workbook(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("kvkk") / "vardiya.xlsx")
+    make_frame().to_excel(path, index=False)
+    return path
+
+def reference(workbook, scan_mode, **options):
+    return KVKKDataCleaner().clean_dataframe(pd.read_excel(workbook), scan_mode=scan_mode, **options)
+
+def stream_clean(cleaner, workbook, scan_mode, chunk_rows=7):
+    stream = None
+    for chunk in ExcelChunkReader(workbook, chunk_rows=chunk_rows):
+        stream = stream or StreamingKVKKCleaner(cleaner, chunk.columns, scan_mode=scan_mode)
+        stream.feed(chunk)
+    return stream.finish()
+
+def assert_same(result, expected):
+    df_clean, removed, reasons = result
+    expected_df, expected_removed, expected_reasons = expected
+    assert removed == expected_removed
+    assert reasons == expected_reasons
+    assert list(df_clean.columns) == list(expected_df.columns)
+    # Akış okuyucusu boş metin hücrelerini None, pd.read_excel NaN olarak verir
+    df_clean = df_clean.reset_index(drop=True)
+    pd.testing.assert_frame_equal(df_clean.where(df_clean.notna(), np.nan), expected_df.reset_index(drop=True))
+
+def test_reference_removes_personal_columns(workbook):
+    _, removed, _ = reference(workbook, "sample")
+    assert {'Personel', 'Telefon', 'İletişim'} <= set(removed)
+    assert not {'Tarih', 'Vardiya', 'Ekipman', 'Süre (dk)'} & set(removed)
+
+@pytest.mark.parametrize('scan_mode', ['sample', 'full'])
+def test_stream_matches_in_memory(workbook, scan_mode):
+    assert_same(stream_clean(KVKKDataCleaner(), workbook, scan_mode), reference(workbook, scan_mode))
+
+@pytest.mark.parametrize('scan_mode', ['sample', 'full'])
+def test_thread_workers_match_sequential(workbook, scan_mode):
+    result = reference(workbook, scan_mode, workers=3, executor="thread")
+    assert_same(result, reference(workbook, scan_mode))
+
+@pytest.mark.parametrize('path', ['memory', 'stream'])
+def test_decision_cache_cold_and_warm(tmp_path, workbook, path):
+    expected = reference(workbook, "sample")
+    cache_path = str(tmp_path / "kararlar.json")
+
+    def run():
+        # Her çalıştırma yeni bir süreç gibi: önbellek diskten yüklenir
+        cleaner = KVKKDataCleaner(decision_cache=ColumnDecisionCache(cache_path))
+        if path == 'memory':
+            return cleaner.clean_dataframe(pd.read_excel(workbook), scan_mode="sample")
+        return stream_clean(cleaner, workbook, "sample")
+
+    assert_same(run(), expected)   # soğuk: kararlar hesaplanıp saklanır
+    assert_same(run(), expected)   # sıcak: kararlar önbellekten gelir
@@ -14,17 +14,26 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import pandas as pd
 import os
+import sys
 import shutil
 from datetime import datetime, timedelta
 import threading
+import queue
+import multiprocessing
 import traceback
-from excel_analyzer import ExcelAnalyzer, KVKKDataCleaner
+import gc
+from excel_analyzer import ExcelAnalyzer, KVKKDataCleaner, configure_kvkk_logging
+from date_utils import slice_by_date
+from data_sketches import HyperLogLog, wants_sketch
 from version import get_version_string, VERSION_NAME
 
 # Güvenlik modülleri
 from security_audit import SecurityAuditLogger
 from file_security import SecureFileValidator, validate_excel_file
 
+# AI yanıtı akarken sonuç alanının güncellenme aralığı (ms); parçalar bu aralıkta toplu eklenir
+AI_STREAM_POLL_MS = 100
+
 class VardiyaGUI:
     def __init__(self):
         # Ana pencere ve temel konfigürasyon (boyut, merkezleme, tema)
@@ -51,8 +60,9 @@ class VardiyaGUI:
         
         # Analyzer'ı başlat
         self.analyzer = ExcelAnalyzer()
-        self.current_data = None
+        self.data_handle = None       # temiz veri tutamacı (CleanDataHandle; veri diskte)
         self.analysis_results = None
+        self._stream_queue = None     # akan AI yanıt parçaları (worker thread → Tk ana thread)
         
         self.setup_styles()
         self.create_widgets()
@@ -277,6 +287,19 @@ class VardiyaGUI:
         self.temperature_entry = ttk.Entry(adv_frame, textvariable=self.temperature_var, width=6)
         self.temperature_entry.grid(row=0, column=3, sticky='w')
 
+        # Aynı veri + ayarlarla önceki yanıt önbellekteyse API çağrılmaz; işaretliyse yeniden üretilir
+        self.force_refresh_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(adv_frame, text="Önbelleği atla (yanıtı yeniden üret)",
+                        variable=self.force_refresh_var).grid(row=1, column=0, columnspan=4, sticky='w', pady=(5, 0))
+
+        # Büyük veride (map-reduce) tüm kayıtlar hafta hafta ucuz modelle özetlenip rapora eklenir;
+        # parça başına ek API isteği yapıldığından kullanıcı açıkça seçer
+        from config import LLM_MAP_REDUCE_ENABLED, LLM_MAP_REDUCE_MIN_ROWS
+        self.map_reduce_var = tk.BooleanVar(value=LLM_MAP_REDUCE_ENABLED)
+        ttk.Checkbutton(adv_frame, text=f"Büyük veride tüm kayıtları haftalık özetle ({LLM_MAP_REDUCE_MIN_ROWS:,}+ satır, "
+                                        "hafta başına ek ucuz model isteği)",
+                        variable=self.map_reduce_var).grid(row=2, column=0, columnspan=4, sticky='w')
+
         adv_frame.columnconfigure(4, weight=1)
 
         # Otomatik seçiliyken alanları devre dışı bırak
@@ -412,7 +435,8 @@ class VardiyaGUI:
                         )
                         return
                     
-                    # Import başarılı - güvenli dosya yolunu kullan
+                    # Import başarılı - önceki veri seti bırakılır, güvenli dosya yolu kullanılır
+                    self._release_dataset()
                     self.current_file = safe_file_path
                     self.file_label.config(text=os.path.basename(safe_file_path))
                     
@@ -427,6 +451,7 @@ class VardiyaGUI:
                     print(f"✅ Dosya güvenli şekilde import edildi: {os.path.basename(safe_file_path)}")
                 else:
                     # Validator yoksa eski yöntem
+                    self._release_dataset()
                     self.current_file = file_path
                     self.file_label.config(text=os.path.basename(file_path))
                     print(f"⚠️ Validator yok - dosya doğrudan kullanılıyor: {os.path.basename(file_path)}")
@@ -469,6 +494,9 @@ class VardiyaGUI:
             self.result_text.insert(tk.END, "🔍 Dosya analiz ediliyor...\n\n")
             self.window.update()
             
+            # Önceki analizin verisi yenisi yüklenmeden bırakılır (bellek tepe değeri düz kalır)
+            self._release_dataset()
+            
             # Dosyayı analiz et
             self.analysis_results = self.analyzer.analyze_excel_file(self.current_file)
             
@@ -485,11 +513,11 @@ class VardiyaGUI:
             # Sonuçları göster
             self.display_analysis_results()
             
-            # Temizlenmiş veriyi sakla
-            self.current_data = self.analysis_results.get('temiz_veri')
+            # Temizlenmiş veri diske taşınır; bellekte sadece tutamacı kalır
+            self.data_handle = self.analyzer.detach_clean_data(self.analysis_results)
             
             # Başarılı analizi logla
-            row_count = len(self.current_data) if self.current_data is not None else 0
+            row_count = len(self.data_handle) if self.data_handle is not None else 0
             self._log_safe(
                 self.audit_logger.log_file_operation,
                 "ANALYZE_SUCCESS", self.current_file, True, f"Analiz tamamlandı: {row_count:,} satır"
@@ -511,6 +539,18 @@ class VardiyaGUI:
             print(f"❌ Analiz hatası: {error_msg}")
             print(f"Stack trace: {stack_trace}")
     
+    def _release_dataset(self):
+        """Önceki veri setini (tutamaç dosyası, filtrelenmiş veri, sonuçlar) bırakır"""
+        # Yeni dosya seçildiğinde / analiz edildiğinde çağrılır; eski DataFrame'lere referans
+        # kalmadığından tekrarlanan içe aktarmalarda bellek birikmez
+        if self.data_handle is not None:
+            self.data_handle.release()
+            self.data_handle = None
+        self.analysis_results = None
+        self.filtered_data = None
+        self.filtered_aggregates = None
+        gc.collect()
+        
     def display_analysis_results(self):
         """Analiz sonuçlarını göster"""
         # ExcelAnalyzer çıktısını kullanarak okunabilir özet üretir
@@ -531,7 +571,11 @@ class VardiyaGUI:
         kvkk = results.get('kvkk_temizlik', {})
         text.append("🔒 KVKK UYUMLULUK:\n")
         if kvkk.get('kaldirilan_kolonlar'):
-            text.append(f"   ❌ Kaldırılan kolonlar: {', '.join(kvkk['kaldirilan_kolonlar'])}\n")
+            reasons = kvkk.get('kaldirma_nedenleri', {})
+            text.append("   ❌ Kaldırılan kolonlar:\n")
+            for col in kvkk['kaldirilan_kolonlar']:
+                reason = reasons.get(col, {}).get('neden', '')
+                text.append(f"      • {col}" + (f" ({reason})" if reason else "") + "\n")
         else:
             text.append("   ✅ Kişisel veri tespit edilmedi\n")
         text.append(f"   📊 Temiz kolon sayısı: {kvkk.get('temiz_kolon_sayisi', 0)}\n\n")
@@ -555,7 +599,7 @@ class VardiyaGUI:
     def apply_date_filter(self):
         """Tarih filtresini uygula"""
         # Seçilen aralığa göre veriyi süz ve özetini yazdır
-        if self.current_data is None:
+        if self.data_handle is None:
             messagebox.showwarning("Uyarı", "Önce bir dosya analiz edin!")
             return
         
@@ -577,11 +621,20 @@ class VardiyaGUI:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
         
-        # Filtreleme uygula
-        filtered_data = self.filter_data_by_date(self.current_data, start_date, end_date)
+        # Filtreleme uygula: sıralı tarih indeksi varsa diskten sadece aralıktaki satırlar yüklenir
+        if self.data_handle.date_index is not None:
+            filtered_data = self.data_handle.slice_dates(start_date, end_date)
+        else:
+            filtered_data = self.filter_data_by_date(self.data_handle.load(), start_date, end_date)
+        
+        # Aralık özeti analizde hazırlanan gün hücrelerinden birleştirilir (kolon taraması yok)
+        daily_cube = self.analysis_results.get('gunluk_ozet')
+        aggregates = None
+        if daily_cube is not None:
+            aggregates = daily_cube.summarize(start_date, end_date, filtered_data)
         
         # Özet göster
-        self.show_filtered_summary(filtered_data, start_date, end_date)
+        self.show_filtered_summary(filtered_data, start_date, end_date, aggregates)
     
     def filter_data_by_date(self, df, start_date, end_date):
         """Veriyi tarihe göre filtrele"""
@@ -594,23 +647,23 @@ class VardiyaGUI:
         if not date_columns:
             return df
         
-        date_col = date_columns[0]  # İlk tarih kolonunu kullan
+        # Analizde sıralı indeks kurulan kolon tercih edilir; yoksa ilk tarih kolonu
+        date_col = self.analysis_results.get('tarih_indeksi') or date_columns[0]
         
         try:
-            df_copy = df.copy()
-            df_copy[date_col] = pd.to_datetime(df_copy[date_col], errors='coerce')
-            
-            # Filtreleme
-            mask = (df_copy[date_col] >= start_date) & (df_copy[date_col] <= end_date)
-            return df_copy[mask]
+            # Sıralı DatetimeIndex varsa ikili arama ile dilimlenir (tam tarama/kopya yok);
+            # yoksa datetime64 kolon üzerinden maske ile süzülür
+            return slice_by_date(df, start_date, end_date, date_col)
             
         except Exception as e:
             messagebox.showerror("Hata", f"Tarih filtreleme hatası: {str(e)}")
             return df
     
-    def show_filtered_summary(self, filtered_df, start_date, end_date):
+    def show_filtered_summary(self, filtered_df, start_date, end_date, aggregates=None):
         """Filtrelenmiş veri özetini göster"""
         # Kayıt sayıları ve kolon bazlı hızlı özet
+        # aggregates (DailyRangeSummary) varsa dolu/benzersiz sayıları ondan okunur;
+        # '~' ile işaretli benzersiz sayılar HyperLogLog tahminidir
         summary = []
         
         if start_date and end_date:
@@ -619,28 +672,40 @@ class VardiyaGUI:
             summary.append("📅 Tarih Aralığı: Tüm veriler\n")
         
         summary.append(f"📊 Toplam kayıt: {len(filtered_df):,}\n")
-        summary.append(f"📈 Orijinal kayıt: {len(self.current_data):,}\n")
-        summary.append(f"📉 Filtrelenen kayıt: {len(self.current_data) - len(filtered_df):,}\n\n")
+        summary.append(f"📈 Orijinal kayıt: {len(self.data_handle):,}\n")
+        summary.append(f"📉 Filtrelenen kayıt: {len(self.data_handle) - len(filtered_df):,}\n\n")
         
         # Kolon bazında özet
         summary.append("📋 KOLON ÖZETİ:\n")
         for col in filtered_df.columns:
-            non_null = filtered_df[col].count()
-            unique_vals = filtered_df[col].nunique()
-            summary.append(f"   • {col}: {non_null:,} değer, {unique_vals:,} benzersiz\n")
+            if aggregates is not None:
+                non_null = int(aggregates.non_null[col])
+                unique_vals = aggregates.distinct(col)
+                approx = "" if aggregates.is_exact(col) else "~"
+            elif wants_sketch(filtered_df[col]):
+                # Gün özeti yoksa büyük metin kolonlarında da tüm değerler karşılaştırılmaz
+                non_null = filtered_df[col].count()
+                unique_vals = len(HyperLogLog().add(filtered_df[col]))
+                approx = "~"
+            else:
+                non_null = filtered_df[col].count()
+                unique_vals = filtered_df[col].nunique()
+                approx = ""
+            summary.append(f"   • {col}: {non_null:,} değer, {approx}{unique_vals:,} benzersiz\n")
         
         summary.append("\n✅ Filtrelenmiş veri AI analizi için hazır!")
         
         self.summary_text.delete(1.0, tk.END)
         self.summary_text.insert(tk.END, "".join(summary))
         
-        # Filtrelenmiş veriyi güncelle
+        # Filtrelenmiş veriyi (ve aralık özetini) güncelle
         self.filtered_data = filtered_df
+        self.filtered_aggregates = aggregates
     
     def start_ai_analysis(self):
         """AI analizini başlat"""
         # Gerekli girdiler kontrol edilir; uzun işlem ayrı thread'de çalıştırılır
-        if not hasattr(self, 'filtered_data') and self.current_data is None:
+        if getattr(self, 'filtered_data', None) is None and self.data_handle is None:
             messagebox.showwarning("Uyarı", "Önce veri yükleyin ve filtreleyin!")
             return
         
@@ -654,11 +719,38 @@ class VardiyaGUI:
         self.ai_result_text.delete(1.0, tk.END)
         self.ai_result_text.insert(tk.END, "🤖 AI analizi başlatılıyor...\n\n")
         
-        threading.Thread(target=self.run_ai_analysis, args=(api_key,), daemon=True).start()
+        # Yanıt akış modunda istenir: worker thread parçaları kuyruğa atar, Tk ana thread'i
+        # AI_STREAM_POLL_MS aralıkla kuyruğu boşaltıp metni ekler (widget'a sadece ana thread dokunur)
+        self._stream_queue = queue.Queue()
+        self._stream_started = False
+        self.window.after(AI_STREAM_POLL_MS, self._drain_ai_stream, self._stream_queue)
+        
+        threading.Thread(target=self.run_ai_analysis, args=(api_key, self._stream_queue), daemon=True).start()
+    
+    def _drain_ai_stream(self, stream_queue):
+        """Kuyruktaki yanıt parçalarını sonuç alanına ekler ve kendini yeniden zamanlar"""
+        # Analiz bittiğinde (veya yenisi başladığında) kuyruk değişir; eski döngü sessizce durur
+        if stream_queue is not self._stream_queue:
+            return
+        parts = []
+        try:
+            while True:
+                parts.append(stream_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if parts:
+            if not self._stream_started:
+                self._stream_started = True
+                self.ai_result_text.delete(1.0, tk.END)
+                self.ai_result_text.insert(tk.END, f"🤖 AI ANALİZ SONUCU (yazılıyor...)\n{'='*50}\n\n")
+            self.ai_result_text.insert(tk.END, "".join(parts))
+            self.ai_result_text.see(tk.END)
+        self.window.after(AI_STREAM_POLL_MS, self._drain_ai_stream, stream_queue)
     
-    def run_ai_analysis(self, api_key):
+    def run_ai_analysis(self, api_key, stream_queue=None):
         """AI analizini çalıştır (thread'de) - 🔒 Güvenlik Kontrollü"""
         # Seçenekleri topla → CimentoVardiyaAI ile analiz çağrısı → UI'ye sonucu yaz
+        # stream_queue: verilirse yanıt parçaları geldikçe bu kuyruğa atılır (bkz. _drain_ai_stream)
         
         # AI analiz başlangıcını logla
         provider = self.provider_var.get()
@@ -693,11 +785,19 @@ class VardiyaGUI:
                 provider=provider,
                 model=model,
                 max_tokens=max_tokens,
-                temperature=temperature
+                temperature=temperature,
+                map_reduce=self.map_reduce_var.get()
             )
             
             # Analiz edilecek veriyi hazırla
-            data_to_analyze = getattr(self, 'filtered_data', self.current_data)
+            data_to_analyze = getattr(self, 'filtered_data', None)
+            if data_to_analyze is not None:
+                aggregates = getattr(self, 'filtered_aggregates', None)
+            else:
+                # Filtre uygulanmadıysa tüm veri tutamaçtan yüklenir
+                data_to_analyze = self.data_handle.load()
+                daily_cube = self.analysis_results.get('gunluk_ozet')
+                aggregates = daily_cube.summarize() if daily_cube is not None else None
             data_rows = len(data_to_analyze) if data_to_analyze is not None else 0
             
             print(f"🤖 AI analizi başlatıldı: {provider}/{model} - {data_rows:,} satır")
@@ -729,11 +829,16 @@ class VardiyaGUI:
                 data=data_to_analyze,
                 date_range="seçili tarih aralığı",
                 analysis_options=selected_analyses,
-                user_question=""
+                user_question="",
+                aggregates=aggregates,
+                force_refresh=self.force_refresh_var.get(),
+                on_chunk=stream_queue.put if stream_queue is not None else None
             )
             
-            # Token kullanımını logla
+            # Token kullanımını logla (önbellekten dönen yanıtta token harcanmadı)
             token_usage = analysis_result.get('token_usage', {}) if analysis_result else {}
+            if analysis_result and analysis_result.get('cached'):
+                token_usage = {}
             
             self._log_safe(
                 self.audit_logger.log_api_call,
@@ -781,6 +886,8 @@ class VardiyaGUI:
     def display_ai_result(self, result):
         """AI sonucunu göster - tam sayfa görüntüleme"""
         # Sonucu AI sekmesine ve rapor önizleme alanına kopyalar
+        # Akan ham metin, temizlenmiş tam yanıtla değiştirilir (bekleyen parçalar atılır)
+        self._stream_queue = None
         self.ai_result_text.delete(1.0, tk.END)
         self.ai_result_text.insert(tk.END, f"🤖 AI ANALİZ SONUCU\n{'='*50}\n\n{result}")
         
@@ -795,6 +902,7 @@ class VardiyaGUI:
     
     def display_ai_error(self, error):
         """AI hatasını göster"""
+        self._stream_queue = None
         self.ai_result_text.delete(1.0, tk.END)
         self.ai_result_text.insert(tk.END, f"❌ AI Analiz Hatası:\n\n{error}")
         messagebox.showerror("AI Hatası", f"AI analizi başarısız: {error}")
@@ -1245,6 +1353,11 @@ class VardiyaGUI:
                 "APP_SHUTDOWN", "Uygulama kapatıldı"
             )
             
+            # Analizler arasında açık tutulan LLM bağlantılarını kapat (AI hiç kullanılmadıysa kurulmamıştır)
+            llm_clients = sys.modules.get('llm_clients')
+            if llm_clients is not None:
+                llm_clients.close_all()
+            
             # Audit logger'ı temiz kapat
             if self.audit_logger:
                 try:
@@ -1395,8 +1508,12 @@ class VardiyaGUI:
 
 def main():
     """Ana fonksiyon"""
+    # KVKK tanı mesajları varsayılan olarak kapalı (konsol I/O'su büyük dosyalarda yavaş)
+    configure_kvkk_logging(os.environ.get("KVKK_LOG_LEVEL", "WARNING"))
     app = VardiyaGUI()
     app.run()
 
 if __name__ == "__main__":
+    # KVKK process havuzu için (Windows / PyInstaller exe)
+    multiprocessing.freeze_support()
     main()